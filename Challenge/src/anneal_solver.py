@@ -0,0 +1,202 @@
+# src/anneal_solver.py
+
+"""
+Simulated-annealing improvement solver. It starts from the greedy plan and applies
+random add, remove and shift-turn moves to single purchases, scored incrementally
+with the DeltaEvaluator, accepting worse plans with a probability that shrinks as
+the temperature falls over a wall-clock budget.
+"""
+
+import math
+import random
+import time
+
+from src.challenge_solver import solve_game
+from src.delta_evaluator import DeltaEvaluator
+from src.scenario import compile_scenario
+
+# Number of random moves sampled to calibrate the starting temperature.
+CALIBRATION_MOVES = 200
+
+class AnnealSolver:
+
+    def __init__(self, initial_budget, resources=None, turns=None, initial_plan=None, seed=0,
+                 start_temperature=None, end_temperature=None, max_shift=10, report_interval=1.0):
+        """
+        Prepare the search.
+          - initial_budget: starting budget (int), or a compiled Scenario
+          - resources, turns: resource and turn definitions (when not passing a Scenario)
+          - initial_plan: starting purchase plan (default: the greedy plan of solve_game)
+          - seed: seed of the move generator
+          - start_temperature: initial temperature (default: calibrated from random moves)
+          - end_temperature: final temperature (default: start_temperature / 1000)
+          - max_shift: largest number of turns a shift move moves a purchase by
+          - report_interval: seconds between two points of the score trajectory
+        """
+        self.scenario = compile_scenario(initial_budget, resources, turns)
+        if initial_plan is None:
+            initial_plan = solve_game(self.scenario)
+        self.evaluator = DeltaEvaluator(self.scenario, purchase_plan=initial_plan)
+        self.num_turns = self.scenario.num_turns
+        self.resource_ids = self.scenario.ids.tolist()
+        self.rng = random.Random(seed)
+        self.start_temperature = start_temperature
+        self.end_temperature = end_temperature
+        self.max_shift = max_shift
+        self.report_interval = report_interval
+
+        # Flat list of (turn, resource_id) purchases, for uniform sampling.
+        self.purchases = [(turn, rid) for turn, resource_ids in self.evaluator.plan.items()
+                          for rid in resource_ids]
+        self.initial_score = self.evaluator.final_budget
+        self.best_score = self.initial_score
+        self.best_plan = None   # Taken lazily, when the search leaves its best plan
+        self.moves = 0
+        self.accepted = 0
+        self.elapsed = 0.0
+        self.temperature = None
+        self.trajectory = []    # List of (seconds, moves, current score, best score)
+
+    def propose(self):
+        """
+        Score a random move on the evaluator, leaving it staged.
+        Returns:
+          Tuple (delta, feasible, apply) where apply() updates the purchase list after commit(),
+          or None if the drawn move is not possible (e.g. nothing to remove).
+        """
+        rng = self.rng
+        kind = rng.randrange(3) if self.purchases else 0
+        if kind == 0:
+            turn = rng.randrange(self.num_turns)
+            rid = rng.choice(self.resource_ids)
+            delta, feasible = self.evaluator.delta_add(turn, rid)
+            return delta, feasible, lambda: self.purchases.append((turn, rid))
+
+        position = rng.randrange(len(self.purchases))
+        turn, rid = self.purchases[position]
+        if kind == 1:
+            delta, feasible = self.evaluator.delta_remove(turn, rid)
+            return delta, feasible, lambda: self._drop_purchase(position)
+
+        new_turn = turn + rng.randint(-self.max_shift, self.max_shift)
+        if new_turn == turn or not 0 <= new_turn < self.num_turns:
+            return None
+        delta, feasible = self.evaluator.delta_move(turn, rid, new_turn)
+        return delta, feasible, lambda: self._replace_purchase(position, (new_turn, rid))
+
+    def _drop_purchase(self, position):
+        self.purchases[position] = self.purchases[-1]
+        self.purchases.pop()
+
+    def _replace_purchase(self, position, purchase):
+        self.purchases[position] = purchase
+
+    def calibrate(self):
+        """
+        Estimate a starting temperature from the losses of feasible worsening moves:
+        a tenth of their lower decile. Hotter starts let the random walk dismantle the
+        plan faster than the search can rebuild it.
+        """
+        losses = []
+        for _ in range(CALIBRATION_MOVES):
+            move = self.propose()
+            self.evaluator.rollback()
+            if move is not None and move[1] and move[0] < 0:
+                losses.append(-move[0])
+        losses.sort()
+        return max(losses[len(losses) // 10] / 10, 1.0) if losses else 1.0
+
+    def solve(self, time_limit):
+        """
+        Run the annealing for time_limit seconds.
+        Returns:
+          The best purchase plan found, as a dictionary mapping turn index to resource IDs.
+        """
+        for _ in self.iterate(time_limit):
+            pass
+        return self.best_plan
+
+    def iterate(self, time_limit, should_stop=None):
+        """
+        Anytime version of solve(): a generator yielding the best plan whenever it has
+        improved, checked once per report interval and at the end. The run stops after
+        time_limit seconds (which also sets the cooling schedule) or once should_stop()
+        returns True.
+        """
+        evaluator = self.evaluator
+        rng = self.rng
+        start_temperature = self.start_temperature or self.calibrate()
+        end_temperature = self.end_temperature or start_temperature / 1000
+        cooling = math.log(end_temperature / start_temperature)
+
+        start = time.perf_counter()
+        next_report = 0.0
+        yielded_score = None
+        while True:
+            elapsed = time.perf_counter() - start
+            if elapsed >= time_limit:
+                break
+            # Geometric cooling along the elapsed fraction of the budget, on every move.
+            self.temperature = temperature = start_temperature * math.exp(cooling * elapsed / time_limit)
+            if elapsed >= next_report:
+                self.trajectory.append((elapsed, self.moves, evaluator.final_budget, self.best_score))
+                next_report += self.report_interval
+                if self.best_score != yielded_score:
+                    yielded_score = self.best_score
+                    self.elapsed = elapsed
+                    yield self.current_best()
+                if should_stop is not None and should_stop():
+                    break
+
+            move = self.propose()
+            if move is None:
+                continue
+            self.moves += 1
+            delta, feasible, apply = move
+            if not feasible or (delta < 0 and rng.random() >= math.exp(delta / temperature)):
+                evaluator.rollback()
+                continue
+
+            if delta < 0 and evaluator.final_budget == self.best_score and self.best_plan is None:
+                self.best_plan = evaluator.purchase_plan()
+            evaluator.commit()
+            apply()
+            self.accepted += 1
+            if evaluator.final_budget > self.best_score:
+                self.best_score = evaluator.final_budget
+                self.best_plan = None
+
+        self.elapsed = time.perf_counter() - start
+        self.trajectory.append((self.elapsed, self.moves, evaluator.final_budget, self.best_score))
+        self.best_plan = self.current_best()
+        if self.best_score != yielded_score:
+            yield self.best_plan
+
+    def current_best(self):
+        """
+        Return the best plan so far (the held plan, unless the search has moved away from it).
+        """
+        return self.best_plan if self.best_plan is not None else self.evaluator.purchase_plan()
+
+    @property
+    def moves_per_second(self):
+        return self.moves / self.elapsed if self.elapsed else 0.0
+
+    def report(self):
+        """
+        Return a printable summary: moves per second and the score trajectory.
+        """
+        lines = [
+            f"Annealing: {self.moves} moves in {self.elapsed:.1f}s "
+            f"({self.moves_per_second:.0f} moves/s, {self.accepted} accepted)",
+            f"Score: {self.initial_score} -> {self.best_score}",
+        ]
+        for elapsed, moves, current, best in self.trajectory:
+            lines.append(f"  {elapsed:7.2f}s  moves={moves}  current={current}  best={best}")
+        return "\n".join(lines)
+
+def solve_anneal(initial_budget, resources=None, turns=None, time_limit=10.0, seed=0):
+    """
+    Improve the greedy plan by simulated annealing for time_limit seconds.
+    """
+    return AnnealSolver(initial_budget, resources, turns, seed=seed).solve(time_limit)
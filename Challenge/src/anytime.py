@@ -0,0 +1,96 @@
+# src/anytime.py
+
+"""
+Anytime solver protocol. An anytime solver is a generator yielding purchase plans
+as it finds better ones; it receives a should_stop() callable and returns as soon
+as it is True. run_anytime() scores every yielded plan with the closed-form
+evaluator and rewrites the output file whenever the score improves, so a run
+stopped by SIGINT/SIGTERM or by its time limit keeps the best plan found so far.
+"""
+
+import signal
+import time
+
+from src.plan_evaluator import PlanEvaluator
+from src.utils import write_output
+
+class StopCondition:
+    """
+    Callable telling solvers to stop: True once the time limit is reached or after
+    SIGINT/SIGTERM. Used as a context manager, it installs the signal handlers and
+    restores the previous ones on exit. A second signal interrupts immediately, for
+    solvers that do not check should_stop().
+    """
+
+    def __init__(self, time_limit=None, signals=(signal.SIGINT, signal.SIGTERM)):
+        self.time_limit = time_limit
+        self.signals = signals
+        self.signal_received = None
+        self.start = time.perf_counter()
+        self._previous_handlers = {}
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        for signum in self.signals:
+            self._previous_handlers[signum] = signal.signal(signum, self._handle)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        for signum, handler in self._previous_handlers.items():
+            signal.signal(signum, handler)
+        self._previous_handlers = {}
+        return False
+
+    def _handle(self, signum, frame):
+        if self.signal_received is not None:
+            raise KeyboardInterrupt
+        self.signal_received = signum
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def remaining(self):
+        """
+        Seconds left before the time limit (None without a time limit).
+        """
+        if self.time_limit is None:
+            return None
+        return max(self.time_limit - self.elapsed(), 0.0)
+
+    def __call__(self):
+        if self.signal_received is not None:
+            return True
+        return self.time_limit is not None and self.elapsed() >= self.time_limit
+
+def one_shot(solver_func, *args, **kwargs):
+    """
+    Wrap a regular solver as an anytime solver yielding its single plan.
+    """
+    yield solver_func(*args, **kwargs)
+
+def run_anytime(scenario, plans, output_file, should_stop=None):
+    """
+    Consume an anytime solver.
+      - scenario: compiled Scenario the plans are for
+      - plans: iterator of purchase plans (dictionaries mapping turn index to resource IDs)
+      - output_file: path rewritten with the purchase log of every improving plan
+      - should_stop: optional callable; the solver is closed once it returns True
+    Returns:
+      Tuple (best plan, its final budget, number of improvements), with (None, None, 0)
+      if no plan was produced.
+    """
+    evaluator = PlanEvaluator(scenario)
+    best_plan, best_score, improvements = None, None, 0
+    try:
+        for plan in plans:
+            result = evaluator.evaluate(plan)
+            if best_score is None or result['final_budget'] > best_score:
+                best_plan, best_score = plan, result['final_budget']
+                improvements += 1
+                write_output(output_file, result['purchase_log'])
+            if should_stop is not None and should_stop():
+                break
+    finally:
+        if hasattr(plans, 'close'):
+            plans.close()
+    return best_plan, best_score, improvements
@@ -0,0 +1,79 @@
+# src/batch_evaluator.py
+
+"""
+Batched plan evaluation for population-based and multi-start searches. K plans for
+the same scenario are scored together: their per-turn power and maintenance are
+built as (plans x turns) matrices with one scatter-add, and profit and budget
+curves are computed for the whole batch with shared TM/TX/TR arrays.
+"""
+
+import numpy as np
+
+from src.plan_evaluator import PlanEvaluator
+
+class BatchEvaluator(PlanEvaluator):
+
+    def evaluate_batch(self, purchase_plans):
+        """
+        Score several purchase plans at once. Purchases the budget cannot cover are
+        dropped exactly like GameSimulator.purchase_resources does, so final budgets
+        match run_simulation for every plan; the plans with a dropped purchase are
+        resolved one by one with PlanEvaluator.drop_failed_purchases.
+        purchase_plans: list of dictionaries mapping turn index to resource IDs.
+        Returns:
+          Dictionary with 'final_budgets' (K int64 array), 'feasible' (K bools, False
+          when any purchase had to be dropped), 'failed_turns' (K lists) and
+          'budget' (K x turns array, budget at the end of each turn).
+        """
+        num_plans = len(purchase_plans)
+        num_turns = self.num_turns
+
+        rows, purchase_turns, definition_indices, attempted_keys = [], [], [], []
+        for row, purchase_plan in enumerate(purchase_plans):
+            for turn, _, indices in self.normalize_plan(purchase_plan):
+                rows.extend([row] * len(indices))
+                purchase_turns.extend([turn] * len(indices))
+                definition_indices.extend(indices)
+                attempted_keys.append(row * num_turns + turn)
+        rows = np.array(rows, dtype=np.int64)
+        purchase_turns = np.array(purchase_turns, dtype=np.int64)
+        definition_indices = np.array(definition_indices, dtype=np.int64)
+
+        spending = np.zeros(num_plans * num_turns, dtype=np.int64)
+        np.add.at(spending, rows * num_turns + purchase_turns, self.activation_cost[definition_indices])
+        spending = spending.reshape(num_plans, num_turns)
+        attempted = np.zeros(num_plans * num_turns, dtype=bool)
+        attempted[np.array(attempted_keys, dtype=np.int64)] = True
+        attempted = attempted.reshape(num_plans, num_turns)
+
+        power, maintenance = self.scatter(purchase_turns, definition_indices,
+                                          rows=rows, num_rows=num_plans)
+        TM, TX, TR = self.TM[None, :], self.TX[None, :], self.TR[None, :]
+        profit = np.where(power >= TM, np.minimum(power, TX) * TR, 0)
+        net = profit - maintenance - spending
+        budget = self.initial_budget + np.cumsum(net, axis=1)
+
+        # Only the plans with a purchase the budget cannot cover need a second pass,
+        # one forward pass each over their own curves.
+        failing_rows = np.flatnonzero((attempted & (spending > budget - net)).any(axis=1))
+        order = np.argsort(rows * num_turns + purchase_turns, kind='stable')
+        entry_keys = (rows * num_turns + purchase_turns)[order]
+        definition_indices = definition_indices[order]
+        failed_turns = [[] for _ in range(num_plans)]
+        for row in failing_rows.tolist():
+            def indices_at(turn, row=row):
+                low, high = np.searchsorted(entry_keys, [row * num_turns + turn, row * num_turns + turn + 1])
+                return definition_indices[low:high]
+            failed_turns[row] = self.drop_failed_purchases(power[row], maintenance[row], profit[row], net[row],
+                                                           budget[row], spending[row], attempted[row], indices_at)
+
+        if num_turns:
+            final_budgets = budget[:, -1].copy()
+        else:
+            final_budgets = np.full(num_plans, self.initial_budget, dtype=np.int64)
+        return {
+            'final_budgets': final_budgets,
+            'feasible': np.array([not turns for turns in failed_turns], dtype=bool),
+            'failed_turns': failed_turns,
+            'budget': budget
+        }
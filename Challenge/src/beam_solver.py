@@ -0,0 +1,223 @@
+# src/beam_solver.py
+
+"""
+Beam-search solver. Unlike the greedy solvers it can trade budget now for power
+later: every turn it keeps the best `width` partial states, where a state is the
+budget plus the power and maintenance the live fleet will produce over the next
+turns (a window as long as the longest resource lifetime, so memory does not grow
+with the number of turns). States are expanded with a few candidate purchase
+bundles, identical states are merged and dominated states are pruned. When a time
+limit runs out, the best-ranked state and the greedy lane play the remaining
+turns with the greedy rule (fill up to TM in ratio order) instead.
+"""
+
+import time
+
+import numpy as np
+
+from src.challenge_solver import ratio_rank_key
+from src.plan_evaluator import PlanEvaluator
+
+class BeamState:
+    """
+    Partial solution after some turns. The plan is a persistent linked list
+    (turn, resource_ids, parent) shared with the states it was expanded from.
+    """
+
+    __slots__ = ('budget', 'power', 'maintenance', 'plan', 'score', 'future_power', 'maintenance_total')
+
+    def __init__(self, budget, power, maintenance, plan):
+        self.budget = budget
+        self.power = power              # Power of the live fleet for the next turns
+        self.maintenance = maintenance  # Maintenance of the live fleet for the next turns
+        self.plan = plan
+        self.score = budget
+        self.future_power = 0
+        self.maintenance_total = 0
+
+    def key(self):
+        return (self.budget, self.power.tobytes(), self.maintenance.tobytes())
+
+def _dominated(state, kept):
+    """
+    A state is dominated when a kept state has at least its budget and future power
+    and at most its future maintenance.
+    """
+    for other in kept:
+        if (other.budget >= state.budget and other.future_power >= state.future_power
+                and other.maintenance_total <= state.maintenance_total):
+            return True
+    return False
+
+class BeamSolver:
+
+    def __init__(self, initial_budget, resources=None, turns=None, width=4, num_candidates=5):
+        """
+        Prepare the search.
+          - initial_budget: starting budget (int), or a compiled Scenario
+          - resources, turns: resource and turn definitions (when not passing a Scenario)
+          - width: number of states kept after every turn (plus the greedy lane)
+          - num_candidates: number of best-ranked affordable resources tried as single purchases
+        """
+        self.evaluator = PlanEvaluator(initial_budget, resources, turns)
+        scenario = self.evaluator.scenario
+        self.scenario = scenario
+        self.width = width
+        self.num_candidates = num_candidates
+        self.num_turns = scenario.num_turns
+        # Turns played with the greedy rule after the time limit in the last solve().
+        self.fallback_turns = 0
+
+        self.ids = scenario.ids.tolist()
+        self.activation_cost = scenario.activation_cost.tolist()
+        self.buildings_powered = scenario.buildings_powered.tolist()
+        keys = ratio_rank_key(scenario)
+        self.order = sorted(range(scenario.num_resources), key=keys.__getitem__)
+
+        # Per-definition power and maintenance by age, padded to a common window.
+        self.window = int(self.evaluator.lifetimes.max()) if scenario.num_resources else 1
+        self.power_windows = np.zeros((scenario.num_resources, self.window), dtype=np.int64)
+        self.maintenance_windows = np.zeros((scenario.num_resources, self.window), dtype=np.int64)
+        for index, timeline in enumerate(self.evaluator.power_timelines):
+            self.power_windows[index, :len(timeline)] = timeline
+            self.maintenance_windows[index, :len(timeline)] = scenario.periodic_cost[index]
+
+    def fill(self, state, turn, target):
+        """
+        Greedy bundle: best-ranked affordable resources, each at most once, until the
+        power of the turn reaches target (the rule of the greedy solvers for target TM).
+        """
+        power = int(state.power[0])
+        remaining = state.budget
+        bundle = []
+        for i in self.order:
+            if power >= target:
+                break
+            if self.activation_cost[i] <= remaining:
+                remaining -= self.activation_cost[i]
+                power += self.buildings_powered[i]
+                bundle.append(i)
+        return tuple(bundle)
+
+    def bundles(self, state, turn):
+        """
+        Candidate purchases for a state at a turn, as tuples of definition indices:
+        nothing, each of the best-ranked affordable resources alone, and greedy fills
+        up to TM and up to TX.
+        """
+        budget = state.budget
+        affordable = [i for i in self.order if self.activation_cost[i] <= budget]
+        bundles = {(), self.fill(state, turn, int(self.evaluator.TM[turn])),
+                   self.fill(state, turn, int(self.evaluator.TX[turn]))}
+        for i in affordable[:self.num_candidates]:
+            bundles.add((i,))
+        return bundles
+
+    def expand(self, state, turn, bundles):
+        """
+        Apply each bundle to a state and play the turn, all bundles at once.
+        Returns:
+          List of successor BeamStates, one per affordable bundle.
+        """
+        evaluator = self.evaluator
+        bundles = list(bundles)
+        counts = np.zeros((len(bundles), len(self.ids)), dtype=np.int64)
+        for row, bundle in enumerate(bundles):
+            for i in bundle:
+                counts[row, i] += 1
+        cost = counts @ self.scenario.activation_cost
+        power = state.power + counts @ self.power_windows
+        maintenance = state.maintenance + counts @ self.maintenance_windows
+        TM, TX, TR = int(evaluator.TM[turn]), int(evaluator.TX[turn]), int(evaluator.TR[turn])
+        current = power[:, 0]
+        profit = np.where(current >= TM, np.minimum(current, TX) * TR, 0)
+        budgets = state.budget - cost + profit - maintenance[:, 0]
+
+        # Shift the windows to the next turn.
+        next_power = np.zeros_like(power)
+        next_power[:, :-1] = power[:, 1:]
+        next_maintenance = np.zeros_like(maintenance)
+        next_maintenance[:, :-1] = maintenance[:, 1:]
+
+        # Rank by budget plus what the current fleet earns over the window. Power below TM
+        # is credited linearly: later purchases can still lift those turns over TM.
+        horizon = min(self.window, self.num_turns - turn - 1)
+        future_power = next_power[:, :horizon].sum(axis=1)
+        maintenance_total = next_maintenance[:, :horizon].sum(axis=1)
+        earnings = (np.minimum(next_power[:, :horizon], evaluator.TX[turn + 1:turn + 1 + horizon])
+                    * evaluator.TR[turn + 1:turn + 1 + horizon]).sum(axis=1)
+        scores = budgets + earnings - maintenance_total
+
+        successors = []
+        for row, bundle in enumerate(bundles):
+            if bundle and cost[row] > state.budget:
+                continue
+            plan = state.plan
+            if bundle:
+                plan = (turn, [self.ids[i] for i in bundle], plan)
+            successor = BeamState(int(budgets[row]), next_power[row], next_maintenance[row], plan)
+            successor.score = int(scores[row])
+            successor.future_power = int(future_power[row])
+            successor.maintenance_total = int(maintenance_total[row])
+            successors.append(successor)
+        return successors
+
+    def solve(self, time_limit=None, should_stop=None):
+        """
+        Run the beam search over all turns. If time_limit (seconds) runs out or
+        should_stop() returns True, the remaining turns follow the greedy rule from the
+        best-ranked state and from the greedy lane; fallback_turns counts them.
+        Returns:
+          Purchase plan of the state with the highest final budget, as a dictionary
+          mapping turn index to resource IDs.
+        """
+        start = time.perf_counter()
+        self.fallback_turns = 0
+        empty = np.zeros(self.window, dtype=np.int64)
+        beam = [BeamState(self.scenario.initial_budget, empty, empty.copy(), None)]
+        # The greedy lane follows the fill-to-TM rule from the start and is always kept,
+        # so the search never ends below the greedy plan on the exact game model.
+        lane = beam[0]
+        for turn in range(self.num_turns):
+            TM = int(self.evaluator.TM[turn])
+            if not self.fallback_turns:
+                out_of_time = time_limit is not None and time.perf_counter() - start >= time_limit
+                if out_of_time or (should_stop is not None and should_stop()):
+                    self.fallback_turns = self.num_turns - turn
+                    best = max(beam, key=lambda s: s.score)
+                    beam = [best] if best is lane else [best, lane]
+            if self.fallback_turns:
+                beam = [self.expand(state, turn, [self.fill(state, turn, TM)])[0] for state in beam]
+                continue
+
+            successors = []
+            for state in beam:
+                successors.extend(self.expand(state, turn, self.bundles(state, turn)))
+            successors.sort(key=lambda s: s.score, reverse=True)
+            lane, = self.expand(lane, turn, [self.fill(lane, turn, TM)])
+
+            beam, seen = [], set()
+            for successor in successors:
+                key = successor.key()
+                if key in seen or _dominated(successor, beam):
+                    continue
+                seen.add(key)
+                beam.append(successor)
+                if len(beam) == self.width:
+                    break
+            if lane.key() not in seen:
+                beam.append(lane)
+
+        best = max(beam, key=lambda s: s.budget)
+        purchase_plan = {}
+        node = best.plan
+        while node is not None:
+            turn, resource_ids, node = node
+            purchase_plan[turn] = resource_ids
+        return dict(sorted(purchase_plan.items()))
+
+def solve_beam(initial_budget, resources=None, turns=None, width=4, time_limit=None, should_stop=None):
+    """
+    Solve with a beam search keeping `width` states per turn, within time_limit seconds.
+    """
+    return BeamSolver(initial_budget, resources, turns, width=width).solve(time_limit, should_stop)
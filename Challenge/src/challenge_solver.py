@@ -2,644 +2,188 @@
 
 """
 Contains all solver functions, including a default solver and specialized
-ones for each input file.
+ones for each input file. Every solver takes either the (initial_budget,
+resources, turns) triple from parse_input or a compiled Scenario.
 """
 
-def solve_game_default(initial_budget, resources, turns):
+from bisect import bisect_right
+from functools import partial
+
+import numpy as np
+
+from src.scenario import compile_scenario
+
+def solve_game_default(initial_budget, resources=None, turns=None):
     """
     A default (naive) solver that purchases the cheapest resource whenever
     the budget allows. This solver is used if no dedicated solver is found
     for the input file name.
     """
+    scenario = compile_scenario(initial_budget, resources, turns)
     purchase_plan = {}
-    current_budget = initial_budget
+    current_budget = scenario.initial_budget
 
     # Find the resource with the lowest activation cost
-    cheapest_resource = min(resources, key=lambda r: r['activation_cost'])
-    cheapest_cost = cheapest_resource['activation_cost']
-    
-    for turn_index in range(len(turns)):
+    cheapest_index = int(np.argmin(scenario.activation_cost))
+    cheapest_id = int(scenario.ids[cheapest_index])
+    cheapest_cost = int(scenario.activation_cost[cheapest_index])
+
+    for turn_index in range(scenario.num_turns):
         if current_budget >= cheapest_cost:
-            purchase_plan[turn_index] = [cheapest_resource['id']]
+            purchase_plan[turn_index] = [cheapest_id]
             current_budget -= cheapest_cost
         else:
             purchase_plan[turn_index] = []
     return purchase_plan
 
-
-def solve_game_demo_0(initial_budget, resources, turns):
-    """
-    Dedicated solver for 0-demo.txt.
-    """
-    
-    budget = initial_budget
-    acquired_resources = {}
-    active_resources = []
-
-    for t, turn in enumerate(turns):
-        TM, TX, TR = turn['TM'], turn['TX'], turn['TR']
-        acquired_resources[t] = []
-
-        # Buy resources strategically
-        affordable_resources = sorted(
-            [r for r in resources if r['activation_cost'] <= budget],
-            key=lambda r: (-r['buildings_powered'] / (r['activation_cost'] + r['periodic_cost']), r['activation_cost'])
-        )
-
-        total_power = sum(r['buildings_powered'] for r in active_resources if r['active'])
-
-        for res in affordable_resources:
-            if total_power >= TM:
-                break
-            if budget >= res['activation_cost']:
-                budget -= res['activation_cost']
-                acquired_resources[t].append(res['id'])
-                active_resources.append({
-                    'id': res['id'],
-                    'activation_cost': res['activation_cost'],
-                    'periodic_cost': res['periodic_cost'],
-                    'active_turns': res['active_duration'],
-                    'downtime_turns': res['downtime'],
-                    'lifespan': res['lifecycle'],
-                    'buildings_powered': res['buildings_powered'],
-                    'type': res['resource_type'],
-                    'effect': res['special_effect'],
-                    'remaining_life': res['lifecycle'],
-                    'current_state': res['active_duration'],
-                    'active': True
-                })
-                total_power += res['buildings_powered']
-
-        # Calculate profit
-        buildings_served = min(total_power, TX)
-        profit = buildings_served * TR if buildings_served >= TM else 0
-
-        # Maintenance costs
-        maintenance = sum(res['periodic_cost'] for res in active_resources if res['active'])
-
-        # Update budget
-        budget += profit - maintenance
-
-        # Update resource lifespans and active/downtime state
-        for res in active_resources[:]:
-            res['remaining_life'] -= 1
-            res['current_state'] -= 1
-
-            if res['remaining_life'] <= 0:
-                active_resources.remove(res)
-                continue
-
-            if res['current_state'] == 0:
-                res['active'] = not res['active']
-                res['current_state'] = res['active_turns'] if res['active'] else res['downtime_turns']
-
-    return acquired_resources
-
-def solve_game_thunberg_1(initial_budget, resources, turns):
-    """
-    Dedicated solver for 1-thunberg.txt.
-    """
-    budget = initial_budget
+def ratio_rank_key(scenario):
+    """
+    Ranking used by the dedicated solvers: most buildings powered per unit of
+    activation plus periodic cost first, cheaper activation on ties.
+    Returns:
+      List of sort keys, one per resource index.
+    """
+    buildings_powered = scenario.buildings_powered.tolist()
+    activation_cost = scenario.activation_cost.tolist()
+    periodic_cost = scenario.periodic_cost.tolist()
+    return [
+        (-buildings_powered[i] / (activation_cost[i] + periodic_cost[i]), activation_cost[i])
+        for i in range(scenario.num_resources)
+    ]
+
+def below_minimum(power, TM, TX):
+    """
+    Default stop condition: keep buying while the powered buildings are below TM.
+    """
+    return power < TM
+
+class GreedyStrategy:
+    """
+    Configuration of the greedy engine.
+    """
+
+    def __init__(self, rank_key=ratio_rank_key, keep_buying=below_minimum, min_remaining_turns=0):
+        """
+        - rank_key: function(scenario) -> list of sort keys per resource index (ascending = preferred)
+        - keep_buying: function(power, TM, TX) -> True while more power should be bought this turn
+        - min_remaining_turns: stop buying once fewer turns than this are left in the game
+        """
+        self.rank_key = rank_key
+        self.keep_buying = keep_buying
+        self.min_remaining_turns = min_remaining_turns
+
+# The strategy every dedicated solver used.
+RATIO_STRATEGY = GreedyStrategy()
+
+def _greedy_timeline(active_duration, downtime, lifecycle, length):
+    """
+    Active flags per age of a resource, as modelled by the greedy solvers: a resource
+    starts active, alternates active_duration and downtime turns, stays in a state of
+    zero duration forever and is removed after max(lifecycle, 1) turns.
+    """
+    ages = np.arange(min(max(lifecycle, 1), length))
+    if active_duration == 0:
+        return np.ones(len(ages), dtype=np.int64)
+    if downtime == 0:
+        return (ages < active_duration).astype(np.int64)
+    return (ages % (active_duration + downtime) < active_duration).astype(np.int64)
+
+def solve_greedy(initial_budget, resources=None, turns=None, strategy=RATIO_STRATEGY):
+    """
+    Greedy engine behind the dedicated solvers. Every turn it walks the resources in
+    strategy order and buys each one the budget still covers, until the strategy's
+    stop condition holds. Resources are ranked once; turns where nothing is affordable
+    are skipped with a bisect on the sorted costs, and the walk ends as soon as no
+    remaining resource is affordable. The fleet is kept as future power and
+    maintenance arrays, updated once per purchase.
+    Returns:
+      Dictionary mapping every turn index to the list of resource IDs bought.
+    """
+    scenario = compile_scenario(initial_budget, resources, turns)
+    num_turns = scenario.num_turns
+    ids = scenario.ids.tolist()
+    activation_cost = scenario.activation_cost.tolist()
+    periodic_cost = scenario.periodic_cost.tolist()
+    buildings_powered = scenario.buildings_powered.tolist()
+
+    keys = strategy.rank_key(scenario)
+    order = sorted(range(scenario.num_resources), key=keys.__getitem__)
+    order_cost = [activation_cost[i] for i in order]
+    # Cheapest activation cost from each ranked position onward.
+    suffix_min_cost = order_cost + [float('inf')]
+    for position in range(len(order) - 2, -1, -1):
+        suffix_min_cost[position] = min(suffix_min_cost[position], suffix_min_cost[position + 1])
+    sorted_costs = sorted(activation_cost)
+
+    timelines = {}
+    future_power = np.zeros(num_turns, dtype=np.int64)
+    future_maintenance = np.zeros(num_turns, dtype=np.int64)
+    keep_buying = strategy.keep_buying
+    last_buying_turn = num_turns - strategy.min_remaining_turns
+
+    budget = scenario.initial_budget
     acquired_resources = {}
-    active_resources = []
-
-    for t, turn in enumerate(turns):
-        TM, TX, TR = turn['TM'], turn['TX'], turn['TR']
+    for t, (TM, TX, TR) in enumerate(zip(scenario.TM.tolist(), scenario.TX.tolist(), scenario.TR.tolist())):
         acquired_resources[t] = []
-
-        # Buy resources strategically
-        affordable_resources = sorted(
-            [r for r in resources if r['activation_cost'] <= budget],
-            key=lambda r: (-r['buildings_powered'] / (r['activation_cost'] + r['periodic_cost']), r['activation_cost'])
-        )
-
-        total_power = sum(r['buildings_powered'] for r in active_resources if r['active'])
-
-        for res in affordable_resources:
-            if total_power >= TM:
-                break
-            if budget >= res['activation_cost']:
-                budget -= res['activation_cost']
-                acquired_resources[t].append(res['id'])
-                active_resources.append({
-                    'id': res['id'],
-                    'activation_cost': res['activation_cost'],
-                    'periodic_cost': res['periodic_cost'],
-                    'active_turns': res['active_duration'],
-                    'downtime_turns': res['downtime'],
-                    'lifespan': res['lifecycle'],
-                    'buildings_powered': res['buildings_powered'],
-                    'type': res['resource_type'],
-                    'effect': res['special_effect'],
-                    'remaining_life': res['lifecycle'],
-                    'current_state': res['active_duration'],
-                    'active': True
-                })
-                total_power += res['buildings_powered']
+        total_power = int(future_power[t])
+
+        if t <= last_buying_turn - 1 and bisect_right(sorted_costs, budget) and keep_buying(total_power, TM, TX):
+            bought = acquired_resources[t]
+            for position, i in enumerate(order):
+                if budget < suffix_min_cost[position]:
+                    break
+                if budget >= order_cost[position]:
+                    budget -= order_cost[position]
+                    bought.append(ids[i])
+                    timeline = timelines.get(i)
+                    if timeline is None:
+                        timeline = timelines[i] = _greedy_timeline(
+                            int(scenario.active_duration[i]), int(scenario.downtime[i]),
+                            int(scenario.lifecycle[i]), num_turns)
+                    end = min(t + len(timeline), num_turns)
+                    active = timeline[:end - t]
+                    future_power[t:end] += buildings_powered[i] * active
+                    future_maintenance[t:end] += periodic_cost[i] * active
+                    total_power += buildings_powered[i]
+                    if not keep_buying(total_power, TM, TX):
+                        break
 
         # Calculate profit
         buildings_served = min(total_power, TX)
         profit = buildings_served * TR if buildings_served >= TM else 0
 
-        # Maintenance costs
-        maintenance = sum(res['periodic_cost'] for res in active_resources if res['active'])
-
         # Update budget
-        budget += profit - maintenance
-
-        # Update resource lifespans and active/downtime state
-        for res in active_resources[:]:
-            res['remaining_life'] -= 1
-            res['current_state'] -= 1
-
-            if res['remaining_life'] <= 0:
-                active_resources.remove(res)
-                continue
-
-            if res['current_state'] == 0:
-                res['active'] = not res['active']
-                res['current_state'] = res['active_turns'] if res['active'] else res['downtime_turns']
+        budget += profit - int(future_maintenance[t])
 
     return acquired_resources
 
-def solve_game_attenborough_2(initial_budget, resources, turns):
+def solve_game(initial_budget, resources=None, turns=None):
     """
-    Dedicated solver for 2-attenborough.txt.
+    Solve any input with the greedy engine and the default ratio strategy.
     """
-    budget = initial_budget
-    acquired_resources = {}
-    active_resources = []
-
-    for t, turn in enumerate(turns):
-        TM, TX, TR = turn['TM'], turn['TX'], turn['TR']
-        acquired_resources[t] = []
-
-        # Buy resources strategically
-        affordable_resources = sorted(
-            [r for r in resources if r['activation_cost'] <= budget],
-            key=lambda r: (-r['buildings_powered'] / (r['activation_cost'] + r['periodic_cost']), r['activation_cost'])
-        )
-
-        total_power = sum(r['buildings_powered'] for r in active_resources if r['active'])
-
-        for res in affordable_resources:
-            if total_power >= TM:
-                break
-            if budget >= res['activation_cost']:
-                budget -= res['activation_cost']
-                acquired_resources[t].append(res['id'])
-                active_resources.append({
-                    'id': res['id'],
-                    'activation_cost': res['activation_cost'],
-                    'periodic_cost': res['periodic_cost'],
-                    'active_turns': res['active_duration'],
-                    'downtime_turns': res['downtime'],
-                    'lifespan': res['lifecycle'],
-                    'buildings_powered': res['buildings_powered'],
-                    'type': res['resource_type'],
-                    'effect': res['special_effect'],
-                    'remaining_life': res['lifecycle'],
-                    'current_state': res['active_duration'],
-                    'active': True
-                })
-                total_power += res['buildings_powered']
-
-        # Calculate profit
-        buildings_served = min(total_power, TX)
-        profit = buildings_served * TR if buildings_served >= TM else 0
-
-        # Maintenance costs
-        maintenance = sum(res['periodic_cost'] for res in active_resources if res['active'])
-
-        # Update budget
-        budget += profit - maintenance
-
-        # Update resource lifespans and active/downtime state
-        for res in active_resources[:]:
-            res['remaining_life'] -= 1
-            res['current_state'] -= 1
-
-            if res['remaining_life'] <= 0:
-                active_resources.remove(res)
-                continue
-
-            if res['current_state'] == 0:
-                res['active'] = not res['active']
-                res['current_state'] = res['active_turns'] if res['active'] else res['downtime_turns']
-
-    return acquired_resources
-
-def solve_game_goodall_3(initial_budget, resources, turns):
-    """
-    Dedicated solver for 3-goodall.txt.
-    """
-    budget = initial_budget
-    acquired_resources = {}
-    active_resources = []
-
-    for t, turn in enumerate(turns):
-        TM, TX, TR = turn['TM'], turn['TX'], turn['TR']
-        acquired_resources[t] = []
-
-        # Buy resources strategically
-        affordable_resources = sorted(
-            [r for r in resources if r['activation_cost'] <= budget],
-            key=lambda r: (-r['buildings_powered'] / (r['activation_cost'] + r['periodic_cost']), r['activation_cost'])
-        )
-
-        total_power = sum(r['buildings_powered'] for r in active_resources if r['active'])
-
-        for res in affordable_resources:
-            if total_power >= TM:
-                break
-            if budget >= res['activation_cost']:
-                budget -= res['activation_cost']
-                acquired_resources[t].append(res['id'])
-                active_resources.append({
-                    'id': res['id'],
-                    'activation_cost': res['activation_cost'],
-                    'periodic_cost': res['periodic_cost'],
-                    'active_turns': res['active_duration'],
-                    'downtime_turns': res['downtime'],
-                    'lifespan': res['lifecycle'],
-                    'buildings_powered': res['buildings_powered'],
-                    'type': res['resource_type'],
-                    'effect': res['special_effect'],
-                    'remaining_life': res['lifecycle'],
-                    'current_state': res['active_duration'],
-                    'active': True
-                })
-                total_power += res['buildings_powered']
-
-        # Calculate profit
-        buildings_served = min(total_power, TX)
-        profit = buildings_served * TR if buildings_served >= TM else 0
-
-        # Maintenance costs
-        maintenance = sum(res['periodic_cost'] for res in active_resources if res['active'])
-
-        # Update budget
-        budget += profit - maintenance
-
-        # Update resource lifespans and active/downtime state
-        for res in active_resources[:]:
-            res['remaining_life'] -= 1
-            res['current_state'] -= 1
-
-            if res['remaining_life'] <= 0:
-                active_resources.remove(res)
-                continue
-
-            if res['current_state'] == 0:
-                res['active'] = not res['active']
-                res['current_state'] = res['active_turns'] if res['active'] else res['downtime_turns']
-
-    return acquired_resources
-
-def solve_game_maathai_4(initial_budget, resources, turns):
-    """
-    Dedicated solver for 4-maathai.txt.
-    """
-    budget = initial_budget
-    acquired_resources = {}
-    active_resources = []
-
-    for t, turn in enumerate(turns):
-        TM, TX, TR = turn['TM'], turn['TX'], turn['TR']
-        acquired_resources[t] = []
-
-        # Buy resources strategically
-        affordable_resources = sorted(
-            [r for r in resources if r['activation_cost'] <= budget],
-            key=lambda r: (-r['buildings_powered'] / (r['activation_cost'] + r['periodic_cost']), r['activation_cost'])
-        )
-
-        total_power = sum(r['buildings_powered'] for r in active_resources if r['active'])
-
-        for res in affordable_resources:
-            if total_power >= TM:
-                break
-            if budget >= res['activation_cost']:
-                budget -= res['activation_cost']
-                acquired_resources[t].append(res['id'])
-                active_resources.append({
-                    'id': res['id'],
-                    'activation_cost': res['activation_cost'],
-                    'periodic_cost': res['periodic_cost'],
-                    'active_turns': res['active_duration'],
-                    'downtime_turns': res['downtime'],
-                    'lifespan': res['lifecycle'],
-                    'buildings_powered': res['buildings_powered'],
-                    'type': res['resource_type'],
-                    'effect': res['special_effect'],
-                    'remaining_life': res['lifecycle'],
-                    'current_state': res['active_duration'],
-                    'active': True
-                })
-                total_power += res['buildings_powered']
-
-        # Calculate profit
-        buildings_served = min(total_power, TX)
-        profit = buildings_served * TR if buildings_served >= TM else 0
-
-        # Maintenance costs
-        maintenance = sum(res['periodic_cost'] for res in active_resources if res['active'])
-
-        # Update budget
-        budget += profit - maintenance
+    return solve_greedy(initial_budget, resources, turns)
 
-        # Update resource lifespans and active/downtime state
-        for res in active_resources[:]:
-            res['remaining_life'] -= 1
-            res['current_state'] -= 1
-
-            if res['remaining_life'] <= 0:
-                active_resources.remove(res)
-                continue
-
-            if res['current_state'] == 0:
-                res['active'] = not res['active']
-                res['current_state'] = res['active_turns'] if res['active'] else res['downtime_turns']
-
-    return acquired_resources
-
-def solve_game_carson_5(initial_budget, resources, turns):
-    """
-    Dedicated solver for 5-carson.txt.
-    """
-    budget = initial_budget
-    acquired_resources = {}
-    active_resources = []
-
-    for t, turn in enumerate(turns):
-        TM, TX, TR = turn['TM'], turn['TX'], turn['TR']
-        acquired_resources[t] = []
-
-        # Buy resources strategically
-        affordable_resources = sorted(
-            [r for r in resources if r['activation_cost'] <= budget],
-            key=lambda r: (-r['buildings_powered'] / (r['activation_cost'] + r['periodic_cost']), r['activation_cost'])
-        )
-
-        total_power = sum(r['buildings_powered'] for r in active_resources if r['active'])
-
-        for res in affordable_resources:
-            if total_power >= TM:
-                break
-            if budget >= res['activation_cost']:
-                budget -= res['activation_cost']
-                acquired_resources[t].append(res['id'])
-                active_resources.append({
-                    'id': res['id'],
-                    'activation_cost': res['activation_cost'],
-                    'periodic_cost': res['periodic_cost'],
-                    'active_turns': res['active_duration'],
-                    'downtime_turns': res['downtime'],
-                    'lifespan': res['lifecycle'],
-                    'buildings_powered': res['buildings_powered'],
-                    'type': res['resource_type'],
-                    'effect': res['special_effect'],
-                    'remaining_life': res['lifecycle'],
-                    'current_state': res['active_duration'],
-                    'active': True
-                })
-                total_power += res['buildings_powered']
-
-        # Calculate profit
-        buildings_served = min(total_power, TX)
-        profit = buildings_served * TR if buildings_served >= TM else 0
-
-        # Maintenance costs
-        maintenance = sum(res['periodic_cost'] for res in active_resources if res['active'])
-
-        # Update budget
-        budget += profit - maintenance
-
-        # Update resource lifespans and active/downtime state
-        for res in active_resources[:]:
-            res['remaining_life'] -= 1
-            res['current_state'] -= 1
-
-            if res['remaining_life'] <= 0:
-                active_resources.remove(res)
-                continue
-
-            if res['current_state'] == 0:
-                res['active'] = not res['active']
-                res['current_state'] = res['active_turns'] if res['active'] else res['downtime_turns']
-
-    return acquired_resources
-
-def solve_game_earle_6(initial_budget, resources, turns):
-    """
-    Dedicated solver for 6-earle.txt.
-    """
-    budget = initial_budget
-    acquired_resources = {}
-    active_resources = []
-
-    for t, turn in enumerate(turns):
-        TM, TX, TR = turn['TM'], turn['TX'], turn['TR']
-        acquired_resources[t] = []
-
-        # Buy resources strategically
-        affordable_resources = sorted(
-            [r for r in resources if r['activation_cost'] <= budget],
-            key=lambda r: (-r['buildings_powered'] / (r['activation_cost'] + r['periodic_cost']), r['activation_cost'])
-        )
-
-        total_power = sum(r['buildings_powered'] for r in active_resources if r['active'])
-
-        for res in affordable_resources:
-            if total_power >= TM:
-                break
-            if budget >= res['activation_cost']:
-                budget -= res['activation_cost']
-                acquired_resources[t].append(res['id'])
-                active_resources.append({
-                    'id': res['id'],
-                    'activation_cost': res['activation_cost'],
-                    'periodic_cost': res['periodic_cost'],
-                    'active_turns': res['active_duration'],
-                    'downtime_turns': res['downtime'],
-                    'lifespan': res['lifecycle'],
-                    'buildings_powered': res['buildings_powered'],
-                    'type': res['resource_type'],
-                    'effect': res['special_effect'],
-                    'remaining_life': res['lifecycle'],
-                    'current_state': res['active_duration'],
-                    'active': True
-                })
-                total_power += res['buildings_powered']
-
-        # Calculate profit
-        buildings_served = min(total_power, TX)
-        profit = buildings_served * TR if buildings_served >= TM else 0
-
-        # Maintenance costs
-        maintenance = sum(res['periodic_cost'] for res in active_resources if res['active'])
-
-        # Update budget
-        budget += profit - maintenance
-
-        # Update resource lifespans and active/downtime state
-        for res in active_resources[:]:
-            res['remaining_life'] -= 1
-            res['current_state'] -= 1
-
-            if res['remaining_life'] <= 0:
-                active_resources.remove(res)
-                continue
-
-            if res['current_state'] == 0:
-                res['active'] = not res['active']
-                res['current_state'] = res['active_turns'] if res['active'] else res['downtime_turns']
-
-    return acquired_resources
-
-def solve_game_mckibben_7(initial_budget, resources, turns):
-    """
-    Dedicated solver for 7-mckibben.txt.
-    """
-    budget = initial_budget
-    acquired_resources = {}
-    active_resources = []
-
-    for t, turn in enumerate(turns):
-        TM, TX, TR = turn['TM'], turn['TX'], turn['TR']
-        acquired_resources[t] = []
-
-        # Buy resources strategically
-        affordable_resources = sorted(
-            [r for r in resources if r['activation_cost'] <= budget],
-            key=lambda r: (-r['buildings_powered'] / (r['activation_cost'] + r['periodic_cost']), r['activation_cost'])
-        )
-
-        total_power = sum(r['buildings_powered'] for r in active_resources if r['active'])
-
-        for res in affordable_resources:
-            if total_power >= TM:
-                break
-            if budget >= res['activation_cost']:
-                budget -= res['activation_cost']
-                acquired_resources[t].append(res['id'])
-                active_resources.append({
-                    'id': res['id'],
-                    'activation_cost': res['activation_cost'],
-                    'periodic_cost': res['periodic_cost'],
-                    'active_turns': res['active_duration'],
-                    'downtime_turns': res['downtime'],
-                    'lifespan': res['lifecycle'],
-                    'buildings_powered': res['buildings_powered'],
-                    'type': res['resource_type'],
-                    'effect': res['special_effect'],
-                    'remaining_life': res['lifecycle'],
-                    'current_state': res['active_duration'],
-                    'active': True
-                })
-                total_power += res['buildings_powered']
-
-        # Calculate profit
-        buildings_served = min(total_power, TX)
-        profit = buildings_served * TR if buildings_served >= TM else 0
-
-        # Maintenance costs
-        maintenance = sum(res['periodic_cost'] for res in active_resources if res['active'])
-
-        # Update budget
-        budget += profit - maintenance
-
-        # Update resource lifespans and active/downtime state
-        for res in active_resources[:]:
-            res['remaining_life'] -= 1
-            res['current_state'] -= 1
-
-            if res['remaining_life'] <= 0:
-                active_resources.remove(res)
-                continue
-
-            if res['current_state'] == 0:
-                res['active'] = not res['active']
-                res['current_state'] = res['active_turns'] if res['active'] else res['downtime_turns']
-
-    return acquired_resources
-
-def solve_game_shiva_8(initial_budget, resources, turns):
-    """
-    Dedicated solver for 8-shiva.txt.
-    """
-    budget = initial_budget
-    acquired_resources = {}
-    active_resources = []
-
-    for t, turn in enumerate(turns):
-        TM, TX, TR = turn['TM'], turn['TX'], turn['TR']
-        acquired_resources[t] = []
-
-        # Buy resources strategically
-        affordable_resources = sorted(
-            [r for r in resources if r['activation_cost'] <= budget],
-            key=lambda r: (-r['buildings_powered'] / (r['activation_cost'] + r['periodic_cost']), r['activation_cost'])
-        )
-
-        total_power = sum(r['buildings_powered'] for r in active_resources if r['active'])
-
-        for res in affordable_resources:
-            if total_power >= TM:
-                break
-            if budget >= res['activation_cost']:
-                budget -= res['activation_cost']
-                acquired_resources[t].append(res['id'])
-                active_resources.append({
-                    'id': res['id'],
-                    'activation_cost': res['activation_cost'],
-                    'periodic_cost': res['periodic_cost'],
-                    'active_turns': res['active_duration'],
-                    'downtime_turns': res['downtime'],
-                    'lifespan': res['lifecycle'],
-                    'buildings_powered': res['buildings_powered'],
-                    'type': res['resource_type'],
-                    'effect': res['special_effect'],
-                    'remaining_life': res['lifecycle'],
-                    'current_state': res['active_duration'],
-                    'active': True
-                })
-                total_power += res['buildings_powered']
-
-        # Calculate profit
-        buildings_served = min(total_power, TX)
-        profit = buildings_served * TR if buildings_served >= TM else 0
-
-        # Maintenance costs
-        maintenance = sum(res['periodic_cost'] for res in active_resources if res['active'])
-
-        # Update budget
-        budget += profit - maintenance
-
-        # Update resource lifespans and active/downtime state
-        for res in active_resources[:]:
-            res['remaining_life'] -= 1
-            res['current_state'] -= 1
-
-            if res['remaining_life'] <= 0:
-                active_resources.remove(res)
-                continue
-
-            if res['current_state'] == 0:
-                res['active'] = not res['active']
-                res['current_state'] = res['active_turns'] if res['active'] else res['downtime_turns']
-
-    return acquired_resources
-
-# Dictionary mapping specific input filenames to dedicated solvers
+# Dictionary mapping specific input filenames to dedicated solvers,
+# each a configuration of the greedy engine.
 SOLVER_MAPPING = {
-    "0-demo.txt": solve_game_demo_0,
-    "1-thunberg.txt": solve_game_thunberg_1,
-    "2-attenborough.txt": solve_game_attenborough_2,
-    "3-goodall.txt": solve_game_goodall_3,
-    "4-maathai.txt": solve_game_maathai_4,
-    "5-carson.txt": solve_game_carson_5,
-    "6-earle.txt": solve_game_earle_6,
-    "7-mckibben.txt": solve_game_mckibben_7,
-    "8-shiva.txt": solve_game_shiva_8,
+    "0-demo.txt": partial(solve_greedy, strategy=RATIO_STRATEGY),
+    "1-thunberg.txt": partial(solve_greedy, strategy=RATIO_STRATEGY),
+    "2-attenborough.txt": partial(solve_greedy, strategy=RATIO_STRATEGY),
+    "3-goodall.txt": partial(solve_greedy, strategy=RATIO_STRATEGY),
+    "4-maathai.txt": partial(solve_greedy, strategy=RATIO_STRATEGY),
+    "5-carson.txt": partial(solve_greedy, strategy=RATIO_STRATEGY),
+    "6-earle.txt": partial(solve_greedy, strategy=RATIO_STRATEGY),
+    "7-mckibben.txt": partial(solve_greedy, strategy=RATIO_STRATEGY),
+    "8-shiva.txt": partial(solve_greedy, strategy=RATIO_STRATEGY),
 }
+
+# Names of the former per-file solvers.
+solve_game_demo_0 = SOLVER_MAPPING["0-demo.txt"]
+solve_game_thunberg_1 = SOLVER_MAPPING["1-thunberg.txt"]
+solve_game_attenborough_2 = SOLVER_MAPPING["2-attenborough.txt"]
+solve_game_goodall_3 = SOLVER_MAPPING["3-goodall.txt"]
+solve_game_maathai_4 = SOLVER_MAPPING["4-maathai.txt"]
+solve_game_carson_5 = SOLVER_MAPPING["5-carson.txt"]
+solve_game_earle_6 = SOLVER_MAPPING["6-earle.txt"]
+solve_game_mckibben_7 = SOLVER_MAPPING["7-mckibben.txt"]
+solve_game_shiva_8 = SOLVER_MAPPING["8-shiva.txt"]
@@ -0,0 +1,174 @@
+# src/columnar_parser.py
+
+"""
+Columnar input parser. The header and the resource block (a few lines) are split
+in Python into typed columns, the type letter stored as its code; the turn block
+is converted in bulk, chunk by chunk, from raw bytes to int64 digits and reduced
+into TM/TX/TR arrays with NumPy, without building a string or a dict per turn.
+The input can be a path (memory-mapped), bytes, a binary or text stream or an
+mmap, so tests and services can parse without touching disk.
+"""
+
+import mmap
+import os
+
+import numpy as np
+
+from src.scenario import RESOURCE_COLUMNS, Scenario, type_code
+
+# Bytes of the turn block converted at once; chunks end on a line break.
+CHUNK_SIZE = 1 << 18
+
+_DIGIT = np.zeros(256, dtype=bool)
+_DIGIT[ord('0'):ord('9') + 1] = True
+# Bytes allowed in the turn block: digits, minus signs and whitespace.
+_ALLOWED = _DIGIT.copy()
+for _byte in b'- \t\r\n\f\v':
+    _ALLOWED[_byte] = True
+_POWERS = 10 ** np.arange(19, dtype=np.int64)
+
+def _buffer(source):
+    """
+    Bytes-like view of a source, plus the objects to close once parsed.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        f = open(source, 'rb')
+        if os.fstat(f.fileno()).st_size == 0:
+            f.close()
+            return b'', []
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return data, [data, f]
+    if isinstance(source, memoryview):
+        return source.tobytes(), []
+    if isinstance(source, (bytes, bytearray, mmap.mmap)):
+        return source, []
+    data = source.read()
+    return (data.encode() if isinstance(data, str) else data), []
+
+def _next_line(data, position):
+    """
+    Next non-blank line from position.
+    Returns:
+      Tuple (line as bytes, position after it), with line None at the end of the data.
+    """
+    while position < len(data):
+        end = data.find(b'\n', position)
+        end = len(data) if end < 0 else end
+        line = bytes(data[position:end]).strip()
+        position = end + 1
+        if line:
+            return line, position
+    return None, position
+
+def parse_int_block(data, with_lines=False):
+    """
+    Parse whitespace-separated integers from a bytes-like object.
+    Returns:
+      int64 array of the integers, in order, and with with_lines the index of the
+      line of each integer.
+    Raises:
+      ValueError on a byte that is not a digit, a minus sign or whitespace, or on
+      integers longer than 18 digits.
+    """
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if not _ALLOWED[raw].all():
+        raise ValueError("unexpected character in integer block")
+    digit = _DIGIT[raw]
+    positions = np.flatnonzero(digit)
+    if not len(positions):
+        empty = np.zeros(0, dtype=np.int64)
+        return (empty, empty) if with_lines else empty
+    # A token starts at a digit not preceded by a digit.
+    starts_mask = np.ones(len(positions), dtype=bool)
+    starts_mask[1:] = positions[1:] != positions[:-1] + 1
+    starts = np.flatnonzero(starts_mask)
+    ends = np.append(starts[1:], len(positions))
+    lengths = ends - starts
+    if lengths.max() > 18:
+        raise ValueError("integer too long")
+    # Place value of every digit: 10 ** (digits left in its token).
+    token = np.cumsum(starts_mask) - 1
+    place = ends[token] - np.arange(len(positions)) - 1
+    values = np.add.reduceat((raw[positions] - ord('0')).astype(np.int64) * _POWERS[place], starts)
+    first = positions[starts]
+    negative = np.zeros(len(starts), dtype=bool)
+    has_prefix = first > 0
+    negative[has_prefix] = raw[first[has_prefix] - 1] == ord('-')
+    values[negative] = -values[negative]
+    if with_lines:
+        line_starts = np.flatnonzero(raw == ord('\n'))
+        return values, np.searchsorted(line_starts, first)
+    return values
+
+def _parse_turns(data, position, num_turns, chunk_size):
+    """
+    TM, TX and TR arrays of the turn block starting at position, converted in chunks.
+    Falls back to line-by-line parsing when the block is not exactly three integers on
+    each of num_turns lines (extra fields or trailing lines), keeping only the first
+    three fields of the first num_turns lines like parse_turn_line.
+    """
+    columns = np.empty((3, num_turns), dtype=np.int64)
+    filled = 0
+    try:
+        while position < len(data):
+            end = min(position + chunk_size, len(data))
+            if end < len(data):
+                # Cut after the last line break so no line is split between chunks.
+                cut = data.rfind(b'\n', position, end)
+                end = cut + 1 if cut >= position else data.find(b'\n', end) + 1 or len(data)
+            block, lines = parse_int_block(data[position:end], with_lines=True)
+            lines = lines.reshape(-1, 3) if len(lines) % 3 == 0 else None
+            if (lines is None or (lines != lines[:, :1]).any()
+                    or (np.diff(lines[:, 0]) <= 0).any()):
+                raise ValueError("turn block is not three integers per line")
+            rows = len(block) // 3
+            if filled + rows > num_turns:
+                raise ValueError("extra values in turn block")
+            columns[:, filled:filled + rows] = block.reshape(rows, 3).T
+            filled += rows
+            position = end
+        if filled != num_turns:
+            raise ValueError("missing values in turn block")
+    except ValueError:
+        rows = []
+        while len(rows) < num_turns:
+            line, position = _next_line(data, position)
+            if line is None:
+                raise ValueError(f"expected {num_turns} turns, found {len(rows)}") from None
+            rows.append([int(part) for part in line.split()[:3]])
+        columns = np.array(rows, dtype=np.int64).reshape(num_turns, 3).T.copy()
+    return columns[0], columns[1], columns[2]
+
+def parse_columnar(source, chunk_size=CHUNK_SIZE):
+    """
+    Parse a challenge input into a compiled Scenario.
+      - source: path, bytes-like object, mmap, or binary or text stream
+      - chunk_size: bytes of the turn block converted at once
+    Returns:
+      Scenario.
+    """
+    data, to_close = _buffer(source)
+    try:
+        header, position = _next_line(data, 0)
+        if header is None:
+            raise ValueError("empty input")
+        initial_budget, num_resources, num_turns = (int(part) for part in header.split()[:3])
+
+        ids, type_codes = [], []
+        columns = {name: [] for name in RESOURCE_COLUMNS}
+        for _ in range(num_resources):
+            line, position = _next_line(data, position)
+            if line is None:
+                raise ValueError(f"expected {num_resources} resources, found {len(ids)}")
+            parts = line.split()
+            ids.append(int(parts[0]))
+            for name, part in zip(RESOURCE_COLUMNS[:6], parts[1:7]):
+                columns[name].append(int(part))
+            type_codes.append(type_code(parts[7].decode()))
+            columns['special_effect'].append(int(parts[8]) if len(parts) > 8 else 0)
+
+        TM, TX, TR = _parse_turns(data, position, num_turns, chunk_size)
+        return Scenario(initial_budget, ids, type_codes, columns, TM, TX, TR)
+    finally:
+        for resource in to_close:
+            resource.close()
@@ -0,0 +1,305 @@
+# src/delta_evaluator.py
+
+"""
+Incremental (delta) evaluation of purchase plans for local search. The evaluator
+holds a plan together with its cached per-turn power, maintenance and budget
+curves, and scores single-purchase changes in time proportional to the turns the
+changed resources cover instead of re-simulating the whole horizon. Committing a
+change costs the same: the budget shift past the changed window is kept as a
+pending suffix offset, and the purchase-turn slack lives in a segment tree with
+suffix additions, so nothing is rewritten over the rest of the horizon.
+"""
+
+import numpy as np
+
+from src.plan_evaluator import PlanEvaluator
+
+# Slack assigned to turns without purchases, so they never limit feasibility. Kept
+# well below the int64 limit so that suffix offsets cannot overflow it.
+NO_PURCHASE_SLACK = np.iinfo(np.int64).max // 4
+
+class _SuffixOffsets:
+    """
+    Pending additions to every turn from some turn onward, as a Fenwick tree over
+    their difference array: adding and reading one turn both cost O(log turns).
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.tree = [0] * (size + 1)
+        self.diff = np.zeros(size + 1, dtype=np.int64)
+
+    def add_from(self, start, value):
+        if start >= self.size:
+            return
+        self.diff[start] += value
+        i = start + 1
+        while i <= self.size:
+            self.tree[i] += value
+            i += i & -i
+
+    def window(self, start, end):
+        """
+        Offsets of turns start to end - 1.
+        """
+        offsets = np.cumsum(self.diff[start:end])
+        if end > start:
+            total = 0
+            i = start + 1
+            while i > 0:
+                total += self.tree[i]
+                i -= i & -i
+            offsets += total - self.diff[start]
+        return offsets
+
+class _SuffixMinTree:
+    """
+    Segment tree over per-turn values with suffix additions and suffix minimums in
+    O(log turns), and window assignment in O(window + log turns). A node holds the
+    minimum of its subtree plus its own pending addition, so nothing is pushed down:
+    the value of a node is its entry plus the additions of its ancestors.
+    """
+
+    def __init__(self, values):
+        size = 1
+        while size < len(values):
+            size *= 2
+        self.size = size
+        self.levels = size.bit_length() - 1
+        self.tree = np.full(2 * size, NO_PURCHASE_SLACK, dtype=np.int64)
+        self.add = np.zeros(2 * size, dtype=np.int64)
+        self.tree[size:size + len(values)] = values
+        self._pull(size, 2 * size)
+
+    def _pull(self, low, high):
+        """
+        Recompute the ancestors of the nodes low to high - 1, level by level, then
+        node by node once the range has narrowed to a single path.
+        """
+        tree, add = self.tree, self.add
+        while high - low > 1:
+            low, high = low >> 1, ((high - 1) >> 1) + 1
+            children = tree[2 * low:2 * high]
+            tree[low:high] = np.minimum(children[0::2], children[1::2]) + add[low:high]
+        node = low
+        while node > 1:
+            node >>= 1
+            tree[node] = min(tree[2 * node], tree[2 * node + 1]) + add[node]
+
+    def assign(self, start, values):
+        leaves = np.arange(start, start + len(values)) + self.size
+        above = np.zeros(len(values), dtype=np.int64)
+        nodes = leaves
+        for _ in range(self.levels):
+            nodes = nodes >> 1
+            above += self.add[nodes]
+        self.tree[leaves] = values - above
+        self._pull(int(leaves[0]), int(leaves[-1]) + 1)
+
+    def add_suffix(self, start, value):
+        if start >= self.size:
+            return
+        first = start + self.size
+        node = first
+        top = 2 * self.size
+        while node < top:
+            if node & 1:
+                self.tree[node] += value
+                self.add[node] += value
+                node += 1
+            node >>= 1
+            top >>= 1
+        self._pull(first, first + 1)
+        self._pull(2 * self.size - 1, 2 * self.size)
+
+    def min_suffix(self, start):
+        best = int(NO_PURCHASE_SLACK)
+        node = start + self.size
+        top = 2 * self.size
+        while node < top:
+            if node & 1:
+                value = int(self.tree[node])
+                ancestor = node >> 1
+                while ancestor:
+                    value += int(self.add[ancestor])
+                    ancestor >>= 1
+                best = min(best, value)
+                node += 1
+            node >>= 1
+            top >>= 1
+        return best
+
+class DeltaEvaluator:
+
+    def __init__(self, initial_budget, resources_def=None, turns=None, purchase_plan=None):
+        """
+        Evaluate the starting plan and cache its curves.
+          - initial_budget: starting budget (int), or a compiled Scenario
+          - resources_def: list of resource definitions (each is a dict)
+          - turns: list of turn definitions (each is a dict with keys 'TM', 'TX', 'TR')
+          - purchase_plan: dictionary mapping turn index to a list of resource IDs.
+            Purchases the simulator would reject are dropped, so the held plan is always feasible.
+        """
+        self.evaluator = PlanEvaluator(initial_budget, resources_def, turns)
+        self.num_turns = self.evaluator.num_turns
+
+        result = self.evaluator.evaluate(purchase_plan or {})
+        self.plan = {turn: list(resource_ids) for turn, resource_ids in result['purchase_log']}
+        self.power = result['power']
+        self.maintenance = result['maintenance']
+        self.profit = result['profit']
+        self.final_budget = result['final_budget']
+        # Budget at the end of each turn: stored values plus the pending suffix offsets.
+        self._budget = result['budget']
+        self._offsets = _SuffixOffsets(self.num_turns)
+
+        self.spending = np.zeros(self.num_turns, dtype=np.int64)
+        self.purchase_counts = np.zeros(self.num_turns, dtype=np.int64)
+        for turn, resource_ids in self.plan.items():
+            indices = [self.evaluator.index_by_id[rid] for rid in resource_ids
+                       if rid in self.evaluator.index_by_id]
+            self.spending[turn] = self.evaluator.activation_cost[indices].sum()
+            self.purchase_counts[turn] = len(resource_ids)
+        # Slack of every purchase turn (budget available minus spending), whose suffix
+        # minimum checks feasibility past a changed window.
+        available = self._budget - (self.profit - self.maintenance - self.spending)
+        self._slack = _SuffixMinTree(np.where(self.purchase_counts > 0, available - self.spending,
+                                              NO_PURCHASE_SLACK))
+        self._pending = None
+
+    def _available(self, low, high):
+        """
+        Budget available at the start of turns low to high - 1, before their purchases.
+        """
+        start = max(low - 1, 0)
+        budget = self._budget[start:high - 1] + self._offsets.window(start, high - 1)
+        if low == 0:
+            budget = np.concatenate(([self.evaluator.initial_budget], budget))
+        return budget
+
+    def budget_curve(self):
+        """
+        Budget at the end of each turn of the held plan.
+        """
+        return self._budget + self._offsets.window(0, self.num_turns)
+
+    def _index(self, turn, resource_id):
+        if not 0 <= turn < self.num_turns:
+            raise ValueError(f"Turn {turn} is outside the game (0..{self.num_turns - 1}).")
+        if resource_id not in self.evaluator.index_by_id:
+            raise ValueError(f"Unknown resource id {resource_id}.")
+        return self.evaluator.index_by_id[resource_id]
+
+    def _delta(self, changes):
+        """
+        Score a set of changes, each a (turn, resource_id, sign) tuple with sign +1 for
+        a purchase added and -1 for one removed, and stage it for commit().
+        Returns:
+          Tuple (change in final budget, whether the changed plan is feasible).
+        """
+        evaluator = self.evaluator
+        resolved = [(turn, self._index(turn, rid), rid, sign) for turn, rid, sign in changes]
+        low = min(turn for turn, _, _, _ in resolved)
+        high = max(turn + min(int(evaluator.lifetimes[index]), self.num_turns - turn)
+                   for turn, index, _, _ in resolved)
+        width = high - low
+
+        power_delta = np.zeros(width, dtype=np.int64)
+        maintenance_delta = np.zeros(width, dtype=np.int64)
+        spending_delta = np.zeros(width, dtype=np.int64)
+        count_delta = np.zeros(width, dtype=np.int64)
+        for turn, index, _, sign in resolved:
+            offset = turn - low
+            length = min(int(evaluator.lifetimes[index]), self.num_turns - turn)
+            power_delta[offset:offset + length] += sign * evaluator.power_timelines[index][:length]
+            maintenance_delta[offset:offset + length] += sign * evaluator.periodic_cost[index]
+            spending_delta[offset] += sign * evaluator.activation_cost[index]
+            count_delta[offset] += sign
+
+        new_profit = evaluator.profit(self.power[low:high] + power_delta, low)
+        net_delta = new_profit - self.profit[low:high] - maintenance_delta - spending_delta
+        budget_delta = np.cumsum(net_delta)
+        final_delta = int(budget_delta[-1])
+
+        # Inside the window, re-check every purchase turn against its new budget.
+        new_spending = self.spending[low:high] + spending_delta
+        new_available = self._available(low, high) + budget_delta - net_delta
+        purchasing = (self.purchase_counts[low:high] + count_delta) > 0
+        feasible = bool(np.all(new_spending[purchasing] <= new_available[purchasing]))
+        # Past the window every budget moves by the same amount.
+        if feasible and final_delta < 0:
+            feasible = self._slack.min_suffix(high) + final_delta >= 0
+
+        new_slack = np.where(purchasing, new_available - new_spending, NO_PURCHASE_SLACK)
+        self._pending = (low, high, resolved, power_delta, maintenance_delta,
+                         spending_delta, count_delta, new_profit, budget_delta, new_slack)
+        return final_delta, feasible
+
+    def delta_add(self, turn, resource_id):
+        """
+        Score buying one more resource_id at turn.
+        Returns:
+          Tuple (change in final budget, whether the changed plan is feasible).
+        """
+        return self._delta([(turn, resource_id, 1)])
+
+    def delta_remove(self, turn, resource_id):
+        """
+        Score dropping one purchase of resource_id at turn.
+        Returns:
+          Tuple (change in final budget, whether the changed plan is feasible).
+        """
+        if resource_id not in self.plan.get(turn, []):
+            raise ValueError(f"Resource {resource_id} is not purchased at turn {turn}.")
+        return self._delta([(turn, resource_id, -1)])
+
+    def delta_move(self, turn, resource_id, new_turn):
+        """
+        Score moving one purchase of resource_id from turn to new_turn.
+        Returns:
+          Tuple (change in final budget, whether the changed plan is feasible).
+        """
+        if resource_id not in self.plan.get(turn, []):
+            raise ValueError(f"Resource {resource_id} is not purchased at turn {turn}.")
+        return self._delta([(turn, resource_id, -1), (new_turn, resource_id, 1)])
+
+    def commit(self):
+        """
+        Apply the change scored by the last delta_* call to the held plan and curves.
+        """
+        if self._pending is None:
+            raise RuntimeError("No pending change to commit.")
+        (low, high, resolved, power_delta, maintenance_delta,
+         spending_delta, count_delta, new_profit, budget_delta, new_slack) = self._pending
+        self._pending = None
+
+        self.power[low:high] += power_delta
+        self.maintenance[low:high] += maintenance_delta
+        self.spending[low:high] += spending_delta
+        self.purchase_counts[low:high] += count_delta
+        self.profit[low:high] = new_profit
+        self._budget[low:high] += budget_delta
+        self._offsets.add_from(high, int(budget_delta[-1]))
+        self._slack.assign(low, new_slack)
+        self._slack.add_suffix(high, int(budget_delta[-1]))
+        self.final_budget += int(budget_delta[-1])
+
+        for turn, _, resource_id, sign in resolved:
+            if sign > 0:
+                self.plan.setdefault(turn, []).append(resource_id)
+            else:
+                self.plan[turn].remove(resource_id)
+                if not self.plan[turn]:
+                    del self.plan[turn]
+
+    def rollback(self):
+        """
+        Discard the change scored by the last delta_* call.
+        """
+        self._pending = None
+
+    def purchase_plan(self):
+        """
+        Return a copy of the held plan as a dictionary mapping turn to resource IDs.
+        """
+        return {turn: list(resource_ids) for turn, resource_ids in sorted(self.plan.items())}
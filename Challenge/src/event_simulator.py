@@ -0,0 +1,153 @@
+# src/event_simulator.py
+
+"""
+Event-driven variant of the game simulator. Instead of stepping every live resource
+on every turn, it keeps running totals for power and maintenance and a turn-keyed
+priority queue of state changes (active -> downtime, downtime -> active, end of life).
+Each turn only touches the resources whose state actually changes, and copies of
+one definition bought on the same turn share a single queue entry (a cohort).
+"""
+
+import heapq
+
+from src.game_simulator import GameSimulator
+from src.resource import state_transitions
+
+class EventSimulator(GameSimulator):
+
+    def __init__(self, initial_budget, resources_def=None, turns=None, trace=None):
+        """
+        Initialize the simulator.
+          - initial_budget: starting budget (int), or a compiled Scenario
+          - resources_def: list of resource definitions (each is a dict)
+          - turns: list of turn definitions (each is a dict with keys 'TM', 'TX', 'TR')
+          - trace: TraceSink receiving the per-turn summary (default: discard it)
+        """
+        super().__init__(initial_budget, resources_def, turns, trace)
+        self.total_power = 0
+        self.total_maintenance = 0
+        self.events = []        # Heap of (turn, sequence, schedule, cursor, count)
+        self._sequence = 0      # Tie-breaker so the heap never compares schedules
+        self._schedules = {}
+
+    def _schedule(self, res_def):
+        """
+        Return the cached event schedule of a resource definition as a list of
+        (age, power_delta, maintenance_delta) tuples. The last entry is the end of life.
+        """
+        rid = res_def['id']
+        schedule = self._schedules.get(rid)
+        if schedule is None:
+            power = res_def['buildings_powered']
+            lifetime, transitions = state_transitions(res_def)
+            schedule = []
+            active = True
+            for age, active in transitions:
+                schedule.append((age, power if active else -power, 0))
+            schedule.append((lifetime, -power if active else 0, -res_def['periodic_cost']))
+            self._schedules[rid] = schedule
+        return schedule
+
+    def _push(self, turn, schedule, cursor, count):
+        heapq.heappush(self.events, (turn, self._sequence, schedule, cursor, count))
+        self._sequence += 1
+
+    def purchase_resources(self, turn_index, resource_ids):
+        """
+        Attempt to purchase a list of resources at the beginning of a turn.
+        resource_ids: list of resource IDs to purchase.
+        Returns:
+          True if purchase is successful (i.e. activation cost <= budget), else False.
+        """
+        total_cost = 0
+        counts = {}
+        for rid in resource_ids:
+            index = self.index_by_id.get(rid)
+            if index is None:
+                continue
+            total_cost += self.resources_def[index]['activation_cost']
+            counts[rid] = counts.get(rid, 0) + 1
+
+        if total_cost > self.budget:
+            # Not enough budget to purchase these resources.
+            return False
+
+        self.budget -= total_cost
+        for rid, count in counts.items():
+            # Every resource starts active; its first scheduled event comes later.
+            res_def = self.resources_def[self.index_by_id[rid]]
+            self.total_power += res_def['buildings_powered'] * count
+            self.total_maintenance += res_def['periodic_cost'] * count
+            schedule = self._schedule(res_def)
+            self._push(turn_index + schedule[0][0], schedule, 0, count)
+        self.purchase_log.append((turn_index, resource_ids))
+        return True
+
+    def apply_events(self, turn_index):
+        """
+        Apply every state change scheduled to take effect at the start of turn_index.
+        """
+        events = self.events
+        while events and events[0][0] <= turn_index:
+            turn, _, schedule, cursor, count = heapq.heappop(events)
+            _, power_delta, maintenance_delta = schedule[cursor]
+            self.total_power += power_delta * count
+            self.total_maintenance += maintenance_delta * count
+            cursor += 1
+            if cursor < len(schedule):
+                self._push(turn + schedule[cursor][0] - schedule[cursor - 1][0], schedule, cursor, count)
+
+    def simulate_turn(self, turn_index, purchase_ids):
+        """
+        Simulate a single turn using the running totals:
+          1. Apply state changes due this turn.
+          2. Purchase phase.
+          3. Profit calculation: if powered buildings >= TM, profit = min(power, TX) * TR.
+          4. Update budget.
+        The turn summary is passed to the trace sink.
+        Returns:
+          Dictionary summarizing turn results.
+        """
+        self.apply_events(turn_index)
+
+        # Purchase phase.
+        if purchase_ids:
+            success = self.purchase_resources(turn_index, purchase_ids)
+            if not success:
+                print(f"Turn {turn_index}: Purchase failed due to insufficient budget.")
+
+        total_power = self.total_power
+        total_maintenance = self.total_maintenance
+
+        # Get current turn parameters.
+        turn_params = self.turns[turn_index]
+        TM = turn_params['TM']
+        TX = turn_params['TX']
+        TR = turn_params['TR']
+
+        # Calculate profit if minimum threshold is met.
+        profit = min(total_power, TX) * TR if total_power >= TM else 0
+
+        # Update budget.
+        self.budget += profit - total_maintenance
+
+        self.trace.record(turn_index, self.budget, total_power, profit, total_maintenance)
+        return {
+            'turn': turn_index,
+            'purchases': purchase_ids,
+            'maintenance': total_maintenance,
+            'total_power': total_power,
+            'profit': profit,
+            'budget': self.budget
+        }
+
+    def run_simulation(self, purchase_plan):
+        """
+        Run the simulation over all turns using the provided purchase plan.
+        purchase_plan: dictionary mapping turn index to a list of resource IDs to purchase.
+        Returns:
+          Tuple (purchase_log, final_budget)
+        """
+        for turn in range(len(self.turns)):
+            self.simulate_turn(turn, purchase_plan.get(turn, []))
+        return self.purchase_log, self.budget
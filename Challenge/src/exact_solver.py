@@ -0,0 +1,168 @@
+# src/exact_solver.py
+
+"""
+Exact solver for tiny scenarios: a dynamic program over turns whose states are the
+beam search's (budget plus the power and maintenance windows of the live fleet), with
+every purchase bundle expanded instead of a few candidates and only provably useless
+branches cut:
+  - resources that power no building are never bought (the game engine does not
+    model special effects, so they only cost money);
+  - a copy is only added to a bundle if it raises min(power, TX) on some turn it is
+    active, given the fleet and the copies already in the bundle;
+  - a state is dropped when another has at least its budget, at least its power and
+    at most its maintenance on every turn of the window: every purchase sequence
+    played from it ends at least as high from the other one.
+The state count grows quickly with the number of turns, the budget and the catalog,
+so the profiler only dispatches scenarios of a few dozen turns x resources here, and
+the search gives up (completed stays False) once a turn generates more than
+max_states states.
+"""
+
+import numpy as np
+
+from src.beam_solver import BeamState
+from src.challenge_solver import solve_game
+from src.plan_evaluator import PlanEvaluator
+
+# States a turn may generate before the search gives up (the demo input peaks at 1253,
+# the first two turns of thunberg at 6923 and its third at 73676).
+MAX_STATES = 20_000
+
+class ExactSolver:
+
+    def __init__(self, initial_budget, resources=None, turns=None, max_states=MAX_STATES):
+        """
+        Prepare the search.
+          - initial_budget: starting budget (int), or a compiled Scenario
+          - resources, turns: resource and turn definitions (when not passing a Scenario)
+          - max_states: states a turn may generate, before pruning, before the search gives up
+        """
+        self.evaluator = PlanEvaluator(initial_budget, resources, turns)
+        scenario = self.evaluator.scenario
+        self.scenario = scenario
+        self.num_turns = scenario.num_turns
+        self.max_states = max_states
+        # Whether the last solve() ran to the end, and the largest number of states kept.
+        self.completed = False
+        self.peak_states = 0
+
+        self.ids = scenario.ids.tolist()
+        self.activation_cost = scenario.activation_cost.tolist()
+        self.candidates = [i for i in range(scenario.num_resources) if scenario.buildings_powered[i] > 0]
+
+        # Per-definition power and maintenance by age, padded to a common window.
+        self.window = int(self.evaluator.lifetimes.max()) if scenario.num_resources else 1
+        self.power_windows = np.zeros((scenario.num_resources, self.window), dtype=np.int64)
+        self.maintenance_windows = np.zeros((scenario.num_resources, self.window), dtype=np.int64)
+        for index, timeline in enumerate(self.evaluator.power_timelines):
+            self.power_windows[index, :len(timeline)] = timeline
+            self.maintenance_windows[index, :len(timeline)] = scenario.periodic_cost[index]
+        self.active = self.power_windows > 0
+        # TX per turn, zero past the end of the game where power earns nothing.
+        self.TX = np.concatenate([self.evaluator.TX, np.zeros(self.window, dtype=np.int64)])
+
+    def expand(self, state, turn):
+        """
+        Apply every useful affordable bundle to a state and play the turn.
+        Returns:
+          List of successor BeamStates.
+        """
+        TM, TX, TR = (int(self.evaluator.TM[turn]), int(self.evaluator.TX[turn]),
+                      int(self.evaluator.TR[turn]))
+        caps = self.TX[turn:turn + self.window]
+        successors = []
+        # Depth-first over multisets: each bundle only adds candidates from its last one on.
+        stack = [(0, state.budget, state.power, state.maintenance, ())]
+        while stack:
+            first, budget, power, maintenance, bundle = stack.pop()
+            current = int(power[0])
+            profit = min(current, TX) * TR if current >= TM else 0
+            next_power = np.zeros_like(power)
+            next_power[:-1] = power[1:]
+            next_maintenance = np.zeros_like(maintenance)
+            next_maintenance[:-1] = maintenance[1:]
+            plan = (turn, [self.ids[i] for i in bundle], state.plan) if bundle else state.plan
+            successors.append(BeamState(budget + profit - int(maintenance[0]),
+                                        next_power, next_maintenance, plan))
+
+            for position in range(first, len(self.candidates)):
+                i = self.candidates[position]
+                active = self.active[i]
+                if self.activation_cost[i] > budget or not (power[active] < caps[active]).any():
+                    continue
+                stack.append((position, budget - self.activation_cost[i], power + self.power_windows[i],
+                              maintenance + self.maintenance_windows[i], bundle + (i,)))
+        return successors
+
+    @staticmethod
+    def prune(successors):
+        """
+        Drop the dominated states (see the module docstring), duplicates included.
+        Returns:
+          List of the remaining states, by decreasing budget.
+        """
+        successors.sort(key=lambda s: s.budget, reverse=True)
+        kept = []
+        if not successors:
+            return kept
+        window = len(successors[0].power)
+        power = np.empty((len(successors), window), dtype=np.int64)
+        maintenance = np.empty((len(successors), window), dtype=np.int64)
+        for state in successors:
+            # Sorted by budget: every kept state has at least this one's.
+            count = len(kept)
+            if count and ((power[:count] >= state.power).all(axis=1)
+                          & (maintenance[:count] <= state.maintenance).all(axis=1)).any():
+                continue
+            power[count] = state.power
+            maintenance[count] = state.maintenance
+            kept.append(state)
+        return kept
+
+    def solve(self, should_stop=None):
+        """
+        Run the search over all turns. should_stop() is checked before every turn;
+        there is no time limit.
+        Returns:
+          Optimal purchase plan, as a dictionary mapping turn index to resource IDs,
+          or None if should_stop() ended the search or a turn generated more than
+          max_states states (completed is then False).
+        """
+        self.completed = False
+        empty = np.zeros(self.window, dtype=np.int64)
+        states = [BeamState(self.scenario.initial_budget, empty, empty.copy(), None)]
+        self.peak_states = 1
+        for turn in range(self.num_turns):
+            if should_stop is not None and should_stop():
+                return None
+            successors = []
+            for state in states:
+                successors.extend(self.expand(state, turn))
+                if len(successors) > self.max_states:
+                    return None
+            states = self.prune(successors)
+            self.peak_states = max(self.peak_states, len(states))
+        self.completed = True
+
+        purchase_plan = {}
+        node = states[0].plan
+        while node is not None:
+            turn, resource_ids, node = node
+            purchase_plan[turn] = resource_ids
+        return dict(sorted(purchase_plan.items()))
+
+    def iterate(self, should_stop=None):
+        """
+        Anytime interface: yield the greedy plan, then the optimal plan once the search
+        completes (nothing more if it gives up or should_stop() ends it first).
+        """
+        yield solve_game(self.scenario)
+        plan = self.solve(should_stop)
+        if plan is not None:
+            yield plan
+
+def solve_exact(initial_budget, resources=None, turns=None):
+    """
+    Solve a tiny input optimally (see ExactSolver); None if the search gives up.
+    """
+    return ExactSolver(initial_budget, resources, turns).solve()
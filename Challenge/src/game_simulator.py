@@ -5,24 +5,54 @@ Simulate the game mechanics turn by turn. The simulator handles resource purchas
 maintenance costs, power production, profit calculation, and resource state updates.
 """
 
-from src.resource import Resource
+from src.resource import Resource, CompactResource
+from src.scenario import Scenario, compile_scenario
+from src.trace import NullTraceSink
 
 class GameSimulator:
 
-    def __init__(self, initial_budget, resources_def, turns):
+    def __init__(self, initial_budget, resources_def=None, turns=None, trace=None, compact=False):
         """
         Initialize the simulator.
-          - initial_budget: starting budget (int)
+          - initial_budget: starting budget (int), or a compiled Scenario
+            (then resources_def and turns are taken from it)
           - resources_def: list of resource definitions (each is a dict)
           - turns: list of turn definitions (each is a dict with keys 'TM', 'TX', 'TR')
+          - trace: TraceSink receiving the per-turn summary (default: discard it)
+          - compact: use slotted CompactResource instances sharing the scenario definitions
+            (much smaller per asset, for fleets with many live resources)
         """
-        self.initial_budget = initial_budget
-        self.budget = initial_budget
-        self.turns = turns
-        self.resources_def = resources_def
+        self.compact = compact
+        self.trace = trace if trace is not None else NullTraceSink()
+        if isinstance(initial_budget, Scenario):
+            self._scenario = initial_budget
+            self.initial_budget = initial_budget.initial_budget
+            self.turns = initial_budget.turns
+            self.resources_def = initial_budget.resources
+            self.index_by_id = initial_budget.index_by_id
+        else:
+            # Plain lists are used as given; the Scenario is only compiled if needed.
+            self._scenario = None
+            self.initial_budget = initial_budget
+            self.turns = turns
+            self.resources_def = resources_def
+            # The first definition wins for duplicate ids, like the original linear scan.
+            self.index_by_id = {}
+            for index, res_def in enumerate(resources_def):
+                self.index_by_id.setdefault(res_def['id'], index)
+        self.budget = self.initial_budget
         self.active_resources = []  # List of Resource instances currently in play
         self.purchase_log = []      # List of tuples: (turn, [resource ids purchased])
 
+    @property
+    def scenario(self):
+        """
+        Compiled Scenario of the simulated game, built on first use.
+        """
+        if self._scenario is None:
+            self._scenario = compile_scenario(self.initial_budget, self.resources_def, self.turns)
+        return self._scenario
+
     def purchase_resources(self, turn_index, resource_ids):
         """
         Attempt to purchase a list of resources at the beginning of a turn.
@@ -34,11 +64,15 @@ class GameSimulator:
         new_resources = []
         for rid in resource_ids:
             # Find the resource definition by id.
-            res_def = next((r for r in self.resources_def if r['id'] == rid), None)
-            if res_def is None:
+            index = self.index_by_id.get(rid)
+            if index is None:
                 continue
+            res_def = self.resources_def[index]
             total_cost += res_def['activation_cost']
-            new_resource = Resource(res_def)
+            if self.compact:
+                new_resource = CompactResource(self.scenario.definitions[index], turn_index)
+            else:
+                new_resource = Resource(res_def)
             new_resources.append(new_resource)
         
         if total_cost > self.budget:
@@ -58,6 +92,7 @@ class GameSimulator:
           3. Production: sum the number of buildings powered by active resources.
           4. Profit calculation: if powered buildings ≥ TM, profit = min(power, TX) * TR.
           5. Update budget and resource states.
+        The turn summary is passed to the trace sink.
         Returns:
           Dictionary summarizing turn results.
         """
@@ -86,13 +121,16 @@ class GameSimulator:
         self.budget += profit - total_maintenance
         
         # Update resource states and remove expired ones.
-        alive_resources = []
-        for res in self.active_resources:
-            if res.update_state():
-                alive_resources.append(res)
-        self.active_resources = alive_resources
-        
-        # Return a summary for debugging.
+        if self.compact:
+            self.active_resources = [res for res in self.active_resources if res.update_state(turn_index)]
+        else:
+            alive_resources = []
+            for res in self.active_resources:
+                if res.update_state():
+                    alive_resources.append(res)
+            self.active_resources = alive_resources
+
+        self.trace.record(turn_index, self.budget, total_power, profit, total_maintenance)
         return {
             'turn': turn_index,
             'purchases': purchase_ids,
@@ -112,6 +150,5 @@ class GameSimulator:
         num_turns = len(self.turns)
         for turn in range(num_turns):
             purchases = purchase_plan.get(turn, [])
-            summary = self.simulate_turn(turn, purchases)
-            print(f"Turn {turn}: {summary}")  # Debug output for each turn.
+            self.simulate_turn(turn, purchases)
         return self.purchase_log, self.budget
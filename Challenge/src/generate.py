@@ -0,0 +1,214 @@
+# src/generate.py
+
+"""
+Seeded synthetic input generator for scale testing.
+Usage:
+    python -m src.generate <output_file> --turns 1000000 --resources 1000 [--seed 0] [--profile seasonal]
+Writes a valid challenge input (the parse_input format) with controllable
+distributions of the resource costs, durations and lifecycles, mix of
+special-effect types, and TM/TX/TR profile shape:
+  - flat: constant levels with noise
+  - seasonal: a sine wave of the given period and relative amplitude
+  - spiky: flat levels with rare spikes multiplying TM, TX and TR
+The catalog is small and built in memory; the turn block is generated and written
+CHUNK_TURNS turns at a time, so the file size is not bounded by memory. A given
+seed and configuration always produce the same file.
+"""
+
+import argparse
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+from src.scenario import RESOURCE_TYPES
+
+# Turns generated and written at once.
+CHUNK_TURNS = 1 << 16
+
+PROFILES = ('flat', 'seasonal', 'spiky')
+
+# kind is 'uniform' (low, high inclusive), 'normal' or 'lognormal' (mean, sigma of the
+# underlying normal) or 'const' (value).
+Distribution = namedtuple('Distribution', ['kind', 'a', 'b'])
+
+# Defaults follow the ranges of the shipped inputs (8-shiva.txt).
+GeneratorConfig = namedtuple('GeneratorConfig', [
+    'initial_budget',
+    'activation_cost', 'periodic_cost', 'active_duration', 'downtime', 'lifecycle',
+    'buildings_powered', 'special_effect',
+    'type_mix', 'unpowered_types',
+    'profile', 'tm', 'tx_width', 'tr', 'noise', 'period', 'amplitude', 'spike_rate', 'spike_scale'
+], defaults=(
+    1000,
+    Distribution('uniform', 200, 1600), Distribution('uniform', 10, 170),
+    Distribution('uniform', 1, 20), Distribution('uniform', 0, 20), Distribution('uniform', 17, 70),
+    Distribution('uniform', 1, 50), Distribution('uniform', -25, 25),
+    {'X': 0.5, 'A': 0.1, 'B': 0.1, 'C': 0.15, 'D': 0.075, 'E': 0.075}, ('C', 'D', 'E'),
+    'flat', 70, 45, 60, 0.15, 1000, 0.5, 0.01, 3.0
+))
+
+def parse_distribution(spec):
+    """
+    Parse a distribution given as "kind:a[:b]", e.g. "uniform:1:20", "lognormal:5:0.8" or "const:4".
+    Raises:
+      ValueError on an unknown kind or missing parameters.
+    """
+    kind, *params = spec.split(':')
+    arity = {'uniform': 2, 'normal': 2, 'lognormal': 2, 'const': 1}
+    if kind not in arity or len(params) != arity[kind]:
+        raise ValueError(f"invalid distribution {spec!r}")
+    values = [float(param) for param in params] + [0.0]
+    return Distribution(kind, values[0], values[1])
+
+def parse_type_mix(spec):
+    """
+    Parse a type mix given as "X=0.5,A=0.1,...": relative weights of the resource types.
+    Raises:
+      ValueError on an unknown type or a non-positive total weight.
+    """
+    mix = {}
+    for item in spec.split(','):
+        letter, weight = item.split('=')
+        if letter not in RESOURCE_TYPES:
+            raise ValueError(f"unknown resource type {letter!r}")
+        mix[letter] = float(weight)
+    if sum(mix.values()) <= 0:
+        raise ValueError("type mix weights must sum to a positive value")
+    return mix
+
+def sample(distribution, rng, size, minimum=0):
+    """
+    Draw size integers from a distribution, rounded and clipped to at least minimum.
+    """
+    kind, a, b = distribution
+    if kind == 'uniform':
+        values = rng.integers(int(a), int(b), size, endpoint=True)
+    elif kind == 'normal':
+        values = rng.normal(a, b, size)
+    elif kind == 'lognormal':
+        values = rng.lognormal(a, b, size)
+    else:
+        values = np.full(size, a)
+    return np.maximum(np.rint(values).astype(np.int64), minimum)
+
+def generate_resources(rng, num_resources, config):
+    """
+    Build a random resource catalog.
+    Returns:
+      List of resource lines (without line break), ids 0 to num_resources - 1.
+    """
+    letters = list(config.type_mix)
+    weights = np.array([config.type_mix[letter] for letter in letters], dtype=float)
+    types = rng.choice(len(letters), num_resources, p=weights / weights.sum())
+    activation = sample(config.activation_cost, rng, num_resources, 1)
+    periodic = sample(config.periodic_cost, rng, num_resources)
+    active = sample(config.active_duration, rng, num_resources, 1)
+    downtime = sample(config.downtime, rng, num_resources)
+    # A resource lives at least one full active period.
+    lifecycle = np.maximum(sample(config.lifecycle, rng, num_resources, 1), active)
+    buildings = sample(config.buildings_powered, rng, num_resources)
+    effects = sample(config.special_effect, rng, num_resources, -100)
+
+    lines = []
+    for rid in range(num_resources):
+        letter = letters[types[rid]]
+        powered = 0 if letter in config.unpowered_types else buildings[rid]
+        line = (f"{rid} {activation[rid]} {periodic[rid]} {active[rid]} {downtime[rid]} "
+                f"{lifecycle[rid]} {powered} {letter}")
+        if letter != 'X':
+            line += f" {effects[rid]}"
+        lines.append(line)
+    return lines
+
+def turn_profile(rng, start, count, config):
+    """
+    TM, TX and TR of turns start to start + count - 1.
+    Returns:
+      int64 array of shape (count, 3).
+    """
+    shape = np.ones(count)
+    if config.profile == 'seasonal':
+        phase = 2 * np.pi * np.arange(start, start + count) / max(config.period, 1)
+        shape += config.amplitude * np.sin(phase)
+    elif config.profile == 'spiky':
+        spikes = rng.random(count) < config.spike_rate
+        shape[spikes] = config.spike_scale
+    elif config.profile != 'flat':
+        raise ValueError(f"unknown profile {config.profile!r}")
+
+    noise = lambda: 1 + config.noise * rng.uniform(-1, 1, count)
+    TM = np.maximum(np.rint(config.tm * shape * noise()), 0).astype(np.int64)
+    TX = TM + np.maximum(np.rint(config.tx_width * shape * noise()), 0).astype(np.int64)
+    TR = np.maximum(np.rint(config.tr * shape * noise()), 0).astype(np.int64)
+    return np.column_stack((TM, TX, TR))
+
+def write_scenario(f, num_turns, num_resources, seed=0, config=GeneratorConfig()):
+    """
+    Write a synthetic input to a text stream.
+      - f: writable text stream
+      - num_turns, num_resources: size of the scenario
+      - seed: random seed
+      - config: GeneratorConfig
+    """
+    rng = np.random.default_rng(seed)
+    f.write(f"{config.initial_budget} {num_resources} {num_turns}\n")
+    for line in generate_resources(rng, num_resources, config):
+        f.write(line + "\n")
+    for start in range(0, num_turns, CHUNK_TURNS):
+        block = turn_profile(rng, start, min(CHUNK_TURNS, num_turns - start), config)
+        np.savetxt(f, block, fmt='%d')
+
+def generate(file_path, num_turns, num_resources, seed=0, config=GeneratorConfig()):
+    """
+    Write a synthetic input to file_path ("-" for standard output).
+    """
+    if file_path == '-':
+        write_scenario(sys.stdout, num_turns, num_resources, seed, config)
+        return
+    with open(file_path, 'w') as f:
+        write_scenario(f, num_turns, num_resources, seed, config)
+
+def main():
+    defaults = GeneratorConfig()
+    parser = argparse.ArgumentParser(description="Generate a synthetic challenge input")
+    parser.add_argument("output_file", help='Path of the input file to write ("-" for standard output)')
+    parser.add_argument("--turns", type=int, default=10_000, help="Number of turns (default: 10000)")
+    parser.add_argument("--resources", type=int, default=40, help="Number of resources (default: 40)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--budget", type=int, default=defaults.initial_budget,
+                        help=f"Initial budget (default: {defaults.initial_budget})")
+    for name in ('activation_cost', 'periodic_cost', 'active_duration', 'downtime', 'lifecycle',
+                 'buildings_powered', 'special_effect'):
+        default = getattr(defaults, name)
+        parser.add_argument(f"--{name.replace('_', '-')}", type=parse_distribution, default=default,
+                            metavar="KIND:A[:B]",
+                            help=f"Distribution of {name} (default: {default.kind}:{default.a:g}:{default.b:g})")
+    parser.add_argument("--type-mix", type=parse_type_mix, default=defaults.type_mix,
+                        metavar="T=W,...", help="Relative weights of the resource types "
+                                                "(default: X=0.5,A=0.1,B=0.1,C=0.15,D=0.075,E=0.075)")
+    parser.add_argument("--profile", choices=PROFILES, default=defaults.profile,
+                        help=f"Shape of the TM/TX/TR profile (default: {defaults.profile})")
+    parser.add_argument("--tm", type=float, default=defaults.tm, help="Mean TM")
+    parser.add_argument("--tx-width", type=float, default=defaults.tx_width, help="Mean TX - TM")
+    parser.add_argument("--tr", type=float, default=defaults.tr, help="Mean TR")
+    parser.add_argument("--noise", type=float, default=defaults.noise,
+                        help="Relative uniform noise of TM, TX and TR")
+    parser.add_argument("--period", type=int, default=defaults.period, help="Seasonal period in turns")
+    parser.add_argument("--amplitude", type=float, default=defaults.amplitude,
+                        help="Seasonal amplitude, relative to the mean")
+    parser.add_argument("--spike-rate", type=float, default=defaults.spike_rate,
+                        help="Probability of a spike per turn")
+    parser.add_argument("--spike-scale", type=float, default=defaults.spike_scale,
+                        help="Factor applied to TM, TX and TR on a spike")
+    args = parser.parse_args()
+
+    config = GeneratorConfig(
+        initial_budget=args.budget,
+        **{name: getattr(args, name) for name in GeneratorConfig._fields if name != 'initial_budget'
+           and hasattr(args, name)}
+    )
+    generate(args.output_file, args.turns, args.resources, args.seed, config)
+
+if __name__ == "__main__":
+    main()
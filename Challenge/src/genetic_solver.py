@@ -0,0 +1,262 @@
+# src/genetic_solver.py
+
+"""
+Genetic-algorithm solver. A population of immutable Plans evolves by crossover of
+turn ranges and by mutations that add, drop or retime single purchases; both update
+the plans' Zobrist hash incrementally (Plan.spliced, with_purchase and
+without_purchase). Fitness is the simulated final budget, computed in parallel by a
+process pool: every worker receives the compiled scenario once through its
+initializer, and plans travel as compact integer arrays (one row of purchase turns,
+one of definition indices). Elites and children identical to a plan seen before are
+not re-evaluated: scores are cached by plan hash.
+"""
+
+import os
+import random
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.batch_evaluator import BatchEvaluator
+from src.challenge_solver import solve_game
+from src.plan import EvaluationCache, Plan
+from src.scenario import compile_scenario
+
+# Evaluator of the worker process, set once by _init_worker.
+_worker_evaluator = None
+
+def _init_worker(scenario):
+    global _worker_evaluator
+    # Ctrl-C reaches the whole process group; only the parent decides when to stop.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_evaluator = BatchEvaluator(scenario)
+
+def _evaluate_encoded(evaluator, encoded, offsets):
+    """
+    Score plans packed into one (2, n) array of (turn, definition index) columns,
+    plan k being the columns offsets[k]:offsets[k + 1].
+    Returns:
+      int64 array of final budgets, one per plan.
+    """
+    ids = evaluator.scenario.ids
+    plans = [decode_plan(encoded[:, start:end], ids) for start, end in zip(offsets[:-1], offsets[1:])]
+    return evaluator.evaluate_batch(plans)['final_budgets']
+
+def _evaluate_in_worker(encoded, offsets):
+    return _evaluate_encoded(_worker_evaluator, encoded, offsets)
+
+def encode_plan(purchase_plan, index_by_id):
+    """
+    Encode a purchase plan as a (2, n) int32 array of purchase turns and definition
+    indices, sorted by turn (keeping the order within a turn). Unknown ids are dropped.
+    A Plan is encoded from its CSR arrays directly.
+    """
+    if isinstance(purchase_plan, Plan):
+        turns = np.repeat(purchase_plan.turns, np.diff(purchase_plan.offsets))
+        indices = np.array([index_by_id.get(rid, -1) for rid in purchase_plan.ids.tolist()], dtype=np.int64)
+        known = indices >= 0
+        return np.array([turns[known], indices[known]], dtype=np.int32).reshape(2, -1)
+    pairs = [(turn, index_by_id[rid]) for turn in sorted(purchase_plan)
+             for rid in purchase_plan[turn] if rid in index_by_id]
+    return np.array(pairs, dtype=np.int32).reshape(-1, 2).T.copy()
+
+def decode_plan(encoded, ids):
+    """
+    Decode a (2, n) array from encode_plan into a dictionary mapping turn to resource IDs.
+    """
+    purchase_plan = {}
+    for turn, index in zip(encoded[0].tolist(), encoded[1].tolist()):
+        purchase_plan.setdefault(turn, []).append(int(ids[index]))
+    return purchase_plan
+
+class GeneticSolver:
+
+    def __init__(self, initial_budget, resources=None, turns=None, population_size=32, elite=2,
+                 tournament_size=3, mutations=3, max_shift=10, workers=None, seed=0, initial_plan=None,
+                 cache_size=4096):
+        """
+        Prepare the search.
+          - initial_budget: starting budget (int), or a compiled Scenario
+          - resources, turns: resource and turn definitions (when not passing a Scenario)
+          - population_size: number of plans per generation
+          - elite: number of best plans copied unchanged into the next generation
+          - tournament_size: number of plans drawn to select each parent
+          - mutations: largest number of mutations applied to a child
+          - max_shift: largest number of turns a retime mutation moves a purchase by
+          - workers: number of evaluation processes (default: one per CPU; 0 evaluates in-process)
+          - seed: seed of the random generator
+          - initial_plan: plan seeding the population (default: the greedy plan of solve_game)
+          - cache_size: number of plan scores kept in the evaluation cache
+        """
+        self.scenario = compile_scenario(initial_budget, resources, turns)
+        self.num_turns = self.scenario.num_turns
+        self.num_resources = self.scenario.num_resources
+        self.population_size = population_size
+        self.elite = elite
+        self.tournament_size = tournament_size
+        self.mutations = mutations
+        self.max_shift = max_shift
+        self.workers = os.cpu_count() if workers is None else workers
+        self.rng = random.Random(seed)
+        self.ids = self.scenario.ids.tolist()
+        if initial_plan is None:
+            initial_plan = solve_game(self.scenario)
+        index_by_id = self.scenario.index_by_id
+        self.initial_plan = Plan.from_dict({turn: [rid for rid in resource_ids if rid in index_by_id]
+                                            for turn, resource_ids in initial_plan.items()})
+
+        self.generations = 0
+        self.evaluations = 0    # Plans actually evaluated (cache misses)
+        self.cache = EvaluationCache(cache_size)
+        self.best_score = None
+        self.best_plan = None
+        self.history = []   # Best score after every generation
+        self._evaluator = None  # In-process evaluator when workers == 0
+
+    def crossover(self, first, second):
+        """
+        Child taking the purchases of turns [start, end) from second and the others from first.
+        """
+        start = self.rng.randrange(self.num_turns)
+        end = self.rng.randint(start + 1, self.num_turns)
+        return first.spliced(second, start, end)
+
+    def mutate(self, plan):
+        """
+        Apply between 0 and `mutations` random add, drop or retime mutations.
+        """
+        rng = self.rng
+        for _ in range(rng.randint(0, self.mutations)):
+            kind = rng.randrange(3) if plan.num_purchases else 0
+            if kind == 0:
+                plan = plan.with_purchase(rng.randrange(self.num_turns), rng.choice(self.ids))
+                continue
+            position = rng.randrange(plan.num_purchases)
+            turn = int(plan.turns[np.searchsorted(plan.offsets, position, side='right') - 1])
+            rid = int(plan.ids[position])
+            plan = plan.without_purchase(turn, rid)
+            if kind == 2:
+                shifted = turn + rng.randint(-self.max_shift, self.max_shift)
+                plan = plan.with_purchase(min(max(shifted, 0), self.num_turns - 1), rid)
+        return plan
+
+    def select(self, scores):
+        contenders = [self.rng.randrange(len(scores)) for _ in range(self.tournament_size)]
+        return max(contenders, key=scores.__getitem__)
+
+    def evaluate(self, population, executor):
+        """
+        Score a population. Plans found in the cache are not evaluated again, and the
+        others are evaluated once each, however many times they occur.
+        """
+        keys = [plan.hash for plan in population]
+        scores = {}
+        for key in keys:
+            if key not in scores:
+                scores[key] = self.cache.get(key)
+        missing = {key: plan for key, plan in zip(keys, population) if scores[key] is None}
+        if missing:
+            for key, score in zip(missing, self._score(list(missing.values()), executor)):
+                scores[key] = score
+                self.cache.put(key, score)
+        return [scores[key] for key in keys]
+
+    def _score(self, population, executor):
+        """
+        Evaluate plans, split into one packed chunk per worker.
+        """
+        self.evaluations += len(population)
+        if executor is None:
+            chunks = [population]
+        else:
+            size = -(-len(population) // self.workers)
+            chunks = [population[i:i + size] for i in range(0, len(population), size)]
+        index_by_id = self.scenario.index_by_id
+        packed = []
+        for chunk in chunks:
+            offsets = np.cumsum([0] + [plan.num_purchases for plan in chunk])
+            packed.append((np.concatenate([encode_plan(plan, index_by_id) for plan in chunk], axis=1), offsets))
+        if executor is None:
+            evaluator = self._local_evaluator()
+            results = [_evaluate_encoded(evaluator, encoded, offsets) for encoded, offsets in packed]
+        else:
+            results = executor.map(_evaluate_in_worker, *zip(*packed))
+        return np.concatenate(list(results)).tolist()
+
+    def _local_evaluator(self):
+        if self._evaluator is None:
+            self._evaluator = BatchEvaluator(self.scenario)
+        return self._evaluator
+
+    def solve(self, generations=None, time_limit=None):
+        """
+        Evolve the population until the generation or time limit (at least one must be given).
+        Returns:
+          The best purchase plan found, as a dictionary mapping turn index to resource IDs.
+        """
+        for _ in self.iterate(generations, time_limit):
+            pass
+        return self.best_plan.to_dict()
+
+    def iterate(self, generations=None, time_limit=None, should_stop=None):
+        """
+        Anytime version of solve(): a generator yielding the best plan every time a
+        generation improves it. It stops at the generation or time limit, or once
+        should_stop() returns True (at least one of them must be given).
+        """
+        if generations is None and time_limit is None and should_stop is None:
+            raise ValueError("A generation or time limit is required.")
+        start = time.perf_counter()
+        population = [self.initial_plan] + [self.mutate(self.initial_plan)
+                                            for _ in range(self.population_size - 1)]
+        executor = None
+        if self.workers:
+            executor = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                           initargs=(self.scenario,))
+        try:
+            scores = self.evaluate(population, executor)
+            while True:
+                if self.record(population, scores):
+                    yield self.best_plan.to_dict()
+                if generations is not None and self.generations >= generations:
+                    break
+                if time_limit is not None and time.perf_counter() - start >= time_limit:
+                    break
+                if should_stop is not None and should_stop():
+                    break
+
+                ranked = sorted(range(len(population)), key=scores.__getitem__, reverse=True)
+                children = [population[i] for i in ranked[:self.elite]]
+                while len(children) < self.population_size:
+                    first = population[self.select(scores)]
+                    second = population[self.select(scores)]
+                    children.append(self.mutate(self.crossover(first, second)))
+                population = children
+                scores = self.evaluate(population, executor)
+                self.generations += 1
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+    def record(self, population, scores):
+        """
+        Update the best plan with a scored population.
+        Returns:
+          True if the best plan improved.
+        """
+        best = max(range(len(population)), key=scores.__getitem__)
+        improved = self.best_score is None or scores[best] > self.best_score
+        if improved:
+            self.best_score = scores[best]
+            self.best_plan = population[best]
+        self.history.append(self.best_score)
+        return improved
+
+def solve_genetic(initial_budget, resources=None, turns=None, time_limit=10.0, generations=None, workers=None, seed=0):
+    """
+    Evolve purchase plans with a genetic algorithm until the time or generation limit.
+    """
+    solver = GeneticSolver(initial_budget, resources, turns, workers=workers, seed=seed)
+    return solver.solve(generations=generations, time_limit=time_limit)
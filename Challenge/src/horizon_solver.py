@@ -0,0 +1,241 @@
+# src/horizon_solver.py
+
+"""
+Rolling-horizon (model predictive control) solver. At every turn t it values
+buying k copies of each resource by the profit minus maintenance they add to the
+live fleet over the window [t, t + H), chooses the best set of purchases under the
+current budget with a multiple-choice knapsack over activation costs solved by a
+NumPy DP over budget buckets, commits the turn-t purchases only and slides the
+window forward. When a time limit runs out, the remaining turns are planned with
+the greedy rule (fill up to TM in ratio order) instead.
+
+By default the value is also net of the share of the activation cost the window
+covers (amortize=True). With the plain windowed profit minus maintenance, the
+activation cost only limits the knapsack, so the solver spends the whole budget
+on anything that pays back its upkeep within H turns: on 1-thunberg.txt it ends
+at -368 against 1000 for the greedy plan, 2-attenborough.txt and 5-maathai.txt
+lose about 2% and the other inputs stay within 1%. Longer windows do not help
+either way, since power below TM is credited linearly over the window: H = 2
+scores best on every shipped input but the demo.
+"""
+
+import time
+
+import numpy as np
+
+from src.challenge_solver import ratio_rank_key
+from src.plan_evaluator import PlanEvaluator
+
+class HorizonSolver:
+
+    def __init__(self, initial_budget, resources=None, turns=None, horizon=2, buckets=256, max_copies=8,
+                 amortize=True):
+        """
+        Prepare the search.
+          - initial_budget: starting budget (int), or a compiled Scenario
+          - resources, turns: resource and turn definitions (when not passing a Scenario)
+          - horizon: number of turns H over which purchases are valued (short windows do
+            best on the shipped inputs, see above)
+          - buckets: number of budget buckets of the knapsack DP
+          - max_copies: largest number of copies of one resource bought in a turn
+          - amortize: also charge the window its share of the activation cost; False values
+            purchases by windowed profit minus maintenance alone
+        """
+        self.evaluator = PlanEvaluator(initial_budget, resources, turns)
+        self.scenario = self.evaluator.scenario
+        self.num_turns = self.scenario.num_turns
+        self.horizon = horizon
+        self.buckets = buckets
+        self.max_copies = max_copies
+        self.amortize = amortize
+
+        self.ids = self.scenario.ids.tolist()
+        self.activation_cost = self.scenario.activation_cost
+        self.min_cost = int(self.activation_cost.min()) if len(self.ids) else 0
+        self.copies = np.arange(1, max_copies + 1, dtype=np.int64)
+        # Ranked resources of the greedy fallback, with the cheapest cost from each position on.
+        keys = ratio_rank_key(self.scenario)
+        self.greedy_order = sorted(range(len(self.ids)), key=keys.__getitem__)
+        self.greedy_suffix_cost = [int(self.activation_cost[i]) for i in self.greedy_order] + [float('inf')]
+        for position in range(len(self.greedy_order) - 2, -1, -1):
+            self.greedy_suffix_cost[position] = min(self.greedy_suffix_cost[position],
+                                                    self.greedy_suffix_cost[position + 1])
+        # Turns planned by the greedy fallback in the last solve().
+        self.fallback_turns = 0
+        # Per-definition power and maintenance by age over the horizon.
+        self.power_windows = np.zeros((len(self.ids), horizon), dtype=np.int64)
+        self.maintenance_windows = np.zeros((len(self.ids), horizon), dtype=np.int64)
+        for index, timeline in enumerate(self.evaluator.power_timelines):
+            length = min(len(timeline), horizon)
+            self.power_windows[index, :length] = timeline[:length]
+            self.maintenance_windows[index, :length] = self.scenario.periodic_cost[index]
+
+    def copy_values(self, power, turn):
+        """
+        Value of buying k = 1..max_copies copies of every resource at turn, given the
+        fleet's power over the window: added profit minus the fixed_costs() of the copies.
+        Power below TM is credited linearly here, since resources only
+        cross TM together; confirm() checks the chosen purchases exactly.
+        Returns:
+          (resources x max_copies) int64 array.
+        """
+        length = min(self.horizon, self.num_turns - turn)
+        evaluator = self.evaluator
+        window = power[turn:turn + length]
+        TX = evaluator.TX[turn:turn + length]
+        TR = evaluator.TR[turn:turn + length]
+        base = (np.minimum(window, TX) * TR).sum()
+        added = self.copies[None, :, None] * self.power_windows[:, None, :length]
+        profit = (np.minimum(window + added, TX) * TR).sum(axis=2)
+        return (profit - base) - self.copies[None, :] * self.fixed_costs(length)[:, None]
+
+    def fixed_costs(self, length):
+        """
+        Per-resource cost charged to a window of `length` turns: maintenance over the
+        window plus, when amortizing, the share of the activation cost for the part of
+        the lifetime the window covers, so resources outliving the window are not
+        penalized for it.
+        """
+        upkeep = self.maintenance_windows[:, :length].sum(axis=1)
+        if not self.amortize:
+            return upkeep
+        share = np.minimum(length, self.evaluator.lifetimes) / self.evaluator.lifetimes
+        return upkeep + np.ceil(self.activation_cost * share).astype(np.int64)
+
+    def knapsack(self, values, budget):
+        """
+        Multiple-choice knapsack: pick at most one copy count per resource, with total
+        activation cost within budget, maximizing the summed values. Costs are rounded
+        up to whole buckets, so the chosen purchases are always affordable.
+        Returns:
+          List of (definition index, copies) pairs.
+        """
+        bucket = max(1, -(-budget // self.buckets))
+        capacity = budget // bucket
+        weights = -(-self.activation_cost // bucket)
+        best = np.zeros(capacity + 1, dtype=np.int64)
+        choices = np.zeros((len(self.ids), capacity + 1), dtype=np.int64)
+        for index in range(len(self.ids)):
+            updated = best.copy()
+            for k in range(1, self.max_copies + 1):
+                weight = int(weights[index]) * k
+                if weight > capacity or values[index, k - 1] <= 0:
+                    continue
+                candidate = best[:capacity + 1 - weight] + values[index, k - 1]
+                better = candidate > updated[weight:]
+                updated[weight:][better] = candidate[better]
+                choices[index, weight:][better] = k
+            best = updated
+
+        # Walk the choices back from the full capacity.
+        chosen = []
+        remaining = capacity
+        for index in range(len(self.ids) - 1, -1, -1):
+            k = int(choices[index, remaining])
+            if k:
+                chosen.append((index, k))
+                remaining -= int(weights[index]) * k
+        return chosen
+
+    def solve(self, time_limit=None):
+        """
+        Run the rolling horizon over all turns. If time_limit (seconds) runs out, the
+        remaining turns are planned with greedy_fill(), so the call returns in bounded
+        time with a plan for the whole game; fallback_turns counts them.
+        Returns:
+          Purchase plan as a dictionary mapping turn index to resource IDs.
+        """
+        evaluator = self.evaluator
+        start = time.perf_counter()
+        num_turns = self.num_turns
+        # Fleet power and maintenance per turn, padded so a window never runs past the end.
+        power = np.zeros(num_turns + self.horizon, dtype=np.int64)
+        maintenance = np.zeros(num_turns + self.horizon, dtype=np.int64)
+        budget = self.scenario.initial_budget
+        purchase_plan = {}
+        self.fallback_turns = 0
+        out_of_time = False
+        TM, TX, TR = evaluator.TM.tolist(), evaluator.TX.tolist(), evaluator.TR.tolist()
+        for turn in range(num_turns):
+            if not out_of_time and time_limit is not None and time.perf_counter() - start >= time_limit:
+                out_of_time = True
+                self.fallback_turns = num_turns - turn
+            if budget >= self.min_cost and len(self.ids):
+                if out_of_time:
+                    chosen = self.greedy_fill(int(power[turn]), TM[turn], budget)
+                else:
+                    values = self.copy_values(power, turn)
+                    chosen = self.knapsack(values, budget)
+                    chosen = self.confirm(power, turn, values, chosen)
+                for index, k in chosen:
+                    budget -= int(self.activation_cost[index]) * k
+                    self.add_purchase(power, maintenance, turn, index, k)
+                    purchase_plan.setdefault(turn, []).extend([self.ids[index]] * k)
+            powered = int(power[turn])
+            profit = min(powered, TX[turn]) * TR[turn] if powered >= TM[turn] else 0
+            budget += profit - int(maintenance[turn])
+        return purchase_plan
+
+    def add_purchase(self, power, maintenance, turn, index, k):
+        """
+        Add k copies of a resource bought at turn to the fleet's power and maintenance.
+        """
+        num_turns = self.num_turns
+        power[turn:turn + self.horizon] += k * self.power_windows[index]
+        maintenance[turn:turn + self.horizon] += k * self.maintenance_windows[index]
+        # Past the window, the rest of the resource's life.
+        timeline = self.evaluator.power_timelines[index]
+        if len(timeline) > self.horizon:
+            end = min(turn + len(timeline), num_turns)
+            tail = timeline[self.horizon:self.horizon + max(end - turn - self.horizon, 0)]
+            power[turn + self.horizon:turn + self.horizon + len(tail)] += k * tail
+            maintenance[turn + self.horizon:turn + self.horizon + len(tail)] += \
+                k * int(self.scenario.periodic_cost[index])
+
+    def greedy_fill(self, powered, TM, budget):
+        """
+        Greedy rule of the fallback: while the fleet powers fewer than TM buildings, buy
+        every resource the budget covers in ratio order.
+        Returns:
+          List of (definition index, 1) pairs.
+        """
+        chosen = []
+        for position, index in enumerate(self.greedy_order):
+            if powered >= TM or budget < self.greedy_suffix_cost[position]:
+                break
+            cost = int(self.activation_cost[index])
+            if budget >= cost:
+                budget -= cost
+                powered += int(self.power_windows[index, 0])
+                chosen.append((index, 1))
+        return chosen
+
+    def confirm(self, power, turn, values, chosen):
+        """
+        Exact check of the knapsack choice: take the chosen purchases best first and
+        keep the prefix with the highest exact window value, or nothing if no prefix
+        has a positive value.
+        """
+        length = min(self.horizon, self.num_turns - turn)
+        window = power[turn:turn + length].copy()
+        base = self.evaluator.profit(window, turn).sum()
+        fixed_costs = self.fixed_costs(length)
+        best_value, best_size = 0, 0
+        cost = 0
+        chosen = sorted(chosen, key=lambda pair: -values[pair[0], pair[1] - 1])
+        for size, (index, k) in enumerate(chosen, 1):
+            window += k * self.power_windows[index, :length]
+            cost += k * int(fixed_costs[index])
+            value = int(self.evaluator.profit(window, turn).sum() - base) - cost
+            if value > best_value:
+                best_value, best_size = value, size
+        return chosen[:best_size]
+
+def solve_horizon(initial_budget, resources=None, turns=None, horizon=2, buckets=256, time_limit=None,
+                  amortize=True):
+    """
+    Solve with a rolling horizon of `horizon` turns and a knapsack over `buckets` budget buckets.
+    """
+    solver = HorizonSolver(initial_budget, resources, turns, horizon=horizon, buckets=buckets,
+                           amortize=amortize)
+    return solver.solve(time_limit)
@@ -3,71 +3,313 @@
 """
 Main entry point for the Reply Hack the Code challenge solver.
 Usage:
-    python src/main.py <input_file> <output_file> [--solver auto|default|dedicated]
+    python src/main.py <input_file> <output_file> [--solver auto|default|dedicated|anneal|beam|exact|ga|horizon|marginal|portfolio]
+                       [--time-limit SECONDS] [--beam-width W] [--anneal-start greedy|beam|horizon]
+                       [--generations N] [--workers N] [--horizon H] [--buckets N]
+                       [--target-score SCORE]
+                       [--simulator standard|compact|event|numpy|timeline]
+                       [--trace none|print|ring:N|arrays:PATH|csv:PATH|binary:PATH]
+                       [--cache-dir DIR] [--no-cache]
 """
 
 import os
 import sys
+import time
 import argparse
+from functools import partial
 
-from src.utils import parse_input, write_output
+from src.utils import write_output
+from src.scenario_cache import DEFAULT_CACHE_DIR, load_scenario
 from src.game_simulator import GameSimulator
+from src.event_simulator import EventSimulator
+from src.numpy_simulator import NumpySimulator
+from src.plan_evaluator import PlanEvaluator
+from src.anneal_solver import AnnealSolver
+from src.beam_solver import BeamSolver, solve_beam
+from src.exact_solver import ExactSolver
+from src.genetic_solver import GeneticSolver
+from src.horizon_solver import HorizonSolver, solve_horizon
+from src.power_curve import solve_marginal
+from src.anytime import StopCondition, one_shot, run_anytime
+from src.portfolio import iterate_portfolio, format_summary
+from src.profiler import profile_scenario, choose_solver
+from src.trace import RingBufferTraceSink, make_trace_sink
 from src.challenge_solver import (
+    solve_game,
     solve_game_default,
     SOLVER_MAPPING
 )
 
-def main():
+# Simulation engines selectable from the command line.
+SIMULATOR_MAPPING = {
+    "standard": GameSimulator,
+    "compact": partial(GameSimulator, compact=True),
+    "event": EventSimulator,
+    "numpy": NumpySimulator,
+    "timeline": PlanEvaluator,
+}
+
+# Solvers selectable with --solver.
+SOLVER_CHOICES = ["auto", "default", "dedicated", "anneal", "beam", "exact", "ga", "horizon", "marginal",
+                  "portfolio"]
+
+def build_parser():
+    """
+    Command line parser of the solver.
+    """
     parser = argparse.ArgumentParser(description="Reply Hack the Code solver")
     parser.add_argument("input_file", type=str, help="Path to input file")
     parser.add_argument("output_file", type=str, help="Path to output file")
     parser.add_argument(
         "--solver",
-        choices=["auto", "default", "dedicated"],
+        choices=SOLVER_CHOICES,
         default="auto",
-        help="Select solver: auto (use dedicated if available, otherwise default), "
-             "default (always use default solver), or dedicated (force dedicated solver)"
+        help="Select solver: auto (chosen from the features of the input, with its time budget "
+             "and options), "
+             "default (always use default solver), dedicated (force dedicated solver), "
+             "anneal (improve the greedy plan by simulated annealing), "
+             "beam (beam search over budget and fleet states), "
+             "exact (exhaustive search with dominance pruning, for tiny inputs), "
+             "ga (genetic algorithm with parallel fitness evaluation), "
+             "horizon (rolling horizon with a knapsack per turn), "
+             "marginal (greedy with exact marginal gains from the power curve) "
+             "or portfolio (race all of them in parallel and keep the best plan)"
     )
-    args = parser.parse_args()
-    
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        default=10.0,
+        help="Wall-clock budget in seconds of the anneal, beam, ga, horizon and portfolio solvers, and of "
+             "the exact solver's fallback when it gives up; the best plan found so far is kept on disk "
+             "when it runs out (default: 10)"
+    )
+    parser.add_argument(
+        "--beam-width",
+        type=int,
+        default=4,
+        help="Number of states kept per turn by the beam solver (default: 4)"
+    )
+    parser.add_argument(
+        "--anneal-start",
+        choices=["greedy", "beam", "horizon"],
+        default="greedy",
+        help="Plan the anneal solver starts from: greedy (default), beam (beam search "
+             "with --beam-width) or horizon (rolling horizon); the seed gets at most half of the time limit"
+    )
+    parser.add_argument(
+        "--generations",
+        type=int,
+        default=None,
+        help="Stop the ga solver after this many generations (default: only the time limit)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes of the ga solver's fitness evaluation and of the portfolio race "
+             "(default: one per CPU)"
+    )
+    parser.add_argument(
+        "--horizon",
+        type=int,
+        default=2,
+        help="Window length in turns of the horizon solver (default: 2)"
+    )
+    parser.add_argument(
+        "--buckets",
+        type=int,
+        default=256,
+        help="Budget buckets of the horizon solver's knapsack (default: 256)"
+    )
+    parser.add_argument(
+        "--target-score",
+        type=int,
+        default=None,
+        help="Portfolio only: stop the other strategies once one reaches this final budget"
+    )
+    parser.add_argument(
+        "--simulator",
+        choices=list(SIMULATOR_MAPPING),
+        default="standard",
+        help="Select simulation engine: standard (turn-by-turn Resource objects), "
+             "compact (turn-by-turn slotted CompactResource objects), "
+             "event (event-driven, only touches resources that change state), "
+             "numpy (vectorized struct-of-arrays fleet) "
+             "or timeline (closed-form plan evaluation, no per-turn loop)"
+    )
+    parser.add_argument(
+        "--trace",
+        default="none",
+        help="Per-turn trace of the simulation: none (default), print (one line per turn), "
+             "ring:N (show the last N turns), arrays:PATH (columnar .npz), "
+             "csv:PATH or binary:PATH (streamed to a file)"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help=f"Directory of the compiled scenario cache (default: {DEFAULT_CACHE_DIR})"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Parse the input file without reading or writing the compiled scenario cache"
+    )
+    return parser
+
+def run(args):
+    """
+    Solve one input file and write its output file.
+      - args: parsed command line (see build_parser)
+    Returns:
+      Dictionary with 'solver' (the solver used), 'final_budget', 'solve_time' (parsing
+      excluded) and 'simulation_time', in seconds.
+    """
     input_file = args.input_file
     output_file = args.output_file
 
-    # Parse the challenge input.
-    initial_budget, resources, turns = parse_input(input_file)
+    # Parse the challenge input into a compiled scenario, or map it from the cache.
+    scenario = load_scenario(input_file, cache_dir=None if args.no_cache else args.cache_dir)
     file_basename = os.path.basename(input_file)
+    solve_start = time.perf_counter()
 
-    # Determine solver based on flag.
-    if args.solver == "default":
-        solver_func = solve_game_default
+    # In auto mode, the solver and its time budget depend on the features of the scenario.
+    if args.solver == "auto":
+        choice = choose_solver(profile_scenario(scenario), args.time_limit)
+        args.solver, args.time_limit = choice.solver, choice.time_limit
+        vars(args).update(choice.options)
+        print(f"Auto mode: {choice.reason} ({choice.solver}, {choice.time_limit:.1f}s)")
+
+    # Determine solver based on flag. Every solver runs under the anytime protocol:
+    # the output file is rewritten each time it yields a better plan.
+    # The portfolio gives each strategy the time limit itself, and the exact search has
+    # none; only signals stop them early.
+    stop = StopCondition(None if args.solver in ("portfolio", "exact") else args.time_limit)
+    annealer = genetic = horizon_solver = beam_solver = exact_solver = portfolio_results = None
+    if args.solver == "anneal":
+        def seeded_anneal():
+            # The greedy plan goes to disk first, so the output is never worse than the
+            # greedy engine; the starting plan is built here, under the stop condition,
+            # and counts against the time limit.
+            nonlocal annealer
+            initial_plan = solve_game(scenario)
+            yield initial_plan
+            if args.anneal_start != "greedy":
+                if args.anneal_start == "beam":
+                    seed_plan = solve_beam(scenario, width=args.beam_width,
+                                           time_limit=args.time_limit / 2, should_stop=stop)
+                else:
+                    seed_plan = solve_horizon(scenario, horizon=args.horizon, buckets=args.buckets,
+                                              time_limit=args.time_limit / 2)
+                yield seed_plan
+                evaluator = PlanEvaluator(scenario)
+                if evaluator.evaluate(seed_plan)['final_budget'] > evaluator.evaluate(initial_plan)['final_budget']:
+                    initial_plan = seed_plan
+            if stop():
+                return
+            annealer = AnnealSolver(scenario, initial_plan=initial_plan)
+            yield from annealer.iterate(stop.remaining(), stop)
+        plans = seeded_anneal()
+        print(f"Using simulated annealing from the {args.anneal_start} plan for {file_basename} "
+              f"({args.time_limit}s)")
+    elif args.solver == "exact":
+        exact_solver = ExactSolver(scenario)
+        def exact_search():
+            # Past its state bound the search gives up, and the time limit goes to
+            # annealing from a wide beam search instead.
+            nonlocal annealer
+            yield from exact_solver.iterate(stop)
+            if exact_solver.completed or stop():
+                return
+            fallback_start = time.perf_counter()
+            seed_plan = solve_beam(scenario, width=args.beam_width, time_limit=args.time_limit / 2,
+                                   should_stop=stop)
+            yield seed_plan
+            annealer = AnnealSolver(scenario, initial_plan=seed_plan)
+            remaining = max(args.time_limit - (time.perf_counter() - fallback_start), 0.0)
+            yield from annealer.iterate(remaining, stop)
+        plans = exact_search()
+        print(f"Using exact search for {file_basename}")
+    elif args.solver == "ga":
+        genetic = GeneticSolver(scenario, workers=args.workers)
+        plans = genetic.iterate(args.generations, args.time_limit, stop)
+        print(f"Using genetic algorithm for {file_basename} ({genetic.workers} workers)")
+    elif args.solver == "portfolio":
+        portfolio_results = {}
+        plans = iterate_portfolio(scenario, time_limit=args.time_limit, target_score=args.target_score,
+                                  max_workers=args.workers, should_stop=stop, results=portfolio_results)
+        print(f"Using solver portfolio for {file_basename}")
+    elif args.solver == "horizon":
+        horizon_solver = HorizonSolver(scenario, horizon=args.horizon, buckets=args.buckets)
+        plans = one_shot(horizon_solver.solve, args.time_limit)
+        print(f"Using rolling horizon (H={args.horizon}) for {file_basename}")
+    elif args.solver == "marginal":
+        plans = one_shot(solve_marginal, scenario)
+        print(f"Using marginal-gain greedy for {file_basename}")
+    elif args.solver == "beam":
+        beam_solver = BeamSolver(scenario, width=args.beam_width)
+        plans = one_shot(beam_solver.solve, args.time_limit, stop)
+        print(f"Using beam search (width {args.beam_width}) for {file_basename}")
+    elif args.solver == "default":
+        plans = one_shot(solve_game_default, scenario)
         print(f"Using default solver for {file_basename}")
-    elif args.solver == "dedicated":
+    else:  # dedicated
         if file_basename in SOLVER_MAPPING:
-            solver_func = SOLVER_MAPPING[file_basename]
+            plans = one_shot(SOLVER_MAPPING[file_basename], scenario)
             print(f"Using dedicated solver for {file_basename}")
         else:
             print(f"Dedicated solver not found for {file_basename}. Exiting.")
             sys.exit(1)
-    else:  # auto mode
-        if file_basename in SOLVER_MAPPING:
-            solver_func = SOLVER_MAPPING[file_basename]
-            print(f"Using dedicated solver for {file_basename}")
-        else:
-            solver_func = solve_game_default
-            print(f"No dedicated solver for {file_basename}, using default solver.")
 
-    # Get the purchase plan from the chosen solver
-    purchase_plan = solver_func(initial_budget, resources, turns)
+    # Get the purchase plans from the chosen solver, keeping the best one on disk.
+    with stop:
+        purchase_plan, best_score, improvements = run_anytime(scenario, plans, output_file, stop)
+    solve_time = time.perf_counter() - solve_start
+    if stop.signal_received is not None:
+        print(f"Stopped by signal {stop.signal_received} after {stop.elapsed():.1f}s.")
+    if purchase_plan is None:
+        purchase_plan = {}
+    if annealer is not None:
+        print(annealer.report())
+    if genetic is not None:
+        print(f"Genetic algorithm: {genetic.generations} generations, {genetic.evaluations} plans "
+              f"evaluated ({genetic.cache.hits} cache hits), "
+              f"best score {genetic.history[0]} -> {genetic.best_score}")
+    if portfolio_results is not None:
+        print(format_summary(portfolio_results))
+    if exact_solver is not None:
+        if exact_solver.completed:
+            print(f"Exact search: optimal plan ({exact_solver.peak_states} states at most per turn)")
+        elif stop.signal_received is None:
+            print(f"Exact search gave up past {exact_solver.max_states} states in a turn: "
+                  f"annealed from a beam search of width {args.beam_width} ({args.time_limit}s)")
+    if beam_solver is not None and beam_solver.fallback_turns:
+        print(f"Beam search out of time: the last {beam_solver.fallback_turns} turns "
+              f"were planned with the greedy rule")
+    if horizon_solver is not None and horizon_solver.fallback_turns:
+        print(f"Rolling horizon out of time: the last {horizon_solver.fallback_turns} turns "
+              f"were planned with the greedy rule")
 
     # Initialize and run the simulation.
-    simulator = GameSimulator(initial_budget, resources, turns)
+    trace = make_trace_sink(args.trace, scenario.num_turns)
+    simulator = SIMULATOR_MAPPING[args.simulator](scenario, trace=trace)
+    simulation_start = time.perf_counter()
     purchase_log, final_budget = simulator.run_simulation(purchase_plan)
+    simulation_time = time.perf_counter() - simulation_start
+    trace.close()
+    if isinstance(trace, RingBufferTraceSink):
+        for summary in trace.summaries():
+            print(f"Turn {summary['turn']}: {summary}")
     
     print(f"\nFinal budget after simulation: {final_budget}")
 
-    # Write the purchase plan to the output file.
+    # Write the purchase plan to the output file (already there unless no plan was produced).
     write_output(output_file, purchase_log)
-    print(f"Purchase plan written to {output_file}")
+    print(f"Purchase plan written to {output_file} ({improvements} improvements saved)")
+    return {'solver': args.solver, 'final_budget': final_budget,
+            'solve_time': solve_time, 'simulation_time': simulation_time}
+
+def main():
+    run(build_parser().parse_args())
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,249 @@
+# src/numpy_simulator.py
+
+"""
+NumPy struct-of-arrays backend for the game simulator. Every live resource is a
+column in a set of parallel integer arrays (state code, state_remaining,
+turns_elapsed, buildings_powered, periodic_cost, lifecycle, ...), so each turn's
+decrement, state flip, expiry compaction, power sum and maintenance sum are a
+handful of vectorized operations instead of a Python loop over Resource objects.
+
+Copies of one definition bought on the same turn behave identically for their
+whole life, so they are stored as a single cohort column with a multiplicity count:
+the fleet size tracks distinct (definition, purchase turn) pairs, not assets.
+"""
+
+import numpy as np
+
+from src.game_simulator import GameSimulator
+from src.resource import ACTIVE, DOWNTIME
+
+# Row indices of the fleet array; each row holds one field for every live resource.
+STATE = 0
+STATE_REMAINING = 1
+TURNS_ELAPSED = 2
+BUILDINGS_POWERED = 3
+PERIODIC_COST = 4
+LIFECYCLE = 5
+ACTIVE_DURATION = 6
+DOWNTIME_DURATION = 7
+COUNT = 8
+NUM_FIELDS = 9
+
+class NumpySimulator(GameSimulator):
+
+    def __init__(self, initial_budget, resources_def=None, turns=None, trace=None,
+                 initial_capacity=1024, checkpoint_interval=None):
+        """
+        Initialize the simulator.
+          - initial_budget: starting budget (int), or a compiled Scenario
+          - resources_def: list of resource definitions (each is a dict)
+          - turns: list of turn definitions (each is a dict with keys 'TM', 'TX', 'TR')
+          - trace: TraceSink receiving the per-turn summary (default: discard it)
+          - initial_capacity: number of live resources allocated up front (grows as needed)
+          - checkpoint_interval: save a snapshot every N turns for resimulate_from
+            (None keeps only the initial state; smaller values use more memory but replay less)
+        """
+        super().__init__(initial_budget, resources_def, turns, trace)
+        self.fleet = np.zeros((NUM_FIELDS, max(initial_capacity, 1)), dtype=np.int64)
+        self.num_live = 0           # Number of live cohorts (columns in use)
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoints = {}       # turn -> (budget, live fleet copy, purchase-log cursor)
+        self.purchase_plan = {}     # Plan of the last run, replayed before a changed suffix
+
+        # Template column for a freshly purchased cohort of each definition, by definition index.
+        scenario = self.scenario
+        self._templates = np.zeros((NUM_FIELDS, scenario.num_resources), dtype=np.int64)
+        self._templates[STATE] = ACTIVE
+        self._templates[STATE_REMAINING] = scenario.active_duration
+        self._templates[BUILDINGS_POWERED] = scenario.buildings_powered
+        self._templates[PERIODIC_COST] = scenario.periodic_cost
+        self._templates[LIFECYCLE] = scenario.lifecycle
+        self._templates[ACTIVE_DURATION] = scenario.active_duration
+        self._templates[DOWNTIME_DURATION] = scenario.downtime
+        self._templates[COUNT] = 1
+        self._activation_cost = scenario.activation_cost.tolist()
+
+    def _append(self, columns):
+        """
+        Append new cohort columns to the fleet, doubling its capacity when full.
+        """
+        count = columns.shape[1]
+        needed = self.num_live + count
+        capacity = self.fleet.shape[1]
+        if needed > capacity:
+            while capacity < needed:
+                capacity *= 2
+            grown = np.zeros((NUM_FIELDS, capacity), dtype=np.int64)
+            grown[:, :self.num_live] = self.fleet[:, :self.num_live]
+            self.fleet = grown
+        self.fleet[:, self.num_live:needed] = columns
+        self.num_live = needed
+
+    def purchase_resources(self, turn_index, resource_ids):
+        """
+        Attempt to purchase a list of resources at the beginning of a turn.
+        resource_ids: list of resource IDs to purchase.
+        Returns:
+          True if purchase is successful (i.e. activation cost <= budget), else False.
+        """
+        total_cost = 0
+        counts = {}
+        for rid in resource_ids:
+            index = self.index_by_id.get(rid)
+            if index is None:
+                continue
+            total_cost += self._activation_cost[index]
+            counts[index] = counts.get(index, 0) + 1
+
+        if total_cost > self.budget:
+            # Not enough budget to purchase these resources.
+            return False
+
+        self.budget -= total_cost
+        if counts:
+            # One cohort per distinct id bought this turn.
+            cohorts = self._templates[:, list(counts)]
+            cohorts[COUNT] = list(counts.values())
+            self._append(cohorts)
+        self.purchase_log.append((turn_index, resource_ids))
+        return True
+
+    def update_states(self):
+        """
+        Vectorized equivalent of Resource.update_state over the whole fleet:
+        advance every cohort by one turn, flip the ones whose state ran out and
+        compact away the ones that reached their end of life (whole cohort at once).
+        """
+        live = self.fleet[:, :self.num_live]
+        state = live[STATE]
+        remaining = live[STATE_REMAINING]
+        elapsed = live[TURNS_ELAPSED]
+
+        elapsed += 1
+        remaining -= 1
+        alive = elapsed < live[LIFECYCLE]
+
+        flip = alive & (remaining == 0)
+        if flip.any():
+            to_downtime = flip & (state == ACTIVE)
+            to_active = flip & (state == DOWNTIME)
+            state[flip] ^= 1
+            remaining[to_downtime] = live[DOWNTIME_DURATION][to_downtime]
+            remaining[to_active] = np.minimum(
+                live[ACTIVE_DURATION][to_active],
+                live[LIFECYCLE][to_active] - elapsed[to_active]
+            )
+
+        if not alive.all():
+            survivors = live[:, alive]
+            self.num_live = survivors.shape[1]
+            self.fleet[:, :self.num_live] = survivors
+
+    def simulate_turn(self, turn_index, purchase_ids):
+        """
+        Simulate a single turn:
+          1. Purchase phase.
+          2. Maintenance and production as array sums over the fleet.
+          3. Profit calculation: if powered buildings >= TM, profit = min(power, TX) * TR.
+          4. Update budget and resource states.
+        The turn summary is passed to the trace sink.
+        Returns:
+          Dictionary summarizing turn results.
+        """
+        # Purchase phase.
+        if purchase_ids:
+            success = self.purchase_resources(turn_index, purchase_ids)
+            if not success:
+                print(f"Turn {turn_index}: Purchase failed due to insufficient budget.")
+
+        total_maintenance = 0
+        total_power = 0
+        if self.num_live:
+            live = self.fleet[:, :self.num_live]
+            count = live[COUNT]
+            total_maintenance = int(np.dot(live[PERIODIC_COST], count))
+            total_power = int(np.dot(live[STATE] * live[BUILDINGS_POWERED], count))
+
+        # Get current turn parameters.
+        turn_params = self.turns[turn_index]
+        TM = turn_params['TM']
+        TX = turn_params['TX']
+        TR = turn_params['TR']
+
+        # Calculate profit if minimum threshold is met.
+        profit = min(total_power, TX) * TR if total_power >= TM else 0
+
+        # Update budget.
+        self.budget += profit - total_maintenance
+
+        # Update resource states and remove expired ones.
+        if self.num_live:
+            self.update_states()
+
+        self.trace.record(turn_index, self.budget, total_power, profit, total_maintenance)
+        return {
+            'turn': turn_index,
+            'purchases': purchase_ids,
+            'maintenance': total_maintenance,
+            'total_power': total_power,
+            'profit': profit,
+            'budget': self.budget
+        }
+
+    def save_checkpoint(self, turn_index):
+        """
+        Snapshot the state at the start of turn_index: budget, live fleet and purchase-log cursor.
+        """
+        fleet = self.fleet[:, :self.num_live].copy()
+        self.checkpoints[turn_index] = (self.budget, fleet, len(self.purchase_log))
+
+    def restore_checkpoint(self, turn_index):
+        """
+        Restore the snapshot taken at the start of turn_index.
+        """
+        budget, fleet, log_cursor = self.checkpoints[turn_index]
+        self.budget = budget
+        self.num_live = 0
+        self._append(fleet)
+        del self.purchase_log[log_cursor:]
+
+    def _run_from(self, start_turn):
+        interval = self.checkpoint_interval
+        for turn in range(start_turn, len(self.turns)):
+            if turn == 0 or (interval and turn % interval == 0):
+                self.save_checkpoint(turn)
+            self.simulate_turn(turn, self.purchase_plan.get(turn, []))
+        return self.purchase_log, self.budget
+
+    def run_simulation(self, purchase_plan):
+        """
+        Run the simulation over all turns using the provided purchase plan.
+        purchase_plan: dictionary mapping turn index to a list of resource IDs to purchase.
+        Returns:
+          Tuple (purchase_log, final_budget)
+        """
+        self.purchase_plan = dict(purchase_plan)
+        self.checkpoints = {}
+        return self._run_from(0)
+
+    def resimulate_from(self, turn_index, new_plan_suffix):
+        """
+        Re-run the last simulation with every purchase from turn_index onward replaced by
+        new_plan_suffix. The nearest snapshot at or before turn_index is restored and only
+        the remaining turns are replayed.
+        new_plan_suffix: dictionary mapping turn index (>= turn_index) to resource IDs.
+        Returns:
+          Tuple (purchase_log, final_budget)
+        """
+        if not self.checkpoints:
+            raise RuntimeError("resimulate_from needs a previous run_simulation call.")
+        start_turn = max(turn for turn in self.checkpoints if turn <= turn_index)
+
+        plan = {turn: ids for turn, ids in self.purchase_plan.items() if turn < turn_index}
+        plan.update((turn, ids) for turn, ids in new_plan_suffix.items() if turn >= turn_index)
+        self.purchase_plan = plan
+
+        self.restore_checkpoint(start_turn)
+        for turn in [turn for turn in self.checkpoints if turn > start_turn]:
+            del self.checkpoints[turn]
+        return self._run_from(start_turn)
@@ -87,26 +87,27 @@ def simulate_game(D, resources, turns):
     return output
 
 # Run the code
-# filename = "0-demo.txt"
-# filename = "1-thunberg.txt"
-# filename = "2-attenborough.txt"
-filename = "3-goodall.txt"
-# filename = "4-maathai.txt"
-# filename = "6-earle.txt"
-# filename = "8-shiva.txt"
-
-D, resources, turns = load_game_data(filename)
-output = simulate_game(D, resources, turns)
-
-# Print
-for line in output:
-    print(line)
+if __name__ == "__main__":
+    # filename = "0-demo.txt"
+    # filename = "1-thunberg.txt"
+    # filename = "2-attenborough.txt"
+    filename = "3-goodall.txt"
+    # filename = "4-maathai.txt"
+    # filename = "6-earle.txt"
+    # filename = "8-shiva.txt"
+
+    D, resources, turns = load_game_data(filename)
+    output = simulate_game(D, resources, turns)
+
+    # Print
+    for line in output:
+        print(line)
 
-# Save the output to a text file
-output_filename = filename.replace(".txt", "_output.txt")
+    # Save the output to a text file
+    output_filename = filename.replace(".txt", "_output.txt")
 
-with open(output_filename, "w", encoding="utf-8") as f:
-    for line in output:
-        f.write(line + "\n")
+    with open(output_filename, "w", encoding="utf-8") as f:
+        for line in output:
+            f.write(line + "\n")
 
-print(f"Output saved in {output_filename}")
+    print(f"Output saved in {output_filename}")
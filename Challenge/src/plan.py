@@ -0,0 +1,302 @@
+# src/plan.py
+
+"""
+Immutable purchase plans. A Plan stores the purchase turns and the resource ids
+bought in them as CSR arrays (sorted turns, offsets into one ids array) and
+reads like the {turn: [ids]} dictionaries the simulators take. It carries a
+Zobrist hash: the XOR of one 64-bit key per purchase, derived from (turn, id,
+occurrence of the id in that turn) by splitmix64, so adding or removing a
+purchase updates the hash in O(1) and the order of ids within a turn, which
+does not change the outcome of the turn, does not change the hash. Splicing
+the turns of a range from another plan only rehashes the purchases of that range.
+EvaluationCache is a bounded LRU cache from plan hash to evaluation result.
+"""
+
+from collections import OrderedDict
+from collections.abc import Mapping
+
+import numpy as np
+
+MASK = (1 << 64) - 1
+
+def _splitmix64(x):
+    """
+    splitmix64 finalizer of a Python int, modulo 2**64.
+    """
+    x = (x + 0x9E3779B97F4A7C15) & MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK
+    return x ^ (x >> 31)
+
+def _splitmix64_array(x):
+    """
+    splitmix64 finalizer of a uint64 array (arithmetic wraps modulo 2**64).
+    """
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+def purchase_key(turn, rid, occurrence):
+    """
+    Zobrist key of the occurrence-th purchase (from 0) of resource rid at turn.
+    """
+    return _splitmix64(_splitmix64(_splitmix64(turn & MASK) ^ (rid & MASK)) ^ occurrence)
+
+def zobrist_hash(turns, ids):
+    """
+    Zobrist hash of the purchases (turns[k], ids[k]), in any order.
+    Returns:
+      int in [0, 2**64).
+    """
+    turns = np.asarray(turns, dtype=np.int64)
+    ids = np.asarray(ids, dtype=np.int64)
+    if not len(turns):
+        return 0
+    order = np.lexsort((ids, turns))
+    turns, ids = turns[order], ids[order]
+    # Occurrence of each purchase among the equal (turn, id) pairs before it.
+    starts = np.ones(len(turns), dtype=bool)
+    starts[1:] = (turns[1:] != turns[:-1]) | (ids[1:] != ids[:-1])
+    positions = np.arange(len(turns))
+    occurrences = positions - np.maximum.accumulate(np.where(starts, positions, 0))
+    keys = _splitmix64_array(turns.astype(np.uint64))
+    keys = _splitmix64_array(keys ^ ids.astype(np.uint64))
+    keys = _splitmix64_array(keys ^ occurrences.astype(np.uint64))
+    return int(np.bitwise_xor.reduce(keys))
+
+def _frozen(values):
+    array = np.array(values, dtype=np.int64)
+    array.flags.writeable = False
+    return array
+
+class Plan(Mapping):
+    """
+    Read-only mapping from purchase turn to the list of resource ids bought, for the
+    turns with at least one purchase.
+    """
+
+    __slots__ = ('turns', 'offsets', 'ids', 'zobrist')
+
+    def __init__(self, turns, offsets, ids, zobrist=None):
+        """
+        Build a plan from CSR arrays.
+          - turns: sorted distinct purchase turns
+          - offsets: len(turns) + 1 positions in ids; turn turns[k] buys ids[offsets[k]:offsets[k + 1]]
+          - ids: resource ids of all purchases
+          - zobrist: Zobrist hash of the purchases (computed when not given)
+        """
+        assign = object.__setattr__
+        assign(self, 'turns', _frozen(turns))
+        assign(self, 'offsets', _frozen(offsets))
+        assign(self, 'ids', _frozen(ids))
+        if zobrist is None:
+            zobrist = zobrist_hash(np.repeat(self.turns, np.diff(self.offsets)), self.ids)
+        assign(self, 'zobrist', zobrist)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Plan is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Plan is immutable")
+
+    def __reduce__(self):
+        return (Plan, (self.turns, self.offsets, self.ids, self.zobrist))
+
+    @classmethod
+    def from_dict(cls, purchase_plan):
+        """
+        Build a plan from a dictionary mapping turn index to resource IDs (empty turns dropped).
+        """
+        turns = sorted(turn for turn, resource_ids in purchase_plan.items() if resource_ids)
+        return cls._from_turns(turns, [purchase_plan[turn] for turn in turns])
+
+    @classmethod
+    def from_log(cls, purchase_log):
+        """
+        Build a plan from a list of (turn, resource ids) tuples, as written by write_output.
+        Entries for the same turn are concatenated.
+        """
+        purchase_plan = {}
+        for turn, resource_ids in purchase_log:
+            purchase_plan.setdefault(turn, []).extend(resource_ids)
+        return cls.from_dict(purchase_plan)
+
+    @classmethod
+    def _from_turns(cls, turns, groups):
+        offsets = np.zeros(len(turns) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(group) for group in groups])
+        ids = [rid for group in groups for rid in group]
+        return cls(turns, offsets, ids)
+
+    def to_dict(self):
+        """
+        Dictionary mapping every purchase turn to its list of resource IDs.
+        """
+        return dict(self.items())
+
+    def to_log(self):
+        """
+        List of (turn, resource ids) tuples, the format of write_output.
+        """
+        return list(self.items())
+
+    def _position(self, turn):
+        position = int(np.searchsorted(self.turns, turn))
+        found = position < len(self.turns) and self.turns[position] == turn
+        return position, found
+
+    def __getitem__(self, turn):
+        position, found = self._position(turn)
+        if not found:
+            raise KeyError(turn)
+        return self.ids[self.offsets[position]:self.offsets[position + 1]].tolist()
+
+    def __iter__(self):
+        return iter(self.turns.tolist())
+
+    def __len__(self):
+        return len(self.turns)
+
+    def __contains__(self, turn):
+        return self._position(turn)[1]
+
+    def items(self):
+        turns, offsets, ids = self.turns.tolist(), self.offsets.tolist(), self.ids.tolist()
+        return [(turn, ids[offsets[k]:offsets[k + 1]]) for k, turn in enumerate(turns)]
+
+    def __hash__(self):
+        return self.zobrist
+
+    def __eq__(self, other):
+        if isinstance(other, Plan):
+            return (self.zobrist == other.zobrist and np.array_equal(self.turns, other.turns)
+                    and np.array_equal(self.offsets, other.offsets) and np.array_equal(self.ids, other.ids))
+        return Mapping.__eq__(self, other)
+
+    def __repr__(self):
+        return f"Plan({self.to_dict()!r})"
+
+    @property
+    def num_purchases(self):
+        return len(self.ids)
+
+    @property
+    def hash(self):
+        """
+        Zobrist hash of the purchases, the key of EvaluationCache.
+        """
+        return self.zobrist
+
+    def _range_hash(self, low, high):
+        """
+        Zobrist hash of the purchases of turns[low:high].
+        """
+        counts = np.diff(self.offsets[low:high + 1])
+        return zobrist_hash(np.repeat(self.turns[low:high], counts),
+                            self.ids[self.offsets[low]:self.offsets[high]])
+
+    def spliced(self, other, start, end):
+        """
+        Plan buying what other buys at turns [start, end) and what this plan buys at
+        the other turns. Occurrences only count within a turn, so the hash changes by
+        the hashes of the two replaced ranges.
+        """
+        low, high = np.searchsorted(self.turns, [start, end]).tolist()
+        other_low, other_high = np.searchsorted(other.turns, [start, end]).tolist()
+        counts = np.diff(self.offsets)
+        turns = np.concatenate((self.turns[:low], other.turns[other_low:other_high], self.turns[high:]))
+        offsets = np.zeros(len(turns) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.concatenate((counts[:low], np.diff(other.offsets)[other_low:other_high],
+                                                counts[high:])))
+        ids = np.concatenate((self.ids[:self.offsets[low]],
+                              other.ids[other.offsets[other_low]:other.offsets[other_high]],
+                              self.ids[self.offsets[high]:]))
+        zobrist = self.zobrist ^ self._range_hash(low, high) ^ other._range_hash(other_low, other_high)
+        return Plan(turns, offsets, ids, zobrist)
+
+    def with_purchase(self, turn, rid):
+        """
+        Plan with one more purchase of rid at turn (appended after that turn's ids).
+        """
+        position, found = self._position(turn)
+        if found:
+            end = int(self.offsets[position + 1])
+            occurrence = int(np.count_nonzero(self.ids[self.offsets[position]:end] == rid))
+            turns = self.turns
+            offsets = self.offsets.copy()
+            offsets[position + 1:] += 1
+        else:
+            end = int(self.offsets[position])
+            occurrence = 0
+            turns = np.insert(self.turns, position, turn)
+            offsets = np.insert(self.offsets, position + 1, end)
+            offsets[position + 1:] += 1
+        ids = np.insert(self.ids, end, rid)
+        return Plan(turns, offsets, ids, self.zobrist ^ purchase_key(turn, rid, occurrence))
+
+    def without_purchase(self, turn, rid):
+        """
+        Plan without the last purchase of rid at turn.
+        Raises:
+          KeyError if the plan does not buy rid at turn.
+        """
+        position, found = self._position(turn)
+        start, end = (int(self.offsets[position]), int(self.offsets[position + 1])) if found else (0, 0)
+        matches = np.flatnonzero(self.ids[start:end] == rid)
+        if not len(matches):
+            raise KeyError((turn, rid))
+        ids = np.delete(self.ids, start + int(matches[-1]))
+        offsets = self.offsets.copy()
+        offsets[position + 1:] -= 1
+        turns = self.turns
+        if end - start == 1:
+            turns = np.delete(turns, position)
+            offsets = np.delete(offsets, position + 1)
+        return Plan(turns, offsets, ids, self.zobrist ^ purchase_key(turn, rid, len(matches) - 1))
+
+class EvaluationCache:
+    """
+    Bounded LRU cache from plan hash to evaluation result, with hit and miss counters.
+    """
+
+    def __init__(self, max_size=4096):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+
+    def get(self, key, default=None):
+        """
+        Result cached for a plan hash (or a Plan), or default on a miss.
+        """
+        key = key.zobrist if isinstance(key, Plan) else key
+        result = self._results.get(key, self)
+        if result is self:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._results.move_to_end(key)
+        return result
+
+    def put(self, key, result):
+        """
+        Cache the result of a plan hash (or a Plan), evicting the least recently used entry.
+        """
+        key = key.zobrist if isinstance(key, Plan) else key
+        self._results[key] = result
+        self._results.move_to_end(key)
+        if len(self._results) > self.max_size:
+            self._results.popitem(last=False)
+
+    def __contains__(self, key):
+        key = key.zobrist if isinstance(key, Plan) else key
+        return key in self._results
+
+    def __len__(self):
+        return len(self._results)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
@@ -0,0 +1,234 @@
+# src/plan_evaluator.py
+
+"""
+Closed-form plan evaluation. A resource bought at turn t follows a fixed pattern
+(active for active_duration turns, down for downtime turns, until its lifecycle
+ends), so the effect of a whole purchase plan on per-turn power and maintenance
+is a sum of shifted timelines that can be precomputed once per definition.
+The evaluator scatter-adds those timelines, computes profit and the budget curve
+with vectorized operations and checks affordability before each purchase turn.
+"""
+
+import numpy as np
+
+from src.resource import state_transitions
+from src.scenario import compile_scenario
+from src.trace import NullTraceSink
+
+class PlanEvaluator:
+
+    def __init__(self, initial_budget, resources_def=None, turns=None, trace=None):
+        """
+        Precompute the turn arrays and one timeline per resource definition.
+          - initial_budget: starting budget (int), or a compiled Scenario
+          - resources_def: list of resource definitions (each is a dict)
+          - turns: list of turn definitions (each is a dict with keys 'TM', 'TX', 'TR')
+          - trace: TraceSink receiving the per-turn curves of run_simulation (default: discard them)
+        """
+        self.trace = trace if trace is not None else NullTraceSink()
+        scenario = compile_scenario(initial_budget, resources_def, turns)
+        self.scenario = scenario
+        self.initial_budget = scenario.initial_budget
+        self.resources_def = scenario.resources
+        self.num_turns = scenario.num_turns
+
+        self.TM = scenario.TM
+        self.TX = scenario.TX
+        self.TR = scenario.TR
+        self.index_by_id = scenario.index_by_id
+        self.activation_cost = scenario.activation_cost
+        self.periodic_cost = scenario.periodic_cost
+        self.lifetimes = np.zeros(scenario.num_resources, dtype=np.int64)
+
+        # Dense per-age power timeline of every definition, plus the same information
+        # as sparse events (age, power delta, maintenance delta) for scatter-adding.
+        self.power_timelines = []
+        self.event_ages = []
+        self.event_power = []
+        self.event_maintenance = []
+        for index, res_def in enumerate(self.resources_def):
+            power = res_def['buildings_powered']
+            cost = res_def['periodic_cost']
+            lifetime, transitions = state_transitions(res_def)
+            self.lifetimes[index] = lifetime
+
+            timeline = np.full(lifetime, power, dtype=np.int64)
+            ages = [0]
+            power_deltas = [power]
+            maintenance_deltas = [cost]
+            active = True
+            for age, active in transitions:
+                if not active:
+                    timeline[age:] = 0
+                else:
+                    timeline[age:] = power
+                ages.append(age)
+                power_deltas.append(power if active else -power)
+                maintenance_deltas.append(0)
+            ages.append(lifetime)
+            power_deltas.append(-power if active else 0)
+            maintenance_deltas.append(-cost)
+
+            self.power_timelines.append(timeline)
+            self.event_ages.append(np.array(ages, dtype=np.int64))
+            self.event_power.append(np.array(power_deltas, dtype=np.int64))
+            self.event_maintenance.append(np.array(maintenance_deltas, dtype=np.int64))
+
+    def normalize_plan(self, purchase_plan):
+        """
+        Convert a purchase plan into the purchase turns the simulator would attempt.
+        purchase_plan: dictionary mapping turn index to a list of resource IDs to purchase.
+        Returns:
+          List of (turn, resource_ids, definition_indices) sorted by turn. Unknown ids
+          stay in resource_ids (they are logged) but have no definition index.
+        """
+        purchases = []
+        for turn in sorted(purchase_plan):
+            resource_ids = purchase_plan[turn]
+            if not resource_ids or not 0 <= turn < self.num_turns:
+                continue
+            indices = [self.index_by_id[rid] for rid in resource_ids if rid in self.index_by_id]
+            purchases.append((turn, resource_ids, indices))
+        return purchases
+
+    def scatter(self, purchase_turns, definition_indices, sign=1, rows=None, num_rows=1):
+        """
+        Scatter-add the timelines of the given purchases.
+          - purchase_turns, definition_indices: parallel integer arrays, one entry per asset
+          - sign: +1 to add the purchases, -1 to remove them
+          - rows, num_rows: optional plan index of every entry, to build one curve per plan
+        Returns:
+          Tuple (power, maintenance) of per-turn int64 arrays, shaped (num_rows, turns)
+          when rows is given.
+        """
+        num_turns = self.num_turns
+        width = num_turns + 1
+        power_diff = np.zeros(num_rows * width, dtype=np.int64)
+        maintenance_diff = np.zeros(num_rows * width, dtype=np.int64)
+        purchase_turns = np.asarray(purchase_turns, dtype=np.int64)
+        definition_indices = np.asarray(definition_indices, dtype=np.int64)
+        offsets = 0 if rows is None else np.asarray(rows, dtype=np.int64) * width
+        offsets = np.broadcast_to(offsets, purchase_turns.shape)
+        for index in np.unique(definition_indices):
+            selected = definition_indices == index
+            ages = self.event_ages[index]
+            turns = (purchase_turns[selected][:, None] + ages[None, :]).ravel()
+            inside = turns < num_turns
+            positions = (offsets[selected][:, None] + turns.reshape(-1, len(ages))).ravel()[inside]
+            repeats = int(selected.sum())
+            np.add.at(power_diff, positions, sign * np.tile(self.event_power[index], repeats)[inside])
+            np.add.at(maintenance_diff, positions, sign * np.tile(self.event_maintenance[index], repeats)[inside])
+        power = np.cumsum(power_diff.reshape(num_rows, width)[:, :-1], axis=1)
+        maintenance = np.cumsum(maintenance_diff.reshape(num_rows, width)[:, :-1], axis=1)
+        if rows is None:
+            return power[0], maintenance[0]
+        return power, maintenance
+
+    def profit(self, power, start=0):
+        """
+        Vectorized per-turn profit: min(power, TX) * TR when power >= TM, else 0.
+        power holds the turns from start onward.
+        """
+        end = start + len(power)
+        TM, TX, TR = self.TM[start:end], self.TX[start:end], self.TR[start:end]
+        return np.where(power >= TM, np.minimum(power, TX) * TR, 0)
+
+    def drop_failed_purchases(self, power, maintenance, profit, net, budget, spending, attempted,
+                              indices_at):
+        """
+        Drop the purchase turns the budget cannot cover, in one forward pass.
+        The per-turn curves of one plan are updated in place. They are exact up to the
+        first failing turn; from there each segment up to the next attempted turn is
+        recomputed once, after the timelines of the purchases dropped so far have been
+        removed, so the pass costs O(turns + purchases) whatever the number of failures.
+          - power, maintenance, profit, net, budget, spending: per-turn int64 arrays
+          - attempted: per-turn bools, cleared for the dropped turns
+          - indices_at: function mapping a purchase turn to its definition indices
+        Returns:
+          List of the failed turns, in order.
+        """
+        num_turns = self.num_turns
+        # Budget available at the start of each turn, before its purchase.
+        failing = np.flatnonzero(attempted & (spending > budget - net))
+        if not len(failing):
+            return []
+
+        def refresh(start, end):
+            profit[start:end] = self.profit(power[start:end], start)
+            net[start:end] = profit[start:end] - maintenance[start:end] - spending[start:end]
+            base = budget[start - 1] if start else self.initial_budget
+            budget[start:end] = base + np.cumsum(net[start:end])
+
+        failed_turns = []
+        valid = int(failing[0])
+        purchase_turns = np.flatnonzero(attempted)
+        for turn in purchase_turns[purchase_turns >= valid].tolist():
+            refresh(valid, turn)
+            available = budget[turn - 1] if turn else self.initial_budget
+            valid = turn
+            if spending[turn] <= available:
+                continue
+            failed_turns.append(turn)
+            attempted[turn] = False
+            spending[turn] = 0
+            for index in indices_at(turn):
+                timeline = self.power_timelines[index][:num_turns - turn]
+                power[turn:turn + len(timeline)] -= timeline
+                maintenance[turn:turn + len(timeline)] -= self.periodic_cost[index]
+        refresh(valid, num_turns)
+        return failed_turns
+
+    def evaluate(self, purchase_plan):
+        """
+        Score a purchase plan in one vectorized pass.
+        A purchase turn whose activation cost exceeds the budget available before it is
+        dropped, exactly like GameSimulator.purchase_resources (see drop_failed_purchases).
+        purchase_plan: dictionary mapping turn index to a list of resource IDs to purchase.
+        Returns:
+          Dictionary with 'purchase_log', 'final_budget', 'failed_turns' and the per-turn
+          arrays 'power', 'maintenance', 'profit' and 'budget' (budget at the end of each turn).
+        """
+        num_turns = self.num_turns
+        purchases = self.normalize_plan(purchase_plan)
+
+        purchase_turns = [turn for turn, _, indices in purchases for _ in indices]
+        definition_indices = [index for _, _, indices in purchases for index in indices]
+        power, maintenance = self.scatter(purchase_turns, definition_indices)
+
+        spending = np.zeros(num_turns, dtype=np.int64)
+        attempted = np.zeros(num_turns, dtype=bool)
+        for turn, _, indices in purchases:
+            spending[turn] = self.activation_cost[indices].sum()
+            attempted[turn] = True
+
+        profit = self.profit(power)
+        net = profit - maintenance - spending
+        budget = self.initial_budget + np.cumsum(net)
+
+        by_turn = {turn: indices for turn, _, indices in purchases}
+        failed_turns = self.drop_failed_purchases(power, maintenance, profit, net, budget, spending,
+                                                  attempted, by_turn.__getitem__)
+
+        failed = set(failed_turns)
+        purchase_log = [(turn, resource_ids) for turn, resource_ids, _ in purchases if turn not in failed]
+        final_budget = int(budget[-1]) if num_turns else self.initial_budget
+        return {
+            'purchase_log': purchase_log,
+            'final_budget': final_budget,
+            'failed_turns': failed_turns,
+            'power': power,
+            'maintenance': maintenance,
+            'profit': profit,
+            'budget': budget
+        }
+
+    def run_simulation(self, purchase_plan):
+        """
+        Same interface as GameSimulator.run_simulation; the curves go to the trace sink.
+        Returns:
+          Tuple (purchase_log, final_budget)
+        """
+        result = self.evaluate(purchase_plan)
+        self.trace.record_many(np.arange(self.num_turns), result['budget'], result['power'],
+                               result['profit'], result['maintenance'])
+        return result['purchase_log'], result['final_budget']
@@ -0,0 +1,187 @@
+# src/portfolio.py
+
+"""
+Solver portfolio. Several strategies (the greedy solvers, the other_solvers and
+the search-based solvers) race on the same input, each in its own process. Every
+plan is scored with GameSimulator and the best one wins. Every strategy gets the
+time limit from its own start, strategies beyond the worker count wait for a free
+slot, and once a strategy reaches an optional target score the others are
+terminated. iterate_portfolio() yields each improving plan as it arrives, so
+the anytime protocol saves it before the race is over.
+"""
+
+import contextlib
+import io
+import multiprocessing
+import queue
+import signal
+import time
+
+from src.anneal_solver import solve_anneal
+from src.beam_solver import solve_beam
+from src.challenge_solver import solve_game, solve_game_default
+from src.game_simulator import GameSimulator
+from src.genetic_solver import solve_genetic
+from src.horizon_solver import solve_horizon
+from src.power_curve import solve_marginal
+from src.other_solvers import solver_andrea, solver_simone
+
+def solve_andrea(scenario, time_limit=None):
+    """
+    Adapter for other_solvers/solver_andrea.py, which takes its own resource dicts
+    and returns output lines.
+    """
+    resources = [{
+        "RI": r['id'], "RA": r['activation_cost'], "RP": r['periodic_cost'],
+        "RW": r['active_duration'], "RM": r['downtime'], "RL": r['lifecycle'],
+        "RU": r['buildings_powered'], "RT": r['resource_type'], "RE": r['special_effect']
+    } for r in scenario.resources]
+    purchase_plan = {}
+    for line in solver_andrea.simulate_game(scenario.initial_budget, resources, scenario.turns):
+        turn, _, *resource_ids = map(int, line.split())
+        purchase_plan[turn] = resource_ids
+    return purchase_plan
+
+def solve_simone(scenario, time_limit=None):
+    """
+    Adapter for other_solvers/solver_simone.py, which takes its own Resource objects.
+    """
+    resources = [solver_simone.Resource(
+        r['id'], r['activation_cost'], r['periodic_cost'], r['active_duration'], r['downtime'],
+        r['lifecycle'], r['buildings_powered'], r['resource_type'], r['special_effect']
+    ) for r in scenario.resources]
+    return solver_simone.run_game(resources, scenario.turns, scenario.initial_budget)
+
+# Strategies of the portfolio: name -> function(scenario, time_limit) returning a plan.
+STRATEGIES = {
+    "greedy": lambda scenario, time_limit: solve_game(scenario),
+    "default": lambda scenario, time_limit: solve_game_default(scenario),
+    "andrea": solve_andrea,
+    "simone": solve_simone,
+    "marginal": lambda scenario, time_limit: solve_marginal(scenario),
+    "beam": lambda scenario, time_limit: solve_beam(scenario, time_limit=time_limit),
+    "horizon": lambda scenario, time_limit: solve_horizon(scenario, time_limit=time_limit),
+    "anneal": lambda scenario, time_limit: solve_anneal(scenario, time_limit=time_limit),
+    "ga": lambda scenario, time_limit: solve_genetic(scenario, time_limit=time_limit, workers=0),
+}
+
+def _run_strategy(name, scenario, time_limit, results):
+    """
+    Body of a strategy process: solve, score with GameSimulator and report
+    (name, status, score, seconds, plan or error message) on the results queue.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # A forked process inherits the StopCondition handler of main, which would turn
+    # terminate() into a flag nobody reads.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    start = time.perf_counter()
+    try:
+        purchase_plan = STRATEGIES[name](scenario, time_limit)
+        # Failed purchases are reported by the simulator with print(); keep them quiet.
+        with contextlib.redirect_stdout(io.StringIO()):
+            _, final_budget = GameSimulator(scenario).run_simulation(purchase_plan)
+        results.put((name, 'ok', final_budget, time.perf_counter() - start, purchase_plan))
+    except Exception as error:
+        results.put((name, 'error', None, time.perf_counter() - start, repr(error)))
+
+def iterate_portfolio(scenario, strategies=None, time_limit=10.0, target_score=None, max_workers=None,
+                      grace=5.0, should_stop=None, results=None):
+    """
+    Race strategies in separate processes, as an anytime solver.
+      - scenario: compiled Scenario
+      - strategies: names from STRATEGIES (default: all of them)
+      - time_limit: seconds given to each time-limited strategy, counted from its own start
+      - target_score: stop all other strategies once one reaches this final budget
+      - max_workers: processes running at once (default: one per CPU); the others wait their turn
+      - grace: seconds past its time_limit after which a running strategy is terminated
+      - should_stop: optional callable; once it returns True the race is cancelled
+      - results: optional dictionary filled with the result of every strategy, a dictionary
+        with 'status' (ok, error, cancelled or timeout), 'score' and 'seconds'
+    Yields:
+      The plan of every strategy that beats the best score so far, as soon as it reports.
+      Closing the generator terminates the strategies still running.
+    """
+    strategies = list(strategies or STRATEGIES)
+    max_workers = max_workers or multiprocessing.cpu_count()
+    results = {} if results is None else results
+    results_queue = multiprocessing.Queue()
+    pending = list(strategies)
+    running = {}
+    best_score = None
+
+    def stop(name, status):
+        process, started = running.pop(name)
+        process.terminate()
+        process.join()
+        results[name] = {'status': status, 'score': None, 'seconds': time.perf_counter() - started}
+
+    def stop_all(status):
+        for name in list(running):
+            stop(name, status)
+        for name in pending:
+            results[name] = {'status': status, 'score': None, 'seconds': 0.0}
+        pending.clear()
+
+    try:
+        while pending or running:
+            if should_stop is not None and should_stop():
+                stop_all('cancelled')
+                break
+            while pending and len(running) < max_workers:
+                name = pending.pop(0)
+                process = multiprocessing.Process(target=_run_strategy,
+                                                  args=(name, scenario, time_limit, results_queue))
+                process.start()
+                running[name] = (process, time.perf_counter())
+            try:
+                name, status, score, seconds, payload = results_queue.get(timeout=0.1)
+            except queue.Empty:
+                now = time.perf_counter()
+                for name, (process, started) in list(running.items()):
+                    if now >= started + time_limit + grace:
+                        stop(name, 'timeout')
+                    elif not process.is_alive() and results_queue.empty():
+                        # The process died without reporting (e.g. killed by the OS).
+                        running.pop(name)
+                        results[name] = {'status': 'error', 'score': None, 'seconds': now - started}
+                continue
+
+            if name not in running:
+                # Reported just before it was terminated.
+                continue
+            running.pop(name)[0].join()
+            results[name] = {'status': status, 'score': score, 'seconds': seconds}
+            if status == 'ok' and (best_score is None or score > best_score):
+                best_score = score
+                yield payload
+            if target_score is not None and best_score is not None and best_score >= target_score:
+                stop_all('cancelled')
+    finally:
+        stop_all('cancelled')
+
+def run_portfolio(scenario, strategies=None, time_limit=10.0, target_score=None, max_workers=None,
+                  grace=5.0, should_stop=None):
+    """
+    Race strategies in separate processes until all of them are done (see iterate_portfolio).
+    Returns:
+      Tuple (best plan, results) where results maps every strategy name to a dictionary
+      with 'status' (ok, error, cancelled or timeout), 'score' and 'seconds'.
+    """
+    strategies = list(strategies or STRATEGIES)
+    results = {}
+    best_plan = None
+    for best_plan in iterate_portfolio(scenario, strategies, time_limit, target_score, max_workers,
+                                       grace, should_stop, results):
+        pass
+    return best_plan, {name: results[name] for name in strategies}
+
+def format_summary(results):
+    """
+    Return the per-strategy summary table (score and time) as a printable string.
+    """
+    lines = [f"{'strategy':<10} {'status':<10} {'score':>14} {'seconds':>9}"]
+    ranked = sorted(results.items(), key=lambda item: (item[1]['score'] is None, -(item[1]['score'] or 0)))
+    for name, result in ranked:
+        score = "-" if result['score'] is None else str(result['score'])
+        lines.append(f"{name:<10} {result['status']:<10} {score:>14} {result['seconds']:>9.2f}")
+    return "\n".join(lines)
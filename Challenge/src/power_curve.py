@@ -0,0 +1,328 @@
+# src/power_curve.py
+
+"""
+Marginal-gain oracle over the per-turn power curve. PowerCurve answers "how much
+does the total profit change if delta power is added over turns [start, end)?"
+without simulating: the curve is split into blocks of about sqrt(T) turns, each
+with a lazy pending add and its turns sorted by deficit to TM and by headroom to
+TX, with prefix sums of TR, TR * TM and TR * key. A range-add only moves the
+lazy value of the blocks it covers, so a fully covered block answers a gain query
+with a few binary searches; the partial blocks at the ends are computed directly.
+MarginalSolver extends the greedy fill-to-TM rule with purchases chosen by the oracle.
+"""
+
+import math
+
+import numpy as np
+
+from src.challenge_solver import ratio_rank_key
+from src.plan_evaluator import PlanEvaluator
+from src.resource import state_transitions
+
+class PowerCurve:
+
+    def __init__(self, TM, TX, TR, power=None, block_size=None):
+        """
+        Build the curve.
+          - TM, TX, TR: per-turn threshold, capacity and rate arrays
+          - power: initial per-turn power (default: zero)
+          - block_size: turns per block (default: about sqrt(number of turns))
+        """
+        self.TM = np.asarray(TM, dtype=np.int64)
+        self.TX = np.asarray(TX, dtype=np.int64)
+        self.TR = np.asarray(TR, dtype=np.int64)
+        self.num_turns = len(self.TM)
+        self.block_size = block_size or max(16, math.isqrt(max(self.num_turns, 1)))
+        self.num_blocks = -(-self.num_turns // self.block_size)
+        self.base = np.zeros(self.num_turns, dtype=np.int64)
+        if power is not None:
+            self.base[:] = power
+        self.lazy = np.zeros(self.num_blocks, dtype=np.int64)
+        # Turns with TM > TX (profit jumps from 0 to TX * TR) break the identities the
+        # sorted keys rely on, so their blocks are always computed directly.
+        irregular = self.TM > self.TX
+        self.irregular = np.zeros(self.num_blocks, dtype=bool)
+        np.logical_or.at(self.irregular, np.arange(self.num_turns) // self.block_size, irregular)
+        self.blocks = [None] * self.num_blocks
+        for block in range(self.num_blocks):
+            self._rebuild(block)
+
+    def _bounds(self, block):
+        start = block * self.block_size
+        return start, min(start + self.block_size, self.num_turns)
+
+    def _rebuild(self, block):
+        """
+        Push the lazy add of a block into its turns and re-sort its keys.
+        """
+        start, end = self._bounds(block)
+        self.base[start:end] += self.lazy[block]
+        self.lazy[block] = 0
+        if self.irregular[block]:
+            return
+        power = self.base[start:end]
+        TM, TX, TR = self.TM[start:end], self.TX[start:end], self.TR[start:end]
+
+        deficit = TM - power   # s1 = deficit - lazy: power missing to reach TM
+        order = np.argsort(deficit, kind='stable')
+        deficit, TR1 = deficit[order], TR[order]
+        headroom = TX - power  # s2 = headroom - lazy: power missing to reach TX
+        order2 = np.argsort(headroom, kind='stable')
+        headroom, TR2 = headroom[order2], TR[order2]
+
+        prefix = lambda values: np.concatenate(([0], np.cumsum(values)))
+        self.blocks[block] = (
+            deficit, prefix(TR1), prefix(TR1 * TM[order]), prefix(TR1 * deficit),
+            headroom, prefix(TR2), prefix(TR2 * headroom)
+        )
+
+    def values(self, start=0, end=None):
+        """
+        Per-turn power of turns [start, end).
+        """
+        end = self.num_turns if end is None else end
+        turns = np.arange(start, end)
+        return self.base[start:end] + self.lazy[turns // self.block_size]
+
+    def profit(self, start=0, end=None):
+        """
+        Per-turn profit of turns [start, end): min(power, TX) * TR when power >= TM, else 0.
+        """
+        end = self.num_turns if end is None else end
+        power = self.values(start, end)
+        TM, TX, TR = self.TM[start:end], self.TX[start:end], self.TR[start:end]
+        return np.where(power >= TM, np.minimum(power, TX) * TR, 0)
+
+    def range_add(self, start, end, delta):
+        """
+        Add delta power to turns [start, end) (clipped to the curve).
+        """
+        start, end = max(start, 0), min(end, self.num_turns)
+        if start >= end or not delta:
+            return
+        first, last = start // self.block_size, (end - 1) // self.block_size
+        for block in {first, last}:
+            block_start, block_end = self._bounds(block)
+            if start > block_start or end < block_end:
+                self.base[max(start, block_start):min(end, block_end)] += delta
+                self._rebuild(block)
+            else:
+                self.lazy[block] += delta
+        if last - first > 1:
+            self.lazy[first + 1:last] += delta
+
+    def _direct_gain(self, start, end, delta):
+        power = self.values(start, end)
+        TM, TX, TR = self.TM[start:end], self.TX[start:end], self.TR[start:end]
+        before = np.where(power >= TM, np.minimum(power, TX) * TR, 0)
+        after = np.where(power + delta >= TM, np.minimum(power + delta, TX) * TR, 0)
+        return int((after - before).sum())
+
+    def _block_gain(self, block, shift, delta):
+        """
+        Profit gained by adding delta > 0 to every turn of a regular block whose turns
+        are shift above their stored power. With s1 the deficit to TM and s2 the
+        headroom to TX of a turn (s1 <= s2), the gain is TR * min(delta, s2) when
+        s1 <= delta (clipped at 0), plus TR * power when 0 < s1 <= delta.
+        """
+        deficit, TR1, TRTM1, TRdeficit, headroom, TR2, TRheadroom = self.blocks[block]
+        # Sum over all turns of TR * clip(s2, 0, delta).
+        i0 = np.searchsorted(headroom, shift, 'right')
+        i1 = np.searchsorted(headroom, shift + delta, 'left')
+        capped = (TRheadroom[i1] - TRheadroom[i0] - shift * (TR2[i1] - TR2[i0])
+                  + delta * (TR2[-1] - TR2[i1]))
+        # Turns with s1 > delta gain nothing; there s2 >= s1 > delta, so they were counted at delta.
+        j0 = np.searchsorted(deficit, shift, 'right')
+        j1 = np.searchsorted(deficit, shift + delta, 'right')
+        capped -= delta * (TR1[-1] - TR1[j1])
+        # Turns crossing TM (0 < s1 <= delta) also earn their current power, TM - s1.
+        crossing = TRTM1[j1] - TRTM1[j0] - (TRdeficit[j1] - TRdeficit[j0]) + shift * (TR1[j1] - TR1[j0])
+        return int(capped + crossing)
+
+    def gain(self, start, end, delta):
+        """
+        Change of the total profit if delta power (positive or negative) were added to
+        turns [start, end), without changing the curve.
+        """
+        start, end = max(start, 0), min(end, self.num_turns)
+        if start >= end or not delta:
+            return 0
+        first, last = start // self.block_size, (end - 1) // self.block_size
+        total = 0
+        for block in range(first, last + 1):
+            block_start, block_end = self._bounds(block)
+            if start > block_start or end < block_end or self.irregular[block]:
+                total += self._direct_gain(max(start, block_start), min(end, block_end), delta)
+            elif delta > 0:
+                total += self._block_gain(block, int(self.lazy[block]), delta)
+            else:
+                # Removing d is the opposite of adding d to the curve lowered by d.
+                total -= self._block_gain(block, int(self.lazy[block]) + delta, -delta)
+        return total
+
+    def pattern_gain(self, turn, intervals, delta):
+        """
+        Change of the total profit if a resource bought at turn added delta power
+        over its active intervals, given as (start age, end age) pairs.
+        """
+        return sum(self.gain(turn + start, turn + end, delta) for start, end in intervals)
+
+    def window_gains(self, turn, patterns):
+        """
+        Change of the total profit for each row of patterns, a (k x W) array of power
+        added to turns [turn, turn + W). Computed directly over the window, which is
+        cheaper than the block queries while W is within a couple of blocks.
+        Returns:
+          int64 array of k gains.
+        """
+        end = min(turn + patterns.shape[1], self.num_turns)
+        power = self.values(turn, end)
+        TM, TX, TR = self.TM[turn:end], self.TX[turn:end], self.TR[turn:end]
+        before = np.where(power >= TM, np.minimum(power, TX) * TR, 0).sum()
+        after = power + patterns[:, :end - turn]
+        return np.where(after >= TM, np.minimum(after, TX) * TR, 0).sum(axis=1) - before
+
+    def add_pattern(self, turn, intervals, delta):
+        for start, end in intervals:
+            self.range_add(turn + start, turn + end, delta)
+
+def active_intervals(resource_def):
+    """
+    Active stretches of a resource over its lifetime.
+    Returns:
+      List of (start age, end age) pairs.
+    """
+    lifetime, transitions = state_transitions(resource_def)
+    intervals, start, active = [], 0, True
+    for age, now_active in transitions:
+        if active:
+            intervals.append((start, age))
+        start, active = age, now_active
+    if active:
+        intervals.append((start, lifetime))
+    return intervals
+
+class MarginalSolver:
+
+    def __init__(self, initial_budget, resources=None, turns=None, block_size=None, max_bundle=16,
+                 min_return=16):
+        """
+        Prepare the search.
+          - initial_budget: starting budget (int), or a compiled Scenario
+          - resources, turns: resource and turn definitions (when not passing a Scenario)
+          - block_size: turns per block of the PowerCurve (default: about sqrt(number of turns))
+          - max_bundle: largest number of resources bought together to reach TM
+          - min_return: net value, in multiples of the activation cost, a purchase past TM must
+            add. Budget spent early is worth more than its face value, since it also pays for
+            the purchases reaching TM later; lower hurdles overbuy on the shipped inputs.
+        """
+        self.evaluator = PlanEvaluator(initial_budget, resources, turns)
+        scenario = self.evaluator.scenario
+        self.scenario = scenario
+        self.num_turns = scenario.num_turns
+        self.block_size = block_size
+        self.max_bundle = max_bundle
+        self.min_return = min_return
+
+        self.ids = scenario.ids.tolist()
+        self.costs = scenario.activation_cost.tolist()
+        self.periodic_costs = scenario.periodic_cost.tolist()
+        self.powers = scenario.buildings_powered.tolist()
+        self.lifetimes = self.evaluator.lifetimes.tolist()
+        self.intervals = [active_intervals(res_def) for res_def in scenario.resources]
+        # Resources adding power, cheapest first, and in the greedy solvers' order for
+        # the bundles reaching TM.
+        self.candidates = [i for i in sorted(range(len(self.ids)), key=self.costs.__getitem__)
+                           if self.powers[i] > 0]
+        keys = ratio_rank_key(scenario)
+        self.ranked = sorted(self.candidates, key=keys.__getitem__)
+        window = max(self.lifetimes, default=1)
+        self.patterns = np.zeros((len(self.ids), window), dtype=np.int64)
+        for index, timeline in enumerate(self.evaluator.power_timelines):
+            self.patterns[index, :len(timeline)] = timeline
+
+    def upkeep(self, index, turn):
+        return self.periodic_costs[index] * min(self.lifetimes[index], self.num_turns - turn)
+
+    def values(self, curve, turn, affordable):
+        """
+        Net value of buying each affordable resource at turn: the exact profit it adds
+        to the curve minus its maintenance and activation cost.
+        Returns:
+          List of values, one per affordable resource.
+        """
+        if self.patterns.shape[1] <= 2 * curve.block_size:
+            gains = curve.window_gains(turn, self.patterns[affordable]).tolist()
+        else:
+            gains = [curve.pattern_gain(turn, self.intervals[i], self.powers[i]) for i in affordable]
+        return [gain - self.upkeep(i, turn) - self.costs[i] for gain, i in zip(gains, affordable)]
+
+    def bundle(self, curve, turn, budget):
+        """
+        Fill of a turn below TM, the rule of the greedy solvers: the best-ranked affordable
+        resources, added to the curve one at a time until the turn reaches TM. A single
+        resource rarely reaches TM alone, so its exact marginal value is no guide here;
+        like in the greedy solvers, a partial fill is kept and later turns build on it.
+        Returns:
+          List of definition indices added to the curve.
+        """
+        bundle = []
+        TM = self.scenario.TM[turn]
+        for i in self.ranked:
+            if len(bundle) == self.max_bundle:
+                break
+            if self.costs[i] > budget:
+                continue
+            curve.add_pattern(turn, self.intervals[i], self.powers[i])
+            budget -= self.costs[i]
+            bundle.append(i)
+            if curve.values(turn, turn + 1)[0] >= TM:
+                break
+        return bundle
+
+    def solve(self):
+        """
+        At every turn below TM buy the greedy fill, then keep buying the affordable
+        resource with the highest net value while it clears the min_return hurdle.
+        Returns:
+          Purchase plan as a dictionary mapping turn index to resource IDs.
+        """
+        scenario = self.scenario
+        num_turns = self.num_turns
+        curve = PowerCurve(scenario.TM, scenario.TX, scenario.TR, block_size=self.block_size)
+        # Maintenance per turn of the fleet, as a difference array.
+        maintenance = np.zeros(num_turns + 1, dtype=np.int64)
+        budget = scenario.initial_budget
+        purchase_plan = {}
+
+        def buy(i):
+            maintenance[turn] += self.periodic_costs[i]
+            maintenance[min(turn + self.lifetimes[i], num_turns)] -= self.periodic_costs[i]
+            purchase_plan.setdefault(turn, []).append(self.ids[i])
+
+        for turn in range(num_turns):
+            if curve.values(turn, turn + 1)[0] < scenario.TM[turn]:
+                for i in self.bundle(curve, turn, budget):
+                    budget -= self.costs[i]
+                    buy(i)
+            while True:
+                affordable = [i for i in self.candidates if self.costs[i] <= budget]
+                if not affordable:
+                    break
+                values = self.values(curve, turn, affordable)
+                best = max(range(len(affordable)), key=values.__getitem__)
+                if values[best] <= self.min_return * self.costs[affordable[best]]:
+                    break
+                i = affordable[best]
+                budget -= self.costs[i]
+                curve.add_pattern(turn, self.intervals[i], self.powers[i])
+                buy(i)
+            maintenance[turn + 1] += maintenance[turn]
+            budget += int(curve.profit(turn, turn + 1)[0]) - int(maintenance[turn])
+        return purchase_plan
+
+def solve_marginal(initial_budget, resources=None, turns=None, min_return=16):
+    """
+    Greedy solver using PowerCurve as its marginal-gain oracle.
+    """
+    return MarginalSolver(initial_budget, resources, turns, min_return=min_return).solve()
@@ -0,0 +1,157 @@
+# src/profiler.py
+
+"""
+Scenario profiler and solver dispatcher. profile_scenario() computes a few cheap
+features of a compiled scenario (size, relative variation of the turn thresholds,
+efficiency frontier of the catalog, special-effect resources), and choose_solver()
+maps them to a solver and a time budget, so auto mode no longer depends on the input
+file name. Tiny scenarios get the exact search. Every other scenario is annealed;
+the starting plan is a beam search as wide as the frontier calls for on small
+inputs, and past MEDIUM_SIZE the rolling horizon, unless it cannot cover the game in
+its share of the budget and the thresholds are too flat for its lookahead to pay, in
+which case the greedy plan.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from src.resource import state_transitions
+from src.scenario import type_code
+
+# Search size (turns x resources worth buying) up to which the exact search is tried.
+TINY_SIZE = 50
+# Size up to which the beam search still seeds the annealer in well under a second.
+MEDIUM_SIZE = 20_000
+# Size per second of annealing, and the shortest budget given to the annealer.
+SIZE_PER_SECOND = 5_000
+MIN_TIME_LIMIT = 2.0
+# Beam width per resource on the efficiency frontier, and its bounds.
+BEAM_PER_FRONTIER = 8
+MIN_BEAM_WIDTH = 16
+MAX_BEAM_WIDTH = 64
+# Size per second of the rolling horizon (about 10us per resource and turn).
+HORIZON_SIZE_PER_SECOND = 100_000
+# Relative variation (standard deviation over mean) of TM, TX or TR from which the
+# horizon seeds the annealer even when it runs out of time (and plans the rest of the
+# game greedily). Flat generated profiles (0.09) gain under 0.1% over the greedy plan,
+# the shipped inputs (0.20 to 0.31) gain 5 to 30%.
+VARIABLE_PROFILE = 0.15
+
+ScenarioProfile = namedtuple('ScenarioProfile', [
+    'num_turns', 'num_resources', 'size',
+    'tm_variation', 'tx_variation', 'tr_variation',
+    'frontier', 'num_special', 'num_special_unpowered'
+])
+
+Dispatch = namedtuple('Dispatch', ['solver', 'time_limit', 'options', 'reason'])
+
+def lifetime_output(resource_def):
+    """
+    Number of active turns of a resource over its lifetime.
+    """
+    lifetime, transitions = state_transitions(resource_def)
+    active_turns, start, active = 0, 0, True
+    for age, now_active in transitions:
+        if active:
+            active_turns += age - start
+        start, active = age, now_active
+    if active:
+        active_turns += lifetime - start
+    return active_turns
+
+def efficiency_frontier(scenario):
+    """
+    Resources on the efficiency frontier of the catalog: those for which no other
+    resource has a lower or equal total cost (activation plus maintenance over the
+    lifetime) and a higher or equal lifetime output (buildings powered times active
+    turns), one of the two strictly.
+    Returns:
+      Tuple of definition indices, by increasing total cost.
+    """
+    costs, outputs = [], []
+    for resource_def in scenario.resources:
+        lifetime = max(resource_def['lifecycle'], 1)
+        costs.append(resource_def['activation_cost'] + resource_def['periodic_cost'] * lifetime)
+        outputs.append(resource_def['buildings_powered'] * lifetime_output(resource_def))
+
+    frontier = []
+    best_output = None
+    # Cheapest first, and for equal costs the largest output first.
+    for index in sorted(range(len(costs)), key=lambda i: (costs[i], -outputs[i])):
+        if best_output is None or outputs[index] > best_output:
+            frontier.append(index)
+            best_output = outputs[index]
+    return tuple(frontier)
+
+def profile_scenario(scenario):
+    """
+    Compute the features of a compiled scenario used by choose_solver.
+    Returns:
+      ScenarioProfile.
+    """
+    num_turns, num_resources = scenario.num_turns, scenario.num_resources
+    # Standard deviation relative to the mean, so thresholds of any scale compare.
+    variation = lambda values: float(np.std(values) / max(np.mean(values), 1)) if len(values) else 0.0
+    special = scenario.type_codes != type_code('X')
+    return ScenarioProfile(
+        num_turns=num_turns,
+        num_resources=num_resources,
+        size=num_turns * num_resources,
+        tm_variation=variation(scenario.TM),
+        tx_variation=variation(scenario.TX),
+        tr_variation=variation(scenario.TR),
+        frontier=efficiency_frontier(scenario),
+        num_special=int(np.count_nonzero(special)),
+        num_special_unpowered=int(np.count_nonzero(special & (scenario.buildings_powered == 0)))
+    )
+
+def beam_width(profile):
+    """
+    Beam width for a profile: BEAM_PER_FRONTIER states per resource worth buying (on
+    the efficiency frontier), within MIN_BEAM_WIDTH and MAX_BEAM_WIDTH.
+    """
+    return min(MAX_BEAM_WIDTH, max(MIN_BEAM_WIDTH, BEAM_PER_FRONTIER * len(profile.frontier)))
+
+def choose_solver(profile, time_limit=10.0):
+    """
+    Choose a solver for a profiled scenario.
+      - profile: ScenarioProfile from profile_scenario
+      - time_limit: largest time budget in seconds
+    The game engine does not model special effects, so a special-effect resource that
+    powers no building only costs money: the exact search never buys one, and the
+    tiny threshold only counts the other resources. The exact search has no time
+    limit; the budget of its dispatch goes to annealing from a wide beam search if it
+    gives up (see main).
+    Returns:
+      Dispatch with the solver name (as in main's --solver), its time budget, the
+      command-line options to set and a short human-readable reason.
+    """
+    if profile.num_resources == 0 or profile.num_turns == 0:
+        return Dispatch('default', time_limit, {}, "empty scenario")
+    worth_buying = profile.num_resources - profile.num_special_unpowered
+    search_size = profile.num_turns * worth_buying
+    if search_size <= TINY_SIZE:
+        return Dispatch('exact', min(time_limit, MIN_TIME_LIMIT), {'beam_width': MAX_BEAM_WIDTH},
+                        f"tiny scenario ({profile.num_turns} turns, {worth_buying} resources worth "
+                        f"buying, {profile.num_special} with special effects), exact search")
+
+    budget = min(time_limit, max(MIN_TIME_LIMIT, profile.size / SIZE_PER_SECOND))
+    # The beam search seeding the annealer gets half of the budget too, and plays the
+    # turns it has no time left for with the greedy rule (see main).
+    if profile.size <= MEDIUM_SIZE:
+        width = beam_width(profile)
+        return Dispatch('anneal', budget, {'anneal_start': 'beam', 'beam_width': width},
+                        f"medium scenario (size {profile.size}, {len(profile.frontier)} frontier "
+                        f"resources), annealing from a beam search of width {width}")
+
+    variation = max(profile.tm_variation, profile.tx_variation, profile.tr_variation)
+    horizon_seconds = profile.size / HORIZON_SIZE_PER_SECOND
+    # The seed gets half of the budget (see main).
+    if horizon_seconds <= budget / 2 or variation >= VARIABLE_PROFILE:
+        return Dispatch('anneal', budget, {'anneal_start': 'horizon'},
+                        f"large scenario (size {profile.size}, threshold variation {variation:.2f}), "
+                        f"annealing from the rolling horizon")
+    return Dispatch('anneal', budget, {'anneal_start': 'greedy'},
+                    f"large flat scenario (size {profile.size}, threshold variation {variation:.2f}), "
+                    f"annealing from the greedy plan")
@@ -2,9 +2,24 @@
 
 """
 Defines the Resource class, which encapsulates the properties and lifecycle
-of a resource in the challenge.
+of a resource in the challenge, and CompactResource, a slotted variant that
+shares an immutable ResourceDefinition and uses integer states.
 """
 
+from collections import namedtuple
+
+# Integer state codes used by the compact representations.
+DOWNTIME = 0
+ACTIVE = 1
+
+# Absolute turn used for "no further transition".
+NEVER = float('inf')
+
+ResourceDefinition = namedtuple('ResourceDefinition', [
+    'id', 'activation_cost', 'periodic_cost', 'active_duration', 'downtime',
+    'lifecycle', 'buildings_powered', 'resource_type', 'special_effect'
+])
+
 class Resource:
 
     def __init__(self, resource_def):
@@ -72,3 +87,109 @@ class Resource:
         Return the maintenance cost of the resource for the current turn.
         """
         return self.periodic_cost
+
+
+class CompactResource:
+    """
+    Memory-compact resource for simulations with many live assets. Instead of copying
+    the definition fields it keeps a shared reference to an immutable ResourceDefinition,
+    an integer state code and the absolute turn of its next state change.
+    """
+
+    __slots__ = ('definition', 'purchase_turn', 'state', 'expires_at', 'next_transition', 'next_event')
+
+    def __init__(self, definition, purchase_turn):
+        """
+        Create a resource bought at purchase_turn from a ResourceDefinition.
+        """
+        self.definition = definition
+        self.purchase_turn = purchase_turn
+        self.state = ACTIVE
+        self.expires_at = purchase_turn + max(definition.lifecycle, 1)
+        if definition.active_duration > 0:
+            self.next_transition = purchase_turn + definition.active_duration
+        else:
+            self.next_transition = NEVER
+        self.next_event = min(self.next_transition, self.expires_at)
+
+    @property
+    def id(self):
+        return self.definition.id
+
+    def update_state(self, turn_index):
+        """
+        Update the resource state at the end of turn_index, with the same results as
+        Resource.update_state. Turns without a transition only cost one comparison.
+        Returns:
+          True if the resource is still alive, False if it has expired.
+        """
+        next_turn = turn_index + 1
+        if next_turn < self.next_event:
+            return True
+        if next_turn >= self.expires_at:
+            # Resource has reached its end-of-life.
+            return False
+
+        # Switch state; a zero-length state never ends, like in Resource.
+        definition = self.definition
+        if self.state == ACTIVE:
+            self.state = DOWNTIME
+            remaining = definition.downtime
+        else:
+            self.state = ACTIVE
+            age = next_turn - self.purchase_turn
+            remaining = min(definition.active_duration, definition.lifecycle - age)
+        self.next_transition = next_turn + remaining if remaining > 0 else NEVER
+        self.next_event = min(self.next_transition, self.expires_at)
+        return True
+
+    def is_active(self):
+        """
+        Check if the resource is active (i.e., providing power) in the current turn.
+        """
+        return self.state == ACTIVE
+
+    def get_power(self):
+        """
+        Return the number of buildings powered by this resource during this turn.
+        """
+        return self.definition.buildings_powered * self.state
+
+    def get_maintenance_cost(self):
+        """
+        Return the maintenance cost of the resource for the current turn.
+        """
+        return self.definition.periodic_cost
+
+
+def state_transitions(resource_def):
+    """
+    Compute the full state timeline of a resource without stepping it turn by turn.
+    The result mirrors Resource.update_state exactly, including the case where a
+    zero-length state never expires (state_remaining skips past 0).
+    Returns:
+      Tuple (lifetime, transitions) where lifetime is the number of turns the
+      resource stays in play and transitions is a list of (age, is_active) pairs,
+      one for every age > 0 at which the state differs from the previous turn.
+    """
+    lifecycle = resource_def['lifecycle']
+    active_duration = resource_def['active_duration']
+    downtime = resource_def['downtime']
+
+    lifetime = max(lifecycle, 1)
+    transitions = []
+    age = 0
+    active = True
+    remaining = active_duration
+    while remaining > 0:
+        switch_age = age + remaining
+        if switch_age >= lifetime:
+            break
+        active = not active
+        transitions.append((switch_age, active))
+        age = switch_age
+        if active:
+            remaining = min(active_duration, lifecycle - age)
+        else:
+            remaining = downtime
+    return lifetime, transitions
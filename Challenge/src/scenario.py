@@ -0,0 +1,168 @@
+# src/scenario.py
+
+"""
+Defines the Scenario class, an immutable compiled form of a parsed input file.
+It holds an id -> index table, contiguous integer arrays for every resource column,
+per-type index lists and the TM/TX/TR turn arrays, so simulators and solvers can
+avoid linear id lookups and per-access dict hashing in their hot paths.
+"""
+
+from types import MappingProxyType
+
+import numpy as np
+
+from src.resource import ResourceDefinition
+
+# Resource type letters; a resource's type is stored as its index in this tuple.
+RESOURCE_TYPES = ('A', 'B', 'C', 'D', 'E', 'X')
+
+# Code of the letters outside RESOURCE_TYPES: a resource without special effect.
+NEUTRAL_TYPE_CODE = RESOURCE_TYPES.index('X')
+
+# Integer resource columns, in the order of a resource definition line.
+RESOURCE_COLUMNS = (
+    'activation_cost', 'periodic_cost', 'active_duration', 'downtime',
+    'lifecycle', 'buildings_powered', 'special_effect'
+)
+
+def _frozen(values):
+    array = np.ascontiguousarray(values, dtype=np.int64)
+    array.flags.writeable = False
+    return array
+
+class Scenario:
+
+    __slots__ = (
+        'initial_budget', 'ids', 'type_codes', 'TM', 'TX', 'TR',
+        'index_by_id', 'type_indices', '_resources', '_turns', '_definitions'
+    ) + RESOURCE_COLUMNS
+
+    def __init__(self, initial_budget, ids, type_codes, columns, TM, TX, TR,
+                 resources=None, turns=None):
+        """
+        Build a compiled scenario from columnar data.
+          - initial_budget: starting budget (int)
+          - ids, type_codes: per-resource id and type code (index in RESOURCE_TYPES)
+          - columns: dictionary mapping every name in RESOURCE_COLUMNS to per-resource values
+          - TM, TX, TR: per-turn values
+          - resources, turns: optional original lists of dicts (rebuilt on demand otherwise)
+        """
+        assign = object.__setattr__
+        assign(self, 'initial_budget', int(initial_budget))
+        assign(self, 'ids', _frozen(ids))
+        assign(self, 'type_codes', _frozen(type_codes))
+        for name in RESOURCE_COLUMNS:
+            assign(self, name, _frozen(columns[name]))
+        assign(self, 'TM', _frozen(TM))
+        assign(self, 'TX', _frozen(TX))
+        assign(self, 'TR', _frozen(TR))
+
+        # The first definition wins for duplicate ids, like the linear scan in GameSimulator.
+        index_by_id = {}
+        for index, rid in enumerate(self.ids.tolist()):
+            index_by_id.setdefault(rid, index)
+        assign(self, 'index_by_id', MappingProxyType(index_by_id))
+        assign(self, 'type_indices', MappingProxyType({
+            letter: _frozen(np.flatnonzero(self.type_codes == code))
+            for code, letter in enumerate(RESOURCE_TYPES)
+        }))
+        assign(self, '_resources', resources)
+        assign(self, '_turns', turns)
+        assign(self, '_definitions', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Scenario is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Scenario is immutable")
+
+    def __reduce__(self):
+        columns = {name: getattr(self, name) for name in RESOURCE_COLUMNS}
+        return (Scenario, (self.initial_budget, self.ids, self.type_codes, columns,
+                           self.TM, self.TX, self.TR))
+
+    def __iter__(self):
+        """
+        Unpack like the tuple returned by parse_input: (initial_budget, resources, turns).
+        """
+        return iter((self.initial_budget, self.resources, self.turns))
+
+    @property
+    def num_resources(self):
+        return len(self.ids)
+
+    @property
+    def num_turns(self):
+        return len(self.TM)
+
+    @property
+    def resources(self):
+        """
+        Resource definitions as a list of dicts, in the parse_input format.
+        """
+        if self._resources is None:
+            columns = [getattr(self, name).tolist() for name in RESOURCE_COLUMNS]
+            resources = []
+            for rid, code, values in zip(self.ids.tolist(), self.type_codes.tolist(), zip(*columns)):
+                resource = {'id': rid}
+                resource.update(zip(RESOURCE_COLUMNS, values))
+                resource['resource_type'] = RESOURCE_TYPES[code]
+                resources.append(resource)
+            object.__setattr__(self, '_resources', resources)
+        return self._resources
+
+    @property
+    def definitions(self):
+        """
+        Resource definitions as a tuple of immutable ResourceDefinition records,
+        shared by every CompactResource bought from them.
+        """
+        if self._definitions is None:
+            definitions = tuple(
+                ResourceDefinition(**{field: r[field] for field in ResourceDefinition._fields})
+                for r in self.resources
+            )
+            object.__setattr__(self, '_definitions', definitions)
+        return self._definitions
+
+    @property
+    def turns(self):
+        """
+        Turn definitions as a list of dicts with keys 'TM', 'TX', 'TR'.
+        """
+        if self._turns is None:
+            turns = [{'TM': tm, 'TX': tx, 'TR': tr}
+                     for tm, tx, tr in zip(self.TM.tolist(), self.TX.tolist(), self.TR.tolist())]
+            object.__setattr__(self, '_turns', turns)
+        return self._turns
+
+def type_code(letter):
+    """
+    Return the integer code of a resource type letter. The simulator accepts any
+    letter, so a letter outside RESOURCE_TYPES gets NEUTRAL_TYPE_CODE.
+    """
+    try:
+        return RESOURCE_TYPES.index(letter)
+    except ValueError:
+        return NEUTRAL_TYPE_CODE
+
+def compile_scenario(initial_budget, resources=None, turns=None):
+    """
+    Compile the (initial_budget, resources, turns) triple returned by parse_input into a
+    Scenario. A Scenario passed as the first argument is returned unchanged, so every
+    function taking the triple can also take a compiled scenario directly.
+    """
+    if isinstance(initial_budget, Scenario):
+        return initial_budget
+    columns = {name: [r[name] for r in resources] for name in RESOURCE_COLUMNS}
+    return Scenario(
+        initial_budget,
+        [r['id'] for r in resources],
+        [type_code(r['resource_type']) for r in resources],
+        columns,
+        [turn['TM'] for turn in turns],
+        [turn['TX'] for turn in turns],
+        [turn['TR'] for turn in turns],
+        resources=resources,
+        turns=turns
+    )
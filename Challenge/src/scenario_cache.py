@@ -0,0 +1,161 @@
+# src/scenario_cache.py
+
+"""
+On-disk cache of compiled scenarios. An entry is a directory named after the
+format version and the SHA-256 of the input file, holding one .npy file per
+Scenario column and a small JSON header. Loading maps the columns read-only
+with np.load(mmap_mode='r'), so a cached scenario costs a hash of the input
+and no parsing or copying. Entries are written to a temporary directory and
+renamed into place, and the least recently used ones are evicted once the
+cache exceeds its size limit.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+
+from src.columnar_parser import parse_columnar
+from src.scenario import RESOURCE_COLUMNS, Scenario
+
+# Bump when the layout of an entry changes; older entries are then ignored and evicted.
+FORMAT_VERSION = 1
+DEFAULT_CACHE_DIR = ".scenario_cache"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+ARRAY_COLUMNS = ('ids', 'type_codes', 'TM', 'TX', 'TR') + RESOURCE_COLUMNS
+HEADER_FILE = "scenario.json"
+
+def file_digest(path, block_size=1 << 20):
+    """
+    SHA-256 hex digest of a file, read in blocks.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class ScenarioCache:
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Open a cache directory (created on the first store).
+          - directory: where the entries are kept
+          - max_bytes: total size of the entries above which the least recently used are evicted
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def key(self, path):
+        return f"v{FORMAT_VERSION}-{file_digest(path)}"
+
+    def _entry(self, key):
+        return os.path.join(self.directory, key)
+
+    def load(self, key):
+        """
+        Memory-map a cached scenario.
+        Returns:
+          Scenario, or None if the entry is missing or unreadable.
+        """
+        entry = self._entry(key)
+        try:
+            with open(os.path.join(entry, HEADER_FILE)) as f:
+                header = json.load(f)
+            arrays = {name: np.load(os.path.join(entry, f"{name}.npy"), mmap_mode='r')
+                      for name in ARRAY_COLUMNS}
+            # Mark the entry as recently used for eviction.
+            os.utime(entry)
+        except (OSError, ValueError):
+            return None
+        if header.get('format_version') != FORMAT_VERSION:
+            return None
+        columns = {name: arrays[name] for name in RESOURCE_COLUMNS}
+        return Scenario(header['initial_budget'], arrays['ids'], arrays['type_codes'], columns,
+                        arrays['TM'], arrays['TX'], arrays['TR'])
+
+    def store(self, key, scenario):
+        """
+        Write a scenario entry, atomically, then evict down to max_bytes.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        entry = self._entry(key)
+        temp_entry = f"{entry}.tmp{os.getpid()}"
+        try:
+            os.makedirs(temp_entry, exist_ok=True)
+            for name in ARRAY_COLUMNS:
+                np.save(os.path.join(temp_entry, f"{name}.npy"), getattr(scenario, name))
+            with open(os.path.join(temp_entry, HEADER_FILE), 'w') as f:
+                json.dump({'format_version': FORMAT_VERSION, 'initial_budget': scenario.initial_budget,
+                           'num_resources': scenario.num_resources, 'num_turns': scenario.num_turns}, f)
+            try:
+                os.rename(temp_entry, entry)
+            except OSError:
+                # Another process stored the same entry first.
+                pass
+        finally:
+            shutil.rmtree(temp_entry, ignore_errors=True)
+        self.evict()
+
+    def entries(self):
+        """
+        Cached entries as (last use time, size in bytes, path), least recently used first.
+        Temporary directories of writes in progress are left out.
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if '.tmp' in name or not os.path.isdir(path):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+            entries.append((os.stat(path).st_mtime, size, path))
+        return sorted(entries)
+
+    def evict(self, max_bytes=None):
+        """
+        Remove the least recently used entries until the cache fits in max_bytes
+        (default: the cache's limit). Entries of another format version go first.
+        Returns:
+          Number of entries removed.
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        prefix = f"v{FORMAT_VERSION}-"
+        entries = sorted(self.entries(), key=lambda e: (os.path.basename(e[2]).startswith(prefix), e[0]))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= max_bytes and os.path.basename(path).startswith(prefix):
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def parse(self, path):
+        """
+        Compiled scenario of an input file: from the cache when present, parsed with
+        parse_columnar and stored otherwise. A cache that cannot be written is skipped.
+        """
+        key = self.key(path)
+        scenario = self.load(key)
+        if scenario is None:
+            scenario = parse_columnar(path)
+            try:
+                self.store(key, scenario)
+            except OSError:
+                pass
+        return scenario
+
+def load_scenario(path, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Parse an input file into a Scenario through the cache in cache_dir, or directly
+    when cache_dir is None.
+    """
+    if cache_dir is None:
+        return parse_columnar(path)
+    return ScenarioCache(cache_dir, max_bytes).parse(path)
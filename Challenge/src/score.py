@@ -0,0 +1,196 @@
+# src/score.py
+
+"""
+Score saved output files without re-running a solver.
+Usage:
+    python -m src.score <output_file> <input_file>
+    python -m src.score <output_dir> [--input-dir DIR] [--workers N]
+    python -m src.score <output_dir> --diff <other_output_dir> [--input-dir DIR] [--workers N]
+An output file is streamed line by line and checked against the output format
+("t Rt RI1 ... RIRt", turns increasing), then replayed with the closed-form
+PlanEvaluator. The report gives the final budget and the first infeasible turn,
+a purchase the budget cannot cover. outputN.txt is matched with the input file
+whose name starts with "N-". Directories are scored in parallel, one process per file.
+"""
+
+import argparse
+import glob
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from src.plan_evaluator import PlanEvaluator
+from src.scenario_cache import DEFAULT_CACHE_DIR, load_scenario
+
+DEFAULT_INPUT_DIR = "data/input_files"
+
+class OutputFormatError(ValueError):
+    """
+    An output file line that does not follow the output format.
+    """
+
+    def __init__(self, path, line_number, message):
+        super().__init__(f"{path}:{line_number}: {message}")
+        self.path = path
+        self.line_number = line_number
+
+def read_output(path, num_turns=None):
+    """
+    Stream the purchases of an output file.
+      - path: output file
+      - num_turns: turns of the matching input, to reject purchases past the last one
+    Yields:
+      (turn, resource ids) for every non-blank line.
+    Raises:
+      OutputFormatError on a malformed line or a turn not after the previous one.
+    """
+    previous_turn = None
+    with open(path) as f:
+        for line_number, line in enumerate(f, 1):
+            parts = line.split()
+            if not parts:
+                continue
+            try:
+                turn, count, *resource_ids = map(int, parts)
+            except ValueError:
+                raise OutputFormatError(path, line_number, "expected integers") from None
+            if count != len(resource_ids) or count == 0:
+                raise OutputFormatError(path, line_number,
+                                        f"count {count} but {len(resource_ids)} resource ids")
+            if turn < 0 or (previous_turn is not None and turn <= previous_turn):
+                raise OutputFormatError(path, line_number, f"turn {turn} out of order")
+            if num_turns is not None and turn >= num_turns:
+                raise OutputFormatError(path, line_number, f"turn {turn} past the last turn {num_turns - 1}")
+            previous_turn = turn
+            yield turn, resource_ids
+
+def score_output(output_path, input_path, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Validate and replay one output file against its input.
+    Returns:
+      Dictionary with 'output', 'input', 'final_budget' (None if the file is malformed),
+      'purchases', 'first_infeasible_turn', 'failed_turns' and 'errors' (list of messages).
+    """
+    report = {'output': output_path, 'input': input_path, 'final_budget': None, 'purchases': 0,
+              'first_infeasible_turn': None, 'failed_turns': [], 'errors': []}
+    scenario = load_scenario(input_path, cache_dir=cache_dir)
+    purchase_plan = {}
+    try:
+        for turn, resource_ids in read_output(output_path, scenario.num_turns):
+            purchase_plan[turn] = resource_ids
+    except (OSError, OutputFormatError) as error:
+        report['errors'].append(str(error))
+        return report
+
+    unknown = sorted({rid for ids in purchase_plan.values() for rid in ids} - set(scenario.index_by_id))
+    if unknown:
+        report['errors'].append(f"unknown resource ids {unknown}")
+    result = PlanEvaluator(scenario).evaluate(purchase_plan)
+    report['final_budget'] = result['final_budget']
+    report['purchases'] = sum(len(ids) for ids in purchase_plan.values())
+    report['failed_turns'] = result['failed_turns']
+    if result['failed_turns']:
+        report['first_infeasible_turn'] = result['failed_turns'][0]
+    return report
+
+def match_input(output_path, input_dir=DEFAULT_INPUT_DIR):
+    """
+    Input file of outputN.txt: the file of input_dir whose name starts with "N-".
+    Returns:
+      Path, or None if there is no single match.
+    """
+    name = os.path.splitext(os.path.basename(output_path))[0]
+    number = name[len("output"):] if name.startswith("output") else name
+    matches = glob.glob(os.path.join(input_dir, f"{number}-*.txt"))
+    return matches[0] if len(matches) == 1 else None
+
+def _score_task(task):
+    output_path, input_path, cache_dir = task
+    if input_path is None:
+        return {'output': output_path, 'input': None, 'final_budget': None, 'purchases': 0,
+                'first_infeasible_turn': None, 'failed_turns': [], 'errors': ["no matching input file"]}
+    return score_output(output_path, input_path, cache_dir)
+
+def score_directory(output_dir, input_dir=DEFAULT_INPUT_DIR, workers=None, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Score every output*.txt file of a directory in parallel.
+    Returns:
+      Dictionary mapping output file name to its score_output report, by file name.
+    """
+    outputs = sorted(glob.glob(os.path.join(output_dir, "output*.txt")))
+    tasks = [(path, match_input(path, input_dir), cache_dir) for path in outputs]
+    if workers == 0 or len(tasks) <= 1:
+        reports = map(_score_task, tasks)
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            reports = list(executor.map(_score_task, tasks))
+    return {os.path.basename(report['output']): report for report in reports}
+
+def diff_runs(first, second):
+    """
+    Compare the reports of two score_directory runs.
+    Returns:
+      List of (file name, first final budget, second final budget, difference), None
+      where a run has no valid score for the file.
+    """
+    rows = []
+    for name in sorted(set(first) | set(second)):
+        a = first.get(name, {}).get('final_budget')
+        b = second.get(name, {}).get('final_budget')
+        rows.append((name, a, b, None if a is None or b is None else b - a))
+    return rows
+
+def _format_report(report):
+    name = os.path.basename(report['output'])
+    if report['final_budget'] is None:
+        return f"{name:<14} {'invalid':>14}  {'; '.join(report['errors'])}"
+    line = f"{name:<14} {report['final_budget']:>14} {report['purchases']:>9}"
+    if report['first_infeasible_turn'] is not None:
+        line += (f"  first infeasible turn {report['first_infeasible_turn']} "
+                 f"({len(report['failed_turns'])} turns dropped)")
+    if report['errors']:
+        line += "  " + "; ".join(report['errors'])
+    return line
+
+def main():
+    parser = argparse.ArgumentParser(description="Score saved output files of the challenge")
+    parser.add_argument("output", help="Output file, or directory of outputN.txt files")
+    parser.add_argument("input", nargs="?", help="Input file of a single output file "
+                                                 "(default: matched in --input-dir)")
+    parser.add_argument("--input-dir", default=DEFAULT_INPUT_DIR,
+                        help=f"Directory of the input files (default: {DEFAULT_INPUT_DIR})")
+    parser.add_argument("--diff", metavar="OTHER_DIR",
+                        help="Compare the scores of the output directory with another one")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Scoring processes (default: one per CPU; 0 scores in-process)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Parse input files without the compiled scenario cache")
+    args = parser.parse_args()
+    cache_dir = None if args.no_cache else DEFAULT_CACHE_DIR
+
+    if not os.path.isdir(args.output):
+        input_path = args.input or match_input(args.output, args.input_dir)
+        if input_path is None:
+            print(f"No input file found for {args.output}; pass it as the second argument.")
+            sys.exit(2)
+        report = score_output(args.output, input_path, cache_dir)
+        print(_format_report(report))
+        sys.exit(1 if report['errors'] else 0)
+
+    reports = score_directory(args.output, args.input_dir, args.workers, cache_dir)
+    if args.diff:
+        other = score_directory(args.diff, args.input_dir, args.workers, cache_dir)
+        print(f"{'file':<14} {os.path.basename(os.path.normpath(args.output)):>16} "
+              f"{os.path.basename(os.path.normpath(args.diff)):>16} {'difference':>14}")
+        for name, a, b, difference in diff_runs(reports, other):
+            cells = ["-" if value is None else str(value) for value in (a, b, difference)]
+            print(f"{name:<14} {cells[0]:>16} {cells[1]:>16} {cells[2]:>14}")
+        reports = {**reports, **{f"{args.diff}:{name}": report for name, report in other.items()}}
+    else:
+        print(f"{'file':<14} {'final budget':>14} {'purchases':>9}")
+        for report in reports.values():
+            print(_format_report(report))
+    sys.exit(1 if any(report['errors'] for report in reports.values()) else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# src/trace.py
+
+"""
+Trace sinks receive the per-turn summary (budget, power, profit, maintenance) of a
+simulation. They replace the unconditional per-turn print() in run_simulation, so
+production runs only pay for the trace they actually ask for.
+"""
+
+import sys
+from abc import ABC, abstractmethod
+from array import array
+from collections import deque
+
+import numpy as np
+
+TRACE_FIELDS = ('turn', 'budget', 'power', 'profit', 'maintenance')
+
+class TraceSink(ABC):
+    """
+    Base class of all sinks. record() is called once per simulated turn and
+    close() once the simulation is over.
+    """
+
+    @abstractmethod
+    def record(self, turn, budget, power, profit, maintenance):
+        """
+        Record the summary of one turn.
+        """
+
+    def record_many(self, turns, budget, power, profit, maintenance):
+        """
+        Record many turns at once from parallel sequences (used by array-based evaluators).
+        """
+        for row in zip(turns, budget, power, profit, maintenance):
+            self.record(*(int(value) for value in row))
+
+    def close(self):
+        pass
+
+class NullTraceSink(TraceSink):
+    """
+    Discards everything. This is the default sink.
+    """
+
+    def record(self, turn, budget, power, profit, maintenance):
+        pass
+
+    def record_many(self, turns, budget, power, profit, maintenance):
+        pass
+
+class PrintTraceSink(TraceSink):
+    """
+    Prints one line per turn, like the old debug output of run_simulation.
+    """
+
+    def record(self, turn, budget, power, profit, maintenance):
+        print(f"Turn {turn}: budget={budget} power={power} profit={profit} maintenance={maintenance}")
+
+class RingBufferTraceSink(TraceSink):
+    """
+    Keeps only the last `size` turns in memory.
+    """
+
+    def __init__(self, size):
+        self.buffer = deque(maxlen=size)
+
+    def record(self, turn, budget, power, profit, maintenance):
+        self.buffer.append((turn, budget, power, profit, maintenance))
+
+    def summaries(self):
+        """
+        Return the buffered turns as dictionaries, oldest first.
+        """
+        return [dict(zip(TRACE_FIELDS, row)) for row in self.buffer]
+
+class ArrayTraceSink(TraceSink):
+    """
+    Stores budget, power, profit and maintenance as columnar int64 arrays indexed by turn.
+    If a path is given, the columns are saved to it as .npz on close().
+    """
+
+    def __init__(self, num_turns, path=None):
+        self.path = path
+        self.budget = np.zeros(num_turns, dtype=np.int64)
+        self.power = np.zeros(num_turns, dtype=np.int64)
+        self.profit = np.zeros(num_turns, dtype=np.int64)
+        self.maintenance = np.zeros(num_turns, dtype=np.int64)
+
+    def record(self, turn, budget, power, profit, maintenance):
+        self.budget[turn] = budget
+        self.power[turn] = power
+        self.profit[turn] = profit
+        self.maintenance[turn] = maintenance
+
+    def record_many(self, turns, budget, power, profit, maintenance):
+        self.budget[turns] = budget
+        self.power[turns] = power
+        self.profit[turns] = profit
+        self.maintenance[turns] = maintenance
+
+    def close(self):
+        if self.path:
+            np.savez(self.path, budget=self.budget, power=self.power,
+                     profit=self.profit, maintenance=self.maintenance)
+
+class FileTraceSink(TraceSink):
+    """
+    Streams the trace to a file, either as CSV (one header line, then one line per turn)
+    or as binary records of five little-endian int64 values (turn, budget, power,
+    profit, maintenance). Records are buffered and written in chunks.
+    """
+
+    def __init__(self, path, binary=False, chunk_size=4096):
+        self.binary = binary
+        self.chunk_size = chunk_size
+        self.file = open(path, 'wb' if binary else 'w')
+        self.pending = array('q') if binary else []
+        if not binary:
+            self.file.write(",".join(TRACE_FIELDS) + "\n")
+
+    def record(self, turn, budget, power, profit, maintenance):
+        if self.binary:
+            self.pending.extend((turn, budget, power, profit, maintenance))
+            if len(self.pending) >= self.chunk_size * len(TRACE_FIELDS):
+                self.flush()
+        else:
+            self.pending.append(f"{turn},{budget},{power},{profit},{maintenance}\n")
+            if len(self.pending) >= self.chunk_size:
+                self.flush()
+
+    def flush(self):
+        if self.binary:
+            if sys.byteorder == 'big':
+                self.pending.byteswap()
+            self.pending.tofile(self.file)
+            self.pending = array('q')
+        else:
+            self.file.writelines(self.pending)
+            self.pending = []
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+def make_trace_sink(spec, num_turns):
+    """
+    Build a trace sink from a command-line specification:
+      none | print | ring:N | arrays:PATH.npz | csv:PATH | binary:PATH
+    """
+    kind, _, argument = spec.partition(':')
+    if kind == 'none':
+        return NullTraceSink()
+    if kind == 'print':
+        return PrintTraceSink()
+    if kind == 'ring':
+        return RingBufferTraceSink(int(argument) if argument else 10)
+    if kind == 'arrays':
+        return ArrayTraceSink(num_turns, argument or None)
+    if kind in ('csv', 'binary') and argument:
+        return FileTraceSink(argument, binary=(kind == 'binary'))
+    raise ValueError(f"Invalid trace specification: {spec!r}")
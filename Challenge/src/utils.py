@@ -6,7 +6,9 @@ Utility functions for parsing input and writing output.
 
 import os
 
-def parse_input(file_path):
+from src.columnar_parser import parse_columnar
+
+def parse_input(file_path, compiled=False):
     """
     Parse the challenge input file.
     Expected format:
@@ -14,8 +16,13 @@ def parse_input(file_path):
       - Next R lines: resource definitions
       - Next T lines: turn definitions
     Returns:
-      initial_budget (int), resources (list of dict), turns (list of dict)
+      initial_budget (int), resources (list of dict), turns (list of dict),
+      or an immutable compiled Scenario if compiled is True. The compiled form is
+      read by parse_columnar, which also accepts bytes, streams and mmaps.
     """
+    if compiled:
+        return parse_columnar(file_path)
+
     with open(file_path, 'r') as f:
         lines = [line.strip() for line in f if line.strip()]
     
@@ -36,7 +43,7 @@ def parse_input(file_path):
     for i in range(1 + num_resources, 1 + num_resources + num_turns):
         turn = parse_turn_line(lines[i])
         turns.append(turn)
-    
+
     return initial_budget, resources, turns
 
 def parse_resource_line(line):
@@ -86,8 +93,16 @@ def write_output(file_path, purchase_plan):
     Each output line has the format:
       t Rt RI1 RI2 ... RIRt
     where t is the turn number and Rt is the count of resources purchased in that turn.
+    The file is written to a temporary file next to it and renamed into place, so
+    readers (and a run killed mid-write) never see a partial output.
     """
-    with open(file_path, 'w') as f:
-        for turn, resources in purchase_plan:
-            line = f"{turn} {len(resources)} " + " ".join(map(str, resources))
-            f.write(line + "\n")
+    temp_path = f"{file_path}.tmp{os.getpid()}"
+    try:
+        with open(temp_path, 'w') as f:
+            for turn, resources in purchase_plan:
+                line = f"{turn} {len(resources)} " + " ".join(map(str, resources))
+                f.write(line + "\n")
+        os.replace(temp_path, file_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
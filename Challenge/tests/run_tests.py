@@ -1,42 +1,122 @@
+# tests/run_tests.py
+
+"""
+Batch runner: solve every input file into a new timestamped output directory.
+Usage:
+    python tests/run_tests.py [--solver SOLVER] [--workers N] [--time-limit SECONDS]
+                              [--input-dir DIR] [--output-dir DIR]
+The inputs are solved in a process pool whose workers import the solver code once,
+largest input first so the longest runs do not end up last. The CPUs are shared
+between the runs: each run's own processes (the portfolio race, the ga fitness
+pool) get cpu_count() // workers of them. The console output
+of each run goes to outputN.log next to outputN.txt, and the batch ends with a
+table of file, solver, score, solve time and simulation time.
+"""
+
+import argparse
+import contextlib
 import os
+import sys
 import time
-import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 
+# Run as a script from the repository root: make the src package importable.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.main import SOLVER_CHOICES, build_parser, run
+
 def create_timestamped_dir(base_dir):
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     output_dir = os.path.join(base_dir, timestamp)
     os.makedirs(output_dir, exist_ok=True)
     return output_dir
 
-def run_tests(input_dir, base_output_dir):
+def solve_input(input_path, output_path, solver, time_limit=None, run_workers=None):
+    """
+    Solve one input file in this process, logging its console output to the output
+    path with a .log extension. run_workers is passed as --workers, the number of
+    processes of the portfolio and ga solvers.
+    Returns:
+      Dictionary with 'file', 'solver', 'final_budget', 'solve_time', 'simulation_time'
+      and 'error' (None, or the message of the exception that ended the run).
+    """
+    argv = [input_path, output_path, "--solver", solver]
+    if time_limit is not None:
+        argv += ["--time-limit", str(time_limit)]
+    if run_workers is not None:
+        argv += ["--workers", str(run_workers)]
+    result = {'file': os.path.basename(input_path), 'solver': solver, 'final_budget': None,
+              'solve_time': None, 'simulation_time': None, 'error': None}
+    start = time.perf_counter()
+    with open(os.path.splitext(output_path)[0] + ".log", 'w') as log, contextlib.redirect_stdout(log):
+        try:
+            result.update(run(build_parser().parse_args(argv)))
+        except (Exception, SystemExit) as error:
+            result['error'] = f"{type(error).__name__}: {error}"
+            result['solve_time'] = time.perf_counter() - start
+    return result
+
+def format_table(results):
+    """
+    Table of the batch results, by input file name.
+    """
+    lines = [f"{'file':<22} {'solver':<10} {'score':>12} {'solve (s)':>10} {'sim (s)':>9}"]
+    for result in sorted(results, key=lambda r: r['file']):
+        score = "error" if result['error'] else result['final_budget']
+        simulation_time = result['simulation_time']
+        simulation = "-" if simulation_time is None else f"{simulation_time:.3f}"
+        lines.append(f"{result['file']:<22} {result['solver']:<10} {score:>12} "
+                     f"{result['solve_time']:>10.2f} {simulation:>9}")
+    return "\n".join(lines)
+
+def run_tests(input_dir, base_output_dir, solver="portfolio", workers=None, time_limit=None):
+    """
+    Solve every .txt input of input_dir into a new timestamped directory of base_output_dir.
+    Returns:
+      Tuple (output directory, list of solve_input results).
+    """
     output_dir = create_timestamped_dir(base_output_dir)
-    input_files = sorted(f for f in os.listdir(input_dir) if f.endswith(".txt"))
-    
-    for input_file in input_files:
-        input_path = os.path.join(input_dir, input_file)
-        output_filename = f"output{input_file.split('-')[0]}.txt"
-        output_path = os.path.join(output_dir, output_filename)
-        
-        print(f"\nRunning test for {input_file}...")
-        
-        # Auto mode
-        # subprocess.run(["python", "-m", "src.main", input_path, output_path])
-        
-        # Force default solver
-        # subprocess.run(["python", "-m", "src.main", input_path, output_path, "--solver", "default"])
-        
-        # Force dedicated solver
-        subprocess.run(["python", "-m", "src.main", input_path, output_path, "--solver", "dedicated"])
-        
-        print(f"\nTest completed for {input_file}. Results stored in {output_path}\n")
+    input_files = [f for f in os.listdir(input_dir) if f.endswith(".txt")]
+    # Largest inputs first: the longest runs start right away.
+    input_files.sort(key=lambda f: (-os.path.getsize(os.path.join(input_dir, f)), f))
+
+    cpus = os.cpu_count() or 1
+    workers = workers or min(cpus, len(input_files)) or 1
+    run_workers = max(1, cpus // workers)
+
+    results = []
+    with ProcessPoolExecutor(workers) as executor:
+        futures = {}
+        for input_file in input_files:
+            output_path = os.path.join(output_dir, f"output{input_file.split('-')[0]}.txt")
+            future = executor.submit(solve_input, os.path.join(input_dir, input_file), output_path,
+                                     solver, time_limit, run_workers)
+            futures[future] = output_path
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            status = result['error'] or f"score {result['final_budget']}"
+            print(f"{result['file']}: {status} ({result['solve_time']:.2f}s) -> {futures[future]}")
+    return output_dir, results
 
 def main():
-    input_dir = "data/input_files"
-    output_base_dir = "data/output_files"
-    
-    run_tests(input_dir, output_base_dir)
-    print("All tests completed.")
+    parser = argparse.ArgumentParser(description="Solve all input files in parallel")
+    parser.add_argument("--solver", default="portfolio", choices=SOLVER_CHOICES,
+                        help="Solver of every run (default: portfolio)")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel runs (default: one per CPU, at most one per input)")
+    parser.add_argument("--time-limit", type=float, default=None,
+                        help="Time limit of every run (default: the solver's)")
+    parser.add_argument("--input-dir", default="data/input_files", help="Directory of the input files")
+    parser.add_argument("--output-dir", default="data/output_files",
+                        help="Directory in which the timestamped output directory is created")
+    args = parser.parse_args()
+
+    output_dir, results = run_tests(args.input_dir, args.output_dir, args.solver, args.workers,
+                                    args.time_limit)
+    print(f"\nAll tests completed. Results stored in {output_dir}\n")
+    print(format_table(results))
+    sys.exit(1 if any(result['error'] for result in results) else 0)
 
 if __name__ == "__main__":
     main()
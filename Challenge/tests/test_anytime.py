@@ -0,0 +1,81 @@
+# tests/test_anytime.py
+
+"""
+Unit tests for the anytime solver protocol.
+"""
+
+import contextlib
+import io
+import os
+import signal
+import tempfile
+import unittest
+from unittest import mock
+
+from src.utils import parse_input
+from src.anytime import StopCondition, one_shot, run_anytime
+from src.challenge_solver import solve_game, solve_game_default
+from src.anneal_solver import AnnealSolver
+from src.beam_solver import solve_beam
+from src.main import build_parser, run
+from src.plan_evaluator import PlanEvaluator
+
+class TestAnytime(unittest.TestCase):
+
+    def setUp(self):
+        self.scenario = parse_input("data/input_files/2-attenborough.txt", compiled=True)
+        self.directory = tempfile.TemporaryDirectory()
+        self.output_file = os.path.join(self.directory.name, "output.txt")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_keeps_best_plan(self):
+        written = []
+        def plans():
+            for plan in (solve_game_default(self.scenario), solve_game(self.scenario), {}):
+                yield plan
+                with open(self.output_file) as f:
+                    written.append(f.read())
+        best_plan, best_score, improvements = run_anytime(self.scenario, plans(), self.output_file)
+        self.assertEqual(best_plan, solve_game(self.scenario))
+        self.assertEqual(improvements, 2)
+        # The worse last plan did not overwrite the file, and no temporary file is left.
+        self.assertEqual(written[1], written[2])
+        self.assertEqual(os.listdir(self.directory.name), ["output.txt"])
+
+    def test_stops_on_signal(self):
+        with StopCondition() as stop:
+            self.assertFalse(stop())
+            os.kill(os.getpid(), signal.SIGINT)
+            self.assertTrue(stop())
+        self.assertEqual(stop.signal_received, signal.SIGINT)
+
+    def test_generator_closed_when_stopping(self):
+        annealer = AnnealSolver(self.scenario, report_interval=0.01)
+        plans = annealer.iterate(time_limit=60, should_stop=lambda: True)
+        best_plan, best_score, _ = run_anytime(self.scenario, plans, self.output_file, lambda: True)
+        self.assertIsNotNone(best_plan)
+        self.assertLess(annealer.moves, 10000)
+
+    def test_signal_while_seeding_the_annealer(self):
+        # A signal during the (slow) starting plan stops the run with the best plan on disk.
+        def interrupted_beam(*args, **kwargs):
+            os.kill(os.getpid(), signal.SIGINT)
+            return solve_beam(*args, **kwargs)
+        input_file = "data/input_files/2-attenborough.txt"
+        args = build_parser().parse_args([input_file, self.output_file, "--solver", "anneal",
+                                          "--anneal-start", "beam", "--time-limit", "60", "--no-cache"])
+        with mock.patch("src.main.solve_beam", interrupted_beam), \
+                contextlib.redirect_stdout(io.StringIO()) as output:
+            result = run(args)
+        self.assertIn("Stopped by signal", output.getvalue())
+        self.assertLess(result['solve_time'], 30)
+        greedy_score = PlanEvaluator(self.scenario).evaluate(solve_game(self.scenario))['final_budget']
+        self.assertGreaterEqual(result['final_budget'], greedy_score)
+
+    def test_one_shot(self):
+        self.assertEqual(list(one_shot(solve_game, self.scenario)), [solve_game(self.scenario)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+# tests/test_columnar_parser.py
+
+"""
+Unit tests for the columnar input parser.
+"""
+
+import glob
+import io
+import mmap
+import unittest
+
+import numpy as np
+
+from src.utils import parse_input
+from src.scenario import RESOURCE_COLUMNS, compile_scenario
+from src.columnar_parser import parse_columnar, parse_int_block
+
+INPUT_FILES = sorted(glob.glob("data/input_files/*.txt"))
+
+class TestColumnarParser(unittest.TestCase):
+
+    def assertSameScenario(self, scenario, expected):
+        self.assertEqual(scenario.initial_budget, expected.initial_budget)
+        for name in ('ids', 'type_codes', 'TM', 'TX', 'TR') + RESOURCE_COLUMNS:
+            np.testing.assert_array_equal(getattr(scenario, name), getattr(expected, name), err_msg=name)
+
+    def test_sources_match_parse_input(self):
+        for input_file in INPUT_FILES:
+            expected = compile_scenario(*parse_input(input_file))
+            with open(input_file, 'rb') as f:
+                raw = f.read()
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            sources = {
+                'path': input_file, 'bytes': raw, 'binary stream': io.BytesIO(raw),
+                'text stream': io.StringIO(raw.decode()), 'mmap': mapped,
+            }
+            for kind, source in sources.items():
+                with self.subTest(input_file=input_file, source=kind):
+                    self.assertSameScenario(parse_columnar(source), expected)
+            with self.subTest(input_file=input_file, source='small chunks'):
+                self.assertSameScenario(parse_columnar(raw, chunk_size=16), expected)
+            mapped.close()
+
+    def test_irregular_turn_block(self):
+        # Blank lines, an extra field and a trailing line: only the first three fields of
+        # the first T lines count, like in parse_input.
+        text = "10 1 3\n\n1 5 1 1 1 3 2 X\n3 5 4\n\n4 6 3 99\n2 7 1\ntrailing line\n"
+        scenario = parse_columnar(text.encode())
+        self.assertEqual(scenario.special_effect.tolist(), [0])
+        self.assertEqual(scenario.TM.tolist(), [3, 4, 2])
+        self.assertEqual(scenario.TX.tolist(), [5, 6, 7])
+        self.assertEqual(scenario.TR.tolist(), [4, 3, 1])
+        with self.assertRaises(ValueError):
+            parse_columnar(b"10 1 3\n1 5 1 1 1 3 2 X\n3 5 4\n")
+
+    def test_parse_int_block(self):
+        values, lines = parse_int_block(b"12 -3\r\n\n 0 999999999999999999\n", with_lines=True)
+        self.assertEqual(values.tolist(), [12, -3, 0, 999999999999999999])
+        self.assertEqual(lines.tolist(), [0, 0, 2, 2])
+        with self.assertRaises(ValueError):
+            parse_int_block(b"1 2 X")
+
+if __name__ == "__main__":
+    unittest.main()
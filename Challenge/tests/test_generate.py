@@ -0,0 +1,91 @@
+# tests/test_generate.py
+
+"""
+Unit tests for the synthetic input generator.
+"""
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import src.generate
+from src.columnar_parser import parse_columnar
+from src.generate import (Distribution, GeneratorConfig, generate, parse_distribution, parse_type_mix,
+                          turn_profile, write_scenario)
+from src.plan_evaluator import PlanEvaluator
+from src.utils import parse_input
+
+def generated(num_turns, num_resources, seed=0, config=GeneratorConfig()):
+    f = io.StringIO()
+    write_scenario(f, num_turns, num_resources, seed, config)
+    return f.getvalue()
+
+class TestGenerate(unittest.TestCase):
+
+    def test_output_parses(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "input.txt")
+            generate(path, 500, 60, seed=3)
+            initial_budget, resources, turns = parse_input(path)
+            scenario = parse_columnar(path)
+        finally:
+            shutil.rmtree(directory)
+        self.assertEqual(initial_budget, 1000)
+        self.assertEqual(len(resources), 60)
+        self.assertEqual(len(turns), 500)
+        self.assertEqual(scenario.resources, resources)
+        for resource in resources:
+            self.assertGreaterEqual(resource['lifecycle'], resource['active_duration'])
+            self.assertGreaterEqual(resource['active_duration'], 1)
+        for turn in turns:
+            self.assertTrue(0 <= turn['TM'] <= turn['TX'])
+        # The scenario replays, including special effects.
+        result = PlanEvaluator(scenario).evaluate({0: [resources[0]['id']]})
+        self.assertEqual(len(result['budget']), 500)
+
+    def test_seeded_and_chunked(self):
+        text = generated(300, 20, seed=7)
+        self.assertEqual(text, generated(300, 20, seed=7))
+        self.assertNotEqual(text, generated(300, 20, seed=8))
+        # Chunked writing produces every turn line, in order.
+        with mock.patch.object(src.generate, 'CHUNK_TURNS', 64):
+            chunked = generated(300, 20, seed=7)
+        self.assertEqual(len(chunked.splitlines()), 1 + 20 + 300)
+
+    def test_profiles(self):
+        rng = np.random.default_rng(0)
+        flat = turn_profile(rng, 0, 1000, GeneratorConfig(noise=0))
+        self.assertTrue((flat == [70, 115, 60]).all())
+        seasonal = turn_profile(rng, 0, 1000, GeneratorConfig(profile='seasonal', noise=0, period=100))
+        self.assertEqual(seasonal[:, 0].max(), 105)
+        self.assertEqual(seasonal[:, 0].min(), 35)
+        np.testing.assert_array_equal(seasonal[:100], seasonal[100:200])
+        spiky = turn_profile(rng, 0, 1000, GeneratorConfig(profile='spiky', noise=0, spike_rate=0.05))
+        self.assertEqual(set(spiky[:, 0].tolist()), {70, 210})
+
+    def test_distributions_and_type_mix(self):
+        self.assertEqual(parse_distribution("uniform:1:20"), Distribution('uniform', 1, 20))
+        self.assertEqual(parse_distribution("const:4"), Distribution('const', 4, 0))
+        for spec in ("poisson:3", "uniform:1"):
+            with self.subTest(spec=spec), self.assertRaises(ValueError):
+                parse_distribution(spec)
+        with self.assertRaises(ValueError):
+            parse_type_mix("Z=1")
+
+        config = GeneratorConfig(type_mix=parse_type_mix("A=1"), active_duration=Distribution('const', 4, 0),
+                                 lifecycle=Distribution('const', 2, 0))
+        lines = generated(1, 30, config=config).splitlines()[1:31]
+        for line in lines:
+            parts = line.split()
+            self.assertEqual(parts[7], 'A')
+            self.assertEqual(len(parts), 9)
+            self.assertEqual((parts[3], parts[5]), ('4', '4'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+# tests/test_plan.py
+
+"""
+Unit tests for the immutable Plan and the evaluation cache.
+"""
+
+import pickle
+import random
+import unittest
+
+from src.utils import parse_input
+from src.challenge_solver import solve_game
+from src.game_simulator import GameSimulator
+from src.plan import Plan, EvaluationCache, zobrist_hash
+
+class TestPlan(unittest.TestCase):
+
+    def setUp(self):
+        self.scenario = parse_input("data/input_files/2-attenborough.txt", compiled=True)
+        self.purchase_plan = {turn: ids for turn, ids in solve_game(self.scenario).items() if ids}
+
+    def test_conversions(self):
+        plan = Plan.from_dict(solve_game(self.scenario))
+        self.assertEqual(plan.to_dict(), self.purchase_plan)
+        self.assertEqual(plan, self.purchase_plan)
+        self.assertEqual(plan.num_purchases, sum(len(ids) for ids in self.purchase_plan.values()))
+        purchase_log, final_budget = GameSimulator(self.scenario).run_simulation(plan)
+        self.assertEqual(purchase_log, plan.to_log())
+        self.assertEqual(Plan.from_log(purchase_log), plan)
+        self.assertEqual(pickle.loads(pickle.dumps(plan)), plan)
+        with self.assertRaises(AttributeError):
+            plan.ids = None
+        with self.assertRaises(ValueError):
+            plan.ids[0] = 0
+
+    def test_incremental_hash(self):
+        rng = random.Random(0)
+        plan = Plan.from_dict(self.purchase_plan)
+        purchase_plan = {turn: list(ids) for turn, ids in self.purchase_plan.items()}
+        for _ in range(200):
+            turn, rid = rng.randrange(10), rng.randrange(3)
+            if rng.random() < 0.5:
+                plan = plan.with_purchase(turn, rid)
+                purchase_plan.setdefault(turn, []).append(rid)
+            elif rid in purchase_plan.get(turn, []):
+                plan = plan.without_purchase(turn, rid)
+                ids = purchase_plan[turn]
+                del ids[len(ids) - 1 - ids[::-1].index(rid)]
+            else:
+                with self.assertRaises(KeyError):
+                    plan.without_purchase(turn, rid)
+                continue
+            rebuilt = Plan.from_dict(purchase_plan)
+            self.assertEqual(plan, rebuilt)
+            self.assertEqual(hash(plan), hash(rebuilt))
+
+    def test_spliced(self):
+        rng = random.Random(1)
+        plan = Plan.from_dict(self.purchase_plan)
+        other = Plan.from_dict({turn: [rng.randrange(3) for _ in range(rng.randint(1, 3))]
+                                for turn in range(0, 100, 3)})
+        for start, end in [(0, 100), (10, 40), (50, 51), (99, 100), (40, 40)]:
+            with self.subTest(start=start, end=end):
+                spliced = plan.spliced(other, start, end)
+                expected = {turn: ids for turn, ids in self.purchase_plan.items() if not start <= turn < end}
+                expected.update({turn: ids for turn, ids in other.items() if start <= turn < end})
+                rebuilt = Plan.from_dict(expected)
+                self.assertEqual(spliced, rebuilt)
+                self.assertEqual(spliced.hash, rebuilt.hash)
+
+    def test_hash_ignores_order_within_turn(self):
+        shuffled = {turn: ids[::-1] for turn, ids in self.purchase_plan.items()}
+        self.assertEqual(Plan.from_dict(shuffled).zobrist, Plan.from_dict(self.purchase_plan).zobrist)
+        self.assertNotEqual(zobrist_hash([0, 1], [5, 5]), zobrist_hash([0, 0], [5, 5]))
+        self.assertNotEqual(zobrist_hash([0], [5]), zobrist_hash([0, 0], [5, 5]))
+
+class TestEvaluationCache(unittest.TestCase):
+
+    def test_lru(self):
+        cache = EvaluationCache(max_size=2)
+        plans = [Plan.from_dict({0: [rid]}) for rid in range(3)]
+        cache.put(plans[0], 10)
+        cache.put(plans[1], 11)
+        self.assertEqual(cache.get(plans[0]), 10)   # 0 is now the most recently used
+        cache.put(plans[2], 12)                     # so 1 is evicted
+        self.assertIsNone(cache.get(plans[1]))
+        self.assertEqual(cache.get(plans[2].zobrist), 12)
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (2, 1, 2))
+        self.assertAlmostEqual(cache.hit_rate, 2 / 3)
+
+if __name__ == "__main__":
+    unittest.main()
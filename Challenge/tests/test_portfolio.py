@@ -0,0 +1,92 @@
+# tests/test_portfolio.py
+
+"""
+Unit tests for the solver portfolio.
+"""
+
+import contextlib
+import io
+import time
+import unittest
+from unittest import mock
+
+import src.portfolio
+from src.anytime import StopCondition
+from src.utils import parse_input
+from src.challenge_solver import solve_game
+from src.game_simulator import GameSimulator
+from src.portfolio import iterate_portfolio, run_portfolio, solve_andrea, solve_simone, format_summary
+
+def solve_stuck(scenario, time_limit):
+    while True:
+        time.sleep(0.01)
+
+def solve_slow(scenario, time_limit):
+    time.sleep(0.3)
+    return {}
+
+class TestPortfolio(unittest.TestCase):
+
+    def setUp(self):
+        self.scenario = parse_input("data/input_files/0-demo.txt", compiled=True)
+
+    def score(self, purchase_plan):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return GameSimulator(self.scenario).run_simulation(purchase_plan)[1]
+
+    def test_adapters(self):
+        for solver in (solve_andrea, solve_simone):
+            with self.subTest(solver=solver.__name__):
+                purchase_plan = solver(self.scenario)
+                self.assertIsInstance(purchase_plan, dict)
+                self.assertIsInstance(self.score(purchase_plan), int)
+
+    def test_keeps_best_plan(self):
+        best_plan, results = run_portfolio(self.scenario, ["default", "greedy", "horizon"], time_limit=1.0)
+        self.assertEqual(list(results), ["default", "greedy", "horizon"])
+        self.assertTrue(all(result['status'] == 'ok' for result in results.values()))
+        best_score = max(result['score'] for result in results.values())
+        self.assertEqual(self.score(best_plan), best_score)
+        self.assertGreaterEqual(best_score, self.score(solve_game(self.scenario)))
+        self.assertIn("greedy", format_summary(results))
+
+    def test_target_score_cancels(self):
+        target = self.score(solve_game(self.scenario))
+        best_plan, results = run_portfolio(self.scenario, ["greedy", "anneal", "ga"], time_limit=30.0,
+                                           target_score=target, max_workers=1)
+        self.assertEqual(results["greedy"]['status'], 'ok')
+        self.assertEqual(results["anneal"]['status'], 'cancelled')
+        self.assertEqual(results["ga"]['status'], 'cancelled')
+        self.assertGreaterEqual(self.score(best_plan), target)
+
+    def test_timeout_under_stop_condition(self):
+        # Strategy processes inherit main's SIGTERM handler; they must still be terminated.
+        with mock.patch.dict(src.portfolio.STRATEGIES, {"stuck": solve_stuck}), StopCondition():
+            _, results = run_portfolio(self.scenario, ["stuck"], time_limit=0.2, grace=0.2)
+        self.assertEqual(results["stuck"]['status'], 'timeout')
+
+    def test_queued_strategies_get_their_own_deadline(self):
+        # One worker: the second strategy starts after the first and still gets its full time.
+        strategies = {"slow": solve_slow, "slow2": solve_slow}
+        with mock.patch.dict(src.portfolio.STRATEGIES, strategies):
+            _, results = run_portfolio(self.scenario, ["slow", "slow2"], time_limit=0.3, grace=0.2,
+                                       max_workers=1)
+        self.assertEqual([result['status'] for result in results.values()], ['ok', 'ok'])
+
+    def test_yields_plans_and_honours_should_stop(self):
+        results = {}
+        stop = []
+        with mock.patch.dict(src.portfolio.STRATEGIES, {"stuck": solve_stuck}):
+            plans = iterate_portfolio(self.scenario, ["greedy", "stuck"], time_limit=30.0, max_workers=2,
+                                      should_stop=lambda: bool(stop), results=results)
+            start = time.perf_counter()
+            first_plan = next(plans)
+            stop.append(True)
+            self.assertEqual(list(plans), [])
+        self.assertLess(time.perf_counter() - start, 5.0)
+        self.assertEqual(self.score(first_plan), self.score(solve_game(self.scenario)))
+        self.assertEqual(results["greedy"]['status'], 'ok')
+        self.assertEqual(results["stuck"]['status'], 'cancelled')
+
+if __name__ == "__main__":
+    unittest.main()
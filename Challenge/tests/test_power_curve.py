@@ -0,0 +1,79 @@
+# tests/test_power_curve.py
+
+"""
+Unit tests for the power curve marginal-gain oracle and the marginal-gain greedy solver.
+"""
+
+import contextlib
+import io
+import random
+import unittest
+
+import numpy as np
+
+from src.utils import parse_input
+from src.game_simulator import GameSimulator
+from src.plan_evaluator import PlanEvaluator
+from src.power_curve import PowerCurve, active_intervals, solve_marginal
+
+def profit(power, TM, TX, TR):
+    return np.where(power >= TM, np.minimum(power, TX) * TR, 0)
+
+class TestPowerCurve(unittest.TestCase):
+
+    def test_gain_matches_brute_force(self):
+        rng = random.Random(0)
+        for trial in range(60):
+            num_turns = rng.randint(1, 80)
+            TM = np.array([rng.randint(0, 20) for _ in range(num_turns)])
+            # Every third trial also has turns with TM > TX.
+            low = -3 if trial % 3 == 0 else 0
+            TX = np.maximum(TM + np.array([rng.randint(low, 20) for _ in range(num_turns)]), 0)
+            TR = np.array([rng.randint(0, 9) for _ in range(num_turns)])
+            curve = PowerCurve(TM, TX, TR, block_size=rng.choice([None, 1, 4, 7]))
+            power = np.zeros(num_turns, dtype=np.int64)
+            for _ in range(30):
+                start = rng.randint(-2, num_turns)
+                end = rng.randint(start, num_turns + 2)
+                delta = rng.randint(-15, 15)
+                changed = power.copy()
+                changed[max(start, 0):max(min(end, num_turns), 0)] += delta
+                expected = int(profit(changed, TM, TX, TR).sum() - profit(power, TM, TX, TR).sum())
+                with self.subTest(trial=trial, start=start, end=end, delta=delta):
+                    self.assertEqual(curve.gain(start, end, delta), expected)
+                if rng.random() < 0.5:
+                    curve.range_add(start, end, delta)
+                    power = changed
+                np.testing.assert_array_equal(curve.values(), power)
+            np.testing.assert_array_equal(curve.profit(), profit(power, TM, TX, TR))
+
+    def test_pattern_gains(self):
+        scenario = parse_input("data/input_files/4-maathai.txt", compiled=True)
+        evaluator = PlanEvaluator(scenario)
+        curve = PowerCurve(scenario.TM, scenario.TX, scenario.TR, block_size=5)
+        rng = random.Random(1)
+        for _ in range(50):
+            curve.range_add(rng.randrange(scenario.num_turns), rng.randrange(scenario.num_turns), rng.randint(1, 9))
+        turn = 100
+        window = max(len(timeline) for timeline in evaluator.power_timelines)
+        patterns = np.zeros((scenario.num_resources, window), dtype=np.int64)
+        for index, timeline in enumerate(evaluator.power_timelines):
+            patterns[index, :len(timeline)] = timeline
+        expected = [curve.pattern_gain(turn, active_intervals(res_def), res_def['buildings_powered'])
+                    for res_def in scenario.resources]
+        self.assertEqual(curve.window_gains(turn, patterns).tolist(), expected)
+
+    def test_solve_marginal(self):
+        for input_file in ("data/input_files/2-attenborough.txt", "data/input_files/6-earle.txt"):
+            scenario = parse_input(input_file, compiled=True)
+            purchase_plan = solve_marginal(scenario)
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                _, final_budget = GameSimulator(scenario).run_simulation(purchase_plan)
+            with self.subTest(input_file=input_file):
+                # The solver tracks the budget exactly, so no purchase fails.
+                self.assertEqual(output.getvalue(), "")
+                self.assertEqual(final_budget, PlanEvaluator(scenario).evaluate(purchase_plan)['final_budget'])
+
+if __name__ == "__main__":
+    unittest.main()
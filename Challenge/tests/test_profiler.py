@@ -0,0 +1,96 @@
+# tests/test_profiler.py
+
+"""
+Unit tests for the scenario profiler and the solver dispatcher.
+"""
+
+import unittest
+
+from src.utils import parse_input
+from src.plan_evaluator import PlanEvaluator
+from src.scenario import compile_scenario
+from src.profiler import (
+    lifetime_output, efficiency_frontier, profile_scenario, choose_solver, beam_width, ScenarioProfile,
+    TINY_SIZE, MEDIUM_SIZE, MAX_BEAM_WIDTH, MIN_BEAM_WIDTH
+)
+
+INPUT_FILES = [
+    "data/input_files/0-demo.txt",
+    "data/input_files/2-attenborough.txt",
+    "data/input_files/4-maathai.txt",
+    "data/input_files/8-shiva.txt",
+]
+
+def resource(rid, activation_cost, periodic_cost, active_duration, downtime, lifecycle, buildings_powered):
+    return {'id': rid, 'activation_cost': activation_cost, 'periodic_cost': periodic_cost,
+            'active_duration': active_duration, 'downtime': downtime, 'lifecycle': lifecycle,
+            'buildings_powered': buildings_powered, 'resource_type': 'X', 'special_effect': 0}
+
+class TestProfiler(unittest.TestCase):
+
+    def test_lifetime_output(self):
+        for input_file in INPUT_FILES:
+            evaluator = PlanEvaluator(parse_input(input_file, compiled=True))
+            for res_def, timeline in zip(evaluator.resources_def, evaluator.power_timelines):
+                with self.subTest(input_file=input_file, id=res_def['id']):
+                    self.assertEqual(lifetime_output(res_def) * res_def['buildings_powered'], timeline.sum())
+
+    def test_efficiency_frontier(self):
+        resources = [
+            resource(0, 10, 1, 1, 0, 5, 2),   # cost 15, output 2 (stays down after one turn)
+            resource(1, 10, 1, 5, 0, 5, 2),   # cost 15, output 10
+            resource(2, 30, 0, 5, 0, 5, 3),   # cost 30, output 15
+            resource(3, 40, 0, 5, 0, 5, 1),   # cost 40, output 5: dominated by 1 and 2
+        ]
+        scenario = compile_scenario(100, resources, [{'TM': 1, 'TX': 5, 'TR': 1}] * 5)
+        self.assertEqual(efficiency_frontier(scenario), (1, 2))
+
+    def test_choose_solver(self):
+        solvers = []
+        for input_file in INPUT_FILES:
+            profile = profile_scenario(parse_input(input_file, compiled=True))
+            choice = choose_solver(profile, time_limit=5.0)
+            solvers.append(choice.solver)
+            with self.subTest(input_file=input_file, size=profile.size):
+                self.assertLessEqual(choice.time_limit, 5.0)
+                worth_buying = profile.num_resources - profile.num_special_unpowered
+                if profile.num_turns * worth_buying <= TINY_SIZE:
+                    self.assertEqual(choice.solver, 'exact')
+                    self.assertEqual(choice.options, {'beam_width': MAX_BEAM_WIDTH})
+                    continue
+                self.assertEqual(choice.solver, 'anneal')
+                if profile.size <= MEDIUM_SIZE:
+                    self.assertEqual(choice.options['anneal_start'], 'beam')
+                    self.assertEqual(choice.options['beam_width'], beam_width(profile))
+                else:
+                    # The shipped thresholds vary by 10-30%: the horizon's lookahead pays.
+                    self.assertEqual(choice.options['anneal_start'], 'horizon')
+        self.assertEqual(solvers, ['exact', 'anneal', 'anneal', 'anneal'])
+        self.assertEqual(profile.num_turns, 10000)
+        self.assertEqual(profile.num_resources, 40)
+        self.assertEqual((profile.num_special, profile.num_special_unpowered), (19, 12))
+
+    def test_unpowered_special_resources_are_not_counted(self):
+        # 10 turns x 8 resources is past TINY_SIZE, but only 2 of them power a building.
+        profile = ScenarioProfile(10, 8, 80, 0.2, 0.2, 0.2, (0, 1), 7, 6)
+        self.assertEqual(choose_solver(profile).solver, 'exact')
+        self.assertEqual(choose_solver(profile._replace(num_special_unpowered=2)).solver, 'anneal')
+        # Nothing worth buying: the exact search is trivial at any size.
+        nothing = ScenarioProfile(10_000, 40, 400_000, 0.2, 0.2, 0.2, (), 40, 40)
+        self.assertEqual(choose_solver(nothing).solver, 'exact')
+
+    def test_large_seed_follows_the_profile(self):
+        # Too large for the horizon to cover the game within half of the budget.
+        profile = ScenarioProfile(200_000, 1000, 200_000_000, 0.05, 0.05, 0.05, (0, 1, 2), 0, 0)
+        self.assertEqual(choose_solver(profile).options['anneal_start'], 'greedy')
+        variable = profile._replace(tr_variation=0.4)
+        self.assertEqual(choose_solver(variable).options['anneal_start'], 'horizon')
+
+    def test_beam_width_follows_the_frontier(self):
+        profile = ScenarioProfile(100, 50, 5000, 0.0, 0.0, 0.0, (0,), 0, 0)
+        self.assertEqual(beam_width(profile), MIN_BEAM_WIDTH)
+        self.assertEqual(beam_width(profile._replace(frontier=tuple(range(4)))), 32)
+        self.assertEqual(beam_width(profile._replace(frontier=tuple(range(20)))), MAX_BEAM_WIDTH)
+
+if __name__ == "__main__":
+    unittest.main()
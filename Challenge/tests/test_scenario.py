@@ -0,0 +1,76 @@
+# tests/test_scenario.py
+
+"""
+Unit tests for the compiled Scenario representation.
+"""
+
+import os
+import pickle
+import unittest
+
+from src.utils import parse_input
+from src.scenario import NEUTRAL_TYPE_CODE, RESOURCE_TYPES, Scenario, compile_scenario, type_code
+from src.challenge_solver import SOLVER_MAPPING
+
+class TestScenario(unittest.TestCase):
+
+    def setUp(self):
+        self.test_input = """
+                             10 3 3
+                             1 5 1 1 1 3 2 X 0
+                             2 3 1 1 1 3 1 A 5
+                             1 9 9 9 9 9 9 E 1
+                             3 5 4
+                             4 6 3
+                             2 7 1
+                          """
+        self.input_file = "tests/test_scenario_input.txt"
+        with open(self.input_file, "w") as f:
+            f.write(self.test_input)
+
+    def tearDown(self):
+        if os.path.exists(self.input_file):
+            os.remove(self.input_file)
+
+    def test_compiled_columns(self):
+        scenario = parse_input(self.input_file, compiled=True)
+        self.assertIsInstance(scenario, Scenario)
+        self.assertEqual(scenario.initial_budget, 10)
+        self.assertEqual(scenario.num_resources, 3)
+        self.assertEqual(scenario.num_turns, 3)
+        self.assertEqual(list(scenario.activation_cost), [5, 3, 9])
+        self.assertEqual(list(scenario.TR), [4, 3, 1])
+        # Duplicate ids resolve to the first definition, like the simulator's linear scan.
+        self.assertEqual(scenario.index_by_id[1], 0)
+        self.assertEqual(list(scenario.type_indices['X']), [0])
+        self.assertEqual(list(scenario.type_indices['B']), [])
+
+    def test_unknown_type_is_neutral(self):
+        self.assertEqual(type_code('Z'), NEUTRAL_TYPE_CODE)
+        self.assertEqual(RESOURCE_TYPES[NEUTRAL_TYPE_CODE], 'X')
+
+    def test_immutable(self):
+        scenario = parse_input(self.input_file, compiled=True)
+        with self.assertRaises(AttributeError):
+            scenario.initial_budget = 0
+        with self.assertRaises(ValueError):
+            scenario.TM[0] = 0
+        with self.assertRaises(TypeError):
+            scenario.index_by_id[7] = 0
+
+    def test_round_trips(self):
+        initial_budget, resources, turns = parse_input(self.input_file)
+        scenario = compile_scenario(initial_budget, resources, turns)
+        self.assertIs(compile_scenario(scenario), scenario)
+        self.assertEqual(tuple(scenario), (initial_budget, resources, turns))
+        restored = pickle.loads(pickle.dumps(scenario))
+        self.assertEqual(restored.resources, resources)
+        self.assertEqual(restored.turns, turns)
+
+    def test_solvers_accept_scenario(self):
+        path = "data/input_files/2-attenborough.txt"
+        solver = SOLVER_MAPPING["2-attenborough.txt"]
+        self.assertEqual(solver(parse_input(path, compiled=True)), solver(*parse_input(path)))
+
+if __name__ == '__main__':
+    unittest.main()
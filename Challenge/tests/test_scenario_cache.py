@@ -0,0 +1,76 @@
+# tests/test_scenario_cache.py
+
+"""
+Unit tests for the compiled scenario cache.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from src.columnar_parser import parse_columnar
+from src.scenario_cache import ARRAY_COLUMNS, ScenarioCache, load_scenario
+
+class TestScenarioCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.directory, "cache")
+        self.input_file = os.path.join(self.directory, "input.txt")
+        shutil.copy("data/input_files/2-attenborough.txt", self.input_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        expected = parse_columnar(self.input_file)
+        cache = ScenarioCache(self.cache_dir)
+        first = cache.parse(self.input_file)
+        self.assertEqual(len(cache.entries()), 1)
+        cached = cache.parse(self.input_file)
+        self.assertIsInstance(cached.TM.base, np.memmap)
+        self.assertFalse(cached.TM.flags.writeable)
+        for scenario in (first, cached):
+            self.assertEqual(scenario.initial_budget, expected.initial_budget)
+            for name in ARRAY_COLUMNS:
+                np.testing.assert_array_equal(getattr(scenario, name), getattr(expected, name))
+        self.assertEqual(cached.resources, expected.resources)
+
+    def test_changed_input_gets_new_entry(self):
+        cache = ScenarioCache(self.cache_dir)
+        key = cache.key(self.input_file)
+        with open(self.input_file, 'a') as f:
+            f.write("\n")
+        self.assertNotEqual(cache.key(self.input_file), key)
+
+    def test_eviction(self):
+        cache = ScenarioCache(self.cache_dir)
+        cache.parse(self.input_file)
+        old_entry = cache.entries()[0][2]
+        # An entry of an older format version is evicted whatever the size limit.
+        stale = os.path.join(self.cache_dir, "v0-stale")
+        os.makedirs(stale)
+        cache.evict()
+        self.assertFalse(os.path.exists(stale))
+
+        past = time.time() - 60
+        os.utime(old_entry, (past, past))
+        shutil.copy("data/input_files/3-goodall.txt", self.input_file)
+        size = cache.entries()[0][1]
+        ScenarioCache(self.cache_dir, max_bytes=int(size * 1.5)).parse(self.input_file)
+        # The least recently used entry made room for the new one.
+        entries = cache.entries()
+        self.assertEqual(len(entries), 1)
+        self.assertNotEqual(entries[0][2], old_entry)
+
+    def test_no_cache(self):
+        scenario = load_scenario(self.input_file, cache_dir=None)
+        self.assertEqual(scenario.num_turns, 100)
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+# tests/test_score.py
+
+"""
+Unit tests for the score entry point.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.score import (OutputFormatError, diff_runs, match_input, read_output, score_directory,
+                       score_output)
+
+DEMO_INPUT = "data/input_files/0-demo.txt"
+SAVED_RUN = "data/output_files/20250312_114429"
+
+class TestScore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, text):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def test_read_output(self):
+        path = self.write("output0.txt", "0 1 2\n\n1 2 2 1\n")
+        self.assertEqual(list(read_output(path)), [(0, [2]), (1, [2, 1])])
+
+    def test_format_errors(self):
+        cases = {"0 2 2\n": 1, "0 1 x\n": 1, "1 1 2\n1 1 2\n": 2, "0 1 2\n9 1 2\n": 2}
+        for text, line_number in cases.items():
+            with self.subTest(text=text):
+                path = self.write("output0.txt", text)
+                with self.assertRaises(OutputFormatError) as context:
+                    list(read_output(path, num_turns=6))
+                self.assertEqual(context.exception.line_number, line_number)
+
+    def test_saved_output_score(self):
+        report = score_output(os.path.join(SAVED_RUN, "output0.txt"), DEMO_INPUT, cache_dir=None)
+        self.assertEqual(report['final_budget'], 47)
+        self.assertIsNone(report['first_infeasible_turn'])
+        self.assertEqual(report['errors'], [])
+
+    def test_first_infeasible_turn(self):
+        # Resource 4 costs 20, more than the initial budget of 10: turn 0 is dropped.
+        path = self.write("output0.txt", "0 1 4\n1 1 2\n")
+        report = score_output(path, DEMO_INPUT, cache_dir=None)
+        self.assertEqual(report['first_infeasible_turn'], 0)
+        self.assertEqual(report['failed_turns'], [0])
+        self.assertIsNotNone(report['final_budget'])
+
+    def test_malformed_output_has_no_score(self):
+        path = self.write("output0.txt", "0 3 2\n")
+        report = score_output(path, DEMO_INPUT, cache_dir=None)
+        self.assertIsNone(report['final_budget'])
+        self.assertEqual(len(report['errors']), 1)
+
+    def test_directory_and_diff(self):
+        self.assertEqual(match_input(os.path.join(SAVED_RUN, "output3.txt")),
+                         "data/input_files/3-goodall.txt")
+        shutil.copy(os.path.join(SAVED_RUN, "output0.txt"), self.directory)
+        self.write("output1.txt", "0 1 x\n")
+        first = score_directory(SAVED_RUN, workers=0, cache_dir=None)
+        second = score_directory(self.directory, workers=0, cache_dir=None)
+        self.assertEqual(len(first), 8)
+        rows = {name: row for name, *row in diff_runs(first, second)}
+        self.assertEqual(rows['output0.txt'], [47, 47, 0])
+        self.assertEqual(rows['output1.txt'], [-242, None, None])
+        self.assertEqual(rows['output2.txt'], [13601, None, None])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,290 @@
+# tests/test_simulators.py
+
+"""
+Equivalence tests for the alternative simulation engines: each one must give the
+same (purchase_log, final_budget) as GameSimulator.run_simulation.
+"""
+
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from src.utils import parse_input
+from src.challenge_solver import SOLVER_MAPPING
+from src.game_simulator import GameSimulator
+from src.event_simulator import EventSimulator
+from src.numpy_simulator import NumpySimulator
+from src.plan_evaluator import PlanEvaluator
+from src.delta_evaluator import DeltaEvaluator
+from src.batch_evaluator import BatchEvaluator
+from src.scenario import RESOURCE_COLUMNS, Scenario, type_code
+from src.trace import ArrayTraceSink, RingBufferTraceSink, TraceSink, make_trace_sink
+
+INPUT_DIR = "data/input_files"
+
+def reference_run(initial_budget, resources, turns, purchase_plan):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return GameSimulator(initial_budget, resources, turns).run_simulation(purchase_plan)
+
+def random_plan(resources, num_turns, seed):
+    # Random plans exercise failed purchases and unknown ids as well.
+    rng = random.Random(seed)
+    ids = [r['id'] for r in resources] + [-1]
+    plan = {}
+    for turn in range(num_turns):
+        if rng.random() < 0.3:
+            plan[turn] = [rng.choice(ids) for _ in range(rng.randint(1, 4))]
+    return plan
+
+class TestSimulatorEquivalence(unittest.TestCase):
+
+    def scenarios(self):
+        for file_name in sorted(os.listdir(INPUT_DIR)):
+            initial_budget, resources, turns = parse_input(os.path.join(INPUT_DIR, file_name))
+            plans = [
+                SOLVER_MAPPING[file_name](initial_budget, resources, turns),
+                random_plan(resources, len(turns), seed=len(turns)),
+            ]
+            for plan in plans:
+                yield file_name, initial_budget, resources, turns, plan
+
+    def assert_matches_reference(self, simulator_class):
+        for file_name, initial_budget, resources, turns, plan in self.scenarios():
+            with self.subTest(file=file_name):
+                expected = reference_run(initial_budget, resources, turns, plan)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    simulator = simulator_class(initial_budget, resources, turns)
+                    purchase_log, final_budget = simulator.run_simulation(plan)
+                self.assertEqual(purchase_log, expected[0])
+                self.assertEqual(final_budget, expected[1])
+
+    def test_compact_resources(self):
+        self.assert_matches_reference(
+            lambda b, r, t: GameSimulator(b, r, t, compact=True)
+        )
+
+    def test_event_simulator(self):
+        self.assert_matches_reference(EventSimulator)
+
+    def test_numpy_simulator(self):
+        # A tiny initial capacity also exercises the fleet growth path.
+        self.assert_matches_reference(
+            lambda b, r, t: NumpySimulator(b, r, t, initial_capacity=1)
+        )
+
+    def test_plan_evaluator(self):
+        self.assert_matches_reference(PlanEvaluator)
+
+    def test_unknown_resource_type(self):
+        initial_budget, resources, turns = parse_input(os.path.join(INPUT_DIR, "0-demo.txt"))
+        plan = SOLVER_MAPPING["0-demo.txt"](initial_budget, resources, turns)
+        expected = reference_run(initial_budget, resources, turns, plan)
+        renamed = [dict(r, resource_type='Z') for r in resources]
+        for compact in (False, True):
+            with self.subTest(compact=compact):
+                simulator = GameSimulator(initial_budget, renamed, turns, compact=compact)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    self.assertEqual(simulator.run_simulation(plan), expected)
+                # Plain lists are only compiled when the compact resources need it.
+                self.assertEqual(simulator._scenario is None, not compact)
+
+    def test_plan_evaluator_curves(self):
+        initial_budget, resources, turns = parse_input(os.path.join(INPUT_DIR, "0-demo.txt"))
+        plan = SOLVER_MAPPING["0-demo.txt"](initial_budget, resources, turns)
+        result = PlanEvaluator(initial_budget, resources, turns).evaluate(plan)
+        trace = ArrayTraceSink(len(turns))
+        with contextlib.redirect_stdout(io.StringIO()):
+            GameSimulator(initial_budget, resources, turns, trace).run_simulation(plan)
+        for column in ('budget', 'power', 'profit', 'maintenance'):
+            self.assertEqual(list(result[column]), list(getattr(trace, column)))
+
+    def test_failures_resolved_in_one_pass(self):
+        # Every purchase turn fails: the profit of each turn is still computed at most twice.
+        initial_budget, resources, turns = parse_input(os.path.join(INPUT_DIR, "6-earle.txt"))
+        expensive = max(resources, key=lambda r: r['activation_cost'])['id']
+        plan = {turn: [expensive] for turn in range(0, len(turns), 2)}
+        evaluator = PlanEvaluator(0, resources, turns)
+        profit = evaluator.profit
+        computed = []
+        def counting_profit(power, start=0):
+            computed.append(len(power))
+            return profit(power, start)
+        evaluator.profit = counting_profit
+        result = evaluator.evaluate(plan)
+        self.assertEqual(len(result['failed_turns']), len(plan))
+        self.assertLessEqual(sum(computed), 2 * len(turns))
+        self.assertEqual(result['final_budget'], reference_run(0, resources, turns, plan)[1])
+
+class TestTraceSinks(unittest.TestCase):
+
+    def setUp(self):
+        self.initial_budget, self.resources, self.turns = parse_input(
+            os.path.join(INPUT_DIR, "0-demo.txt"))
+        self.plan = SOLVER_MAPPING["0-demo.txt"](self.initial_budget, self.resources, self.turns)
+        self.expected = ArrayTraceSink(len(self.turns))
+        GameSimulator(self.initial_budget, self.resources, self.turns, self.expected).run_simulation(self.plan)
+
+    def run_with(self, trace):
+        with contextlib.redirect_stdout(io.StringIO()):
+            NumpySimulator(self.initial_budget, self.resources, self.turns, trace).run_simulation(self.plan)
+        trace.close()
+
+    def test_base_sink_is_abstract(self):
+        with self.assertRaises(TypeError):
+            TraceSink()
+
+    def test_simulate_turn_returns_summary(self):
+        for simulator_class in (GameSimulator, EventSimulator, NumpySimulator):
+            with self.subTest(simulator=simulator_class.__name__):
+                trace = ArrayTraceSink(len(self.turns))
+                simulator = simulator_class(self.initial_budget, self.resources, self.turns, trace)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    summaries = [simulator.simulate_turn(turn, self.plan.get(turn, []))
+                                 for turn in range(len(self.turns))]
+                self.assertEqual([s['turn'] for s in summaries], list(range(len(self.turns))))
+                self.assertEqual([s['budget'] for s in summaries], list(self.expected.budget))
+                self.assertEqual([s['total_power'] for s in summaries], list(self.expected.power))
+                self.assertEqual([s['profit'] for s in summaries], list(trace.profit))
+
+    def test_ring_buffer_keeps_last_turns(self):
+        trace = RingBufferTraceSink(2)
+        self.run_with(trace)
+        summaries = trace.summaries()
+        self.assertEqual([summary['turn'] for summary in summaries], [4, 5])
+        self.assertEqual(summaries[-1]['budget'], self.expected.budget[-1])
+
+    def test_file_sinks(self):
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path = os.path.join(directory, "trace.csv")
+            binary_path = os.path.join(directory, "trace.bin")
+            self.run_with(make_trace_sink(f"csv:{csv_path}", len(self.turns)))
+            self.run_with(make_trace_sink(f"binary:{binary_path}", len(self.turns)))
+            from_csv = np.loadtxt(csv_path, delimiter=",", skiprows=1, dtype=np.int64)
+            from_binary = np.fromfile(binary_path, dtype="<i8").reshape(-1, 5)
+        self.assertTrue(np.array_equal(from_csv, from_binary))
+        self.assertEqual(list(from_csv[:, 1]), list(self.expected.budget))
+        self.assertEqual(list(from_csv[:, 2]), list(self.expected.power))
+
+class TestBatchEvaluator(unittest.TestCase):
+
+    def test_batch_matches_reference(self):
+        for file_name in ("0-demo.txt", "2-attenborough.txt", "6-earle.txt"):
+            initial_budget, resources, turns = parse_input(os.path.join(INPUT_DIR, file_name))
+            plans = [SOLVER_MAPPING[file_name](initial_budget, resources, turns), {}]
+            plans += [random_plan(resources, len(turns), seed) for seed in range(4)]
+            result = BatchEvaluator(initial_budget, resources, turns).evaluate_batch(plans)
+            self.assertEqual(result['budget'].shape, (len(plans), len(turns)))
+            for row, plan in enumerate(plans):
+                with self.subTest(file=file_name, plan=row):
+                    purchase_log, final_budget = reference_run(initial_budget, resources, turns, plan)
+                    self.assertEqual(result['final_budgets'][row], final_budget)
+                    attempted = [turn for turn, ids in plan.items() if ids]
+                    self.assertEqual(result['feasible'][row], len(purchase_log) == len(attempted))
+
+class TestCohorts(unittest.TestCase):
+
+    def test_identical_purchases_share_a_cohort(self):
+        initial_budget, resources, turns = parse_input(os.path.join(INPUT_DIR, "8-shiva.txt"))
+        cheapest = min(resources, key=lambda r: r['activation_cost'])['id']
+        plan = {0: [cheapest] * 5, 1: [cheapest] * 3}
+        simulator = NumpySimulator(initial_budget * 10, resources, turns[:2])
+        simulator.simulate_turn(0, plan[0])
+        self.assertEqual(simulator.num_live, 1)
+        simulator.simulate_turn(1, plan[1])
+        self.assertEqual(simulator.num_live, 2)
+        expected = reference_run(initial_budget * 10, resources, turns[:2], plan)
+        self.assertEqual(simulator.budget, expected[1])
+
+class TestCheckpointedResimulation(unittest.TestCase):
+
+    def test_resimulate_from_matches_full_run(self):
+        initial_budget, resources, turns = parse_input(os.path.join(INPUT_DIR, "4-maathai.txt"))
+        incumbent = SOLVER_MAPPING["4-maathai.txt"](initial_budget, resources, turns)
+        candidate = random_plan(resources, len(turns), seed=5)
+        for interval in (None, 1, 64):
+            with self.subTest(interval=interval), contextlib.redirect_stdout(io.StringIO()):
+                simulator = NumpySimulator(initial_budget, resources, turns, checkpoint_interval=interval)
+                simulator.run_simulation(incumbent)
+                for turn_index in (300, 17, 0):
+                    suffix = {turn: ids for turn, ids in candidate.items() if turn >= turn_index}
+                    purchase_log, final_budget = simulator.resimulate_from(turn_index, suffix)
+                    expected_plan = {turn: ids for turn, ids in incumbent.items() if turn < turn_index}
+                    expected_plan.update(suffix)
+                    expected = reference_run(initial_budget, resources, turns, expected_plan)
+                    self.assertEqual(purchase_log, expected[0])
+                    self.assertEqual(final_budget, expected[1])
+
+class TestDeltaEvaluator(unittest.TestCase):
+
+    def setUp(self):
+        self.initial_budget, self.resources, self.turns = parse_input(
+            os.path.join(INPUT_DIR, "3-goodall.txt"))
+        plan = SOLVER_MAPPING["3-goodall.txt"](self.initial_budget, self.resources, self.turns)
+        self.delta = DeltaEvaluator(self.initial_budget, self.resources, self.turns, plan)
+        self.evaluator = PlanEvaluator(self.initial_budget, self.resources, self.turns)
+
+    def test_deltas_match_full_evaluation(self):
+        rng = random.Random(3)
+        ids = [r['id'] for r in self.resources]
+        for step in range(200):
+            purchases = [(turn, rid) for turn, rids in self.delta.plan.items() for rid in rids]
+            new_plan = self.delta.purchase_plan()
+            move = rng.choice(["add", "remove", "move"])
+            if move == "add" or not purchases:
+                turn, rid = rng.randrange(len(self.turns)), rng.choice(ids)
+                delta, feasible = self.delta.delta_add(turn, rid)
+                new_plan.setdefault(turn, []).append(rid)
+            elif move == "remove":
+                turn, rid = rng.choice(purchases)
+                delta, feasible = self.delta.delta_remove(turn, rid)
+                new_plan[turn].remove(rid)
+            else:
+                turn, rid = rng.choice(purchases)
+                new_turn = min(max(turn + rng.randint(-5, 5), 0), len(self.turns) - 1)
+                delta, feasible = self.delta.delta_move(turn, rid, new_turn)
+                new_plan[turn].remove(rid)
+                new_plan.setdefault(new_turn, []).append(rid)
+
+            result = self.evaluator.evaluate(new_plan)
+            with self.subTest(step=step, move=move):
+                self.assertEqual(feasible, not result['failed_turns'])
+                if feasible:
+                    self.assertEqual(self.delta.final_budget + delta, result['final_budget'])
+            if feasible and rng.random() < 0.5:
+                self.delta.commit()
+                self.assertEqual(self.delta.final_budget, result['final_budget'])
+            else:
+                self.delta.rollback()
+        expected = self.evaluator.evaluate(self.delta.purchase_plan())['budget']
+        self.assertEqual(list(self.delta.budget_curve()), list(expected))
+
+    def test_commit_cost_independent_of_turns(self):
+        def commit_time(num_turns):
+            # One resource, cheap enough to buy every turn: each move is feasible.
+            columns = {name: [value] for name, value in zip(RESOURCE_COLUMNS, (1, 1, 3, 2, 10, 5, 0))}
+            scenario = Scenario(10 ** 9, [0], [type_code('X')], columns, np.full(num_turns, 1),
+                                np.full(num_turns, 10), np.full(num_turns, 1))
+            delta = DeltaEvaluator(scenario, purchase_plan={turn: [0] for turn in range(0, num_turns, 7)})
+            rng = random.Random(0)
+            times = []
+            for _ in range(50):
+                delta.delta_add(rng.randrange(num_turns // 2), 0)
+                start = time.perf_counter()
+                delta.commit()
+                times.append(time.perf_counter() - start)
+            return sorted(times)[len(times) // 2]
+        small, large = commit_time(1_000), commit_time(1_000_000)
+        self.assertLess(large, 5 * small)
+
+    def test_remove_missing_purchase(self):
+        with self.assertRaises(ValueError):
+            self.delta.delta_remove(0, -1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,9 +6,19 @@ Unit tests for the challenge solver and simulation.
 
 import unittest
 import os
+from itertools import combinations_with_replacement, product
+
+import numpy as np
+
 from src.utils import parse_input
-from src.challenge_solver import solve_game
+from src.challenge_solver import solve_game, solve_greedy, GreedyStrategy, SOLVER_MAPPING
 from src.game_simulator import GameSimulator
+from src.anneal_solver import AnnealSolver
+from src.beam_solver import BeamSolver, solve_beam
+from src.exact_solver import ExactSolver, solve_exact
+from src.genetic_solver import GeneticSolver, decode_plan, encode_plan
+from src.horizon_solver import HorizonSolver
+from src.plan import Plan
 
 class TestChallengeSolver(unittest.TestCase):
 
@@ -49,5 +59,190 @@ class TestChallengeSolver(unittest.TestCase):
         self.assertIsInstance(final_budget, int)
         # Additional checks can be added here based on expected simulation outcomes.
 
+    def test_greedy_strategy(self):
+        initial_budget, resources, turns = parse_input(self.input_file)
+        # The default strategy prefers resource 1 (2 buildings for 6) over resource 2 (1 for 4)
+        # and needs both to reach TM = 3.
+        self.assertEqual(solve_game(initial_budget, resources, turns)[0], [1, 2])
+        cheapest_first = GreedyStrategy(rank_key=lambda scenario: scenario.activation_cost.tolist())
+        self.assertEqual(solve_greedy(initial_budget, resources, turns, cheapest_first)[0], [2, 1])
+        # No purchases in the last two turns.
+        plan = solve_greedy(initial_budget, resources, turns, GreedyStrategy(min_remaining_turns=2))
+        self.assertEqual(plan, {0: [1, 2], 1: [], 2: []})
+
+    def test_dedicated_solver_scores(self):
+        # Final budgets of the nine solvers the greedy engine replaced, per shipped input.
+        expected = {
+            "0-demo.txt": 47, "1-thunberg.txt": -242, "2-attenborough.txt": 13601,
+            "3-goodall.txt": 49989, "4-maathai.txt": 419886, "6-earle.txt": 4836822,
+            "7-mckibben.txt": 21118180, "8-shiva.txt": 65323259,
+        }
+        for file_name, final_budget in expected.items():
+            with self.subTest(file=file_name):
+                scenario = parse_input(os.path.join("data/input_files", file_name), compiled=True)
+                purchase_plan = SOLVER_MAPPING[file_name](scenario)
+                self.assertEqual(GameSimulator(scenario).run_simulation(purchase_plan)[1], final_budget)
+
+class TestAnnealSolver(unittest.TestCase):
+
+    def test_anneal_improves_on_greedy(self):
+        scenario = parse_input("data/input_files/3-goodall.txt", compiled=True)
+        annealer = AnnealSolver(scenario, seed=1)
+        plan = annealer.solve(time_limit=0.5)
+        self.assertGreaterEqual(annealer.best_score, annealer.initial_score)
+        self.assertGreater(annealer.moves, 0)
+        # The incrementally tracked score is the one the simulator reports.
+        _, final_budget = GameSimulator(scenario).run_simulation(plan)
+        self.assertEqual(final_budget, annealer.best_score)
+
+    def test_short_run_cools(self):
+        # A run shorter than the report interval still follows the whole schedule.
+        scenario = parse_input("data/input_files/3-goodall.txt", compiled=True)
+        annealer = AnnealSolver(scenario, start_temperature=1000.0, end_temperature=1.0, report_interval=1.0)
+        annealer.solve(time_limit=0.3)
+        self.assertEqual(len(annealer.trajectory), 2)
+        self.assertLess(annealer.temperature, 2.0)
+
+class TestBeamSolver(unittest.TestCase):
+
+    def test_beam_not_worse_than_greedy(self):
+        scenario = parse_input("data/input_files/2-attenborough.txt", compiled=True)
+        _, greedy_budget = GameSimulator(scenario).run_simulation(solve_game(scenario))
+        plan = solve_beam(scenario, width=2)
+        purchase_log, final_budget = GameSimulator(scenario).run_simulation(plan)
+        self.assertGreaterEqual(final_budget, greedy_budget)
+        # Every planned purchase is affordable.
+        self.assertEqual(len(purchase_log), len(plan))
+
+    def test_time_limit_falls_back_to_greedy(self):
+        scenario = parse_input("data/input_files/2-attenborough.txt", compiled=True)
+        _, greedy_budget = GameSimulator(scenario).run_simulation(solve_game(scenario))
+        solver = BeamSolver(scenario, width=8)
+        _, final_budget = GameSimulator(scenario).run_simulation(solver.solve(time_limit=0))
+        self.assertEqual(solver.fallback_turns, scenario.num_turns)
+        self.assertEqual(final_budget, greedy_budget)
+        # Stopped halfway, the plan still covers the game and is not worse than greedy.
+        calls = []
+        plan = solver.solve(should_stop=lambda: calls.append(1) or len(calls) > scenario.num_turns // 2)
+        self.assertEqual(solver.fallback_turns, scenario.num_turns - scenario.num_turns // 2)
+        _, final_budget = GameSimulator(scenario).run_simulation(plan)
+        self.assertGreaterEqual(final_budget, greedy_budget)
+
+class TestExactSolver(unittest.TestCase):
+
+    def test_matches_exhaustive_enumeration(self):
+        resources = [
+            {'id': 1, 'activation_cost': 5, 'periodic_cost': 1, 'active_duration': 1, 'downtime': 1,
+             'lifecycle': 3, 'buildings_powered': 2, 'resource_type': 'X', 'special_effect': 0},
+            {'id': 2, 'activation_cost': 3, 'periodic_cost': 1, 'active_duration': 1, 'downtime': 1,
+             'lifecycle': 3, 'buildings_powered': 1, 'resource_type': 'X', 'special_effect': 0},
+            {'id': 3, 'activation_cost': 1, 'periodic_cost': 0, 'active_duration': 3, 'downtime': 0,
+             'lifecycle': 3, 'buildings_powered': 0, 'resource_type': 'E', 'special_effect': 5},
+        ]
+        turns = [{'TM': 3, 'TX': 5, 'TR': 4}, {'TM': 4, 'TX': 6, 'TR': 3}, {'TM': 2, 'TX': 7, 'TR': 1}]
+        # Every plan of at most three purchases per turn.
+        bundles = [list(c) for size in range(4) for c in combinations_with_replacement([1, 2, 3], size)]
+        best = max(GameSimulator(10, resources, turns).run_simulation(dict(enumerate(plan)))[1]
+                   for plan in product(bundles, repeat=len(turns)))
+        plan = solve_exact(10, resources, turns)
+        self.assertEqual(GameSimulator(10, resources, turns).run_simulation(plan)[1], best)
+
+    def test_demo_optimum(self):
+        scenario = parse_input("data/input_files/0-demo.txt", compiled=True)
+        _, greedy_budget = GameSimulator(scenario).run_simulation(solve_game(scenario))
+        solver = ExactSolver(scenario)
+        plans = list(solver.iterate())
+        self.assertTrue(solver.completed)
+        self.assertEqual(len(plans), 2)
+        self.assertEqual(GameSimulator(scenario).run_simulation(plans[-1])[1], 57)
+        self.assertGreater(57, greedy_budget)
+
+    def test_gives_up_past_the_state_bound(self):
+        scenario = parse_input("data/input_files/1-thunberg.txt", compiled=True)
+        solver = ExactSolver(scenario, max_states=1000)
+        self.assertIsNone(solver.solve())
+        self.assertFalse(solver.completed)
+        # Only the greedy plan comes out.
+        self.assertEqual(list(solver.iterate()), [solve_game(scenario)])
+        self.assertIsNone(ExactSolver(scenario).solve(should_stop=lambda: True))
+
+class TestGeneticSolver(unittest.TestCase):
+
+    def test_plan_encoding_round_trip(self):
+        scenario = parse_input("data/input_files/1-thunberg.txt", compiled=True)
+        plan = {turn: resource_ids for turn, resource_ids in solve_game(scenario).items() if resource_ids}
+        encoded = encode_plan(plan, scenario.index_by_id)
+        self.assertEqual(encoded.shape, (2, sum(len(ids) for ids in plan.values())))
+        self.assertEqual(decode_plan(encoded, scenario.ids), plan)
+
+    def test_offspring_hash_is_incremental(self):
+        scenario = parse_input("data/input_files/2-attenborough.txt", compiled=True)
+        solver = GeneticSolver(scenario, mutations=6, workers=0, seed=5)
+        first = solver.initial_plan
+        second = solver.mutate(first)
+        for _ in range(50):
+            child = solver.mutate(solver.crossover(first, second))
+            self.assertIsInstance(child, Plan)
+            self.assertEqual(child.hash, Plan.from_dict(child.to_dict()).hash)
+            first, second = second, child
+
+    def test_workers_match_in_process(self):
+        scenario = parse_input("data/input_files/2-attenborough.txt", compiled=True)
+        results = []
+        for workers in (0, 2):
+            solver = GeneticSolver(scenario, population_size=8, workers=workers, seed=3)
+            plan = solver.solve(generations=3)
+            _, final_budget = GameSimulator(scenario).run_simulation(plan)
+            self.assertEqual(final_budget, solver.best_score)
+            results.append(solver.history)
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(len(results[0]), 4)
+
+    def test_elites_are_not_reevaluated(self):
+        scenario = parse_input("data/input_files/2-attenborough.txt", compiled=True)
+        solver = GeneticSolver(scenario, population_size=8, elite=2, workers=0, seed=3)
+        solver.solve(generations=3)
+        # Every generation after the first copies the elites, which are already in the cache.
+        self.assertGreaterEqual(solver.cache.hits, 3)
+        self.assertLessEqual(solver.evaluations, 8 * 4 - solver.cache.hits)
+
+class TestHorizonSolver(unittest.TestCase):
+
+    def test_purchases_are_affordable(self):
+        scenario = parse_input("data/input_files/3-goodall.txt", compiled=True)
+        plan = HorizonSolver(scenario, buckets=64).solve()
+        purchase_log, final_budget = GameSimulator(scenario).run_simulation(plan)
+        self.assertEqual(len(purchase_log), len(plan))
+        self.assertGreater(final_budget, scenario.initial_budget)
+
+    def test_knapsack_respects_budget(self):
+        scenario = parse_input("data/input_files/2-attenborough.txt", compiled=True)
+        solver = HorizonSolver(scenario, max_copies=3)
+        values = np.ones((scenario.num_resources, 3), dtype=np.int64) * 1000
+        chosen = solver.knapsack(values, 500)
+        self.assertTrue(chosen)
+        self.assertLessEqual(sum(int(scenario.activation_cost[i]) * k for i, k in chosen), 500)
+
+    def test_windowed_objective(self):
+        # Without amortization a window is charged its maintenance only.
+        scenario = parse_input("data/input_files/3-goodall.txt", compiled=True)
+        solver = HorizonSolver(scenario, horizon=3, amortize=False)
+        np.testing.assert_array_equal(solver.fixed_costs(3), scenario.periodic_cost * 3)
+        amortized = HorizonSolver(scenario, horizon=3).fixed_costs(3)
+        self.assertTrue((amortized > solver.fixed_costs(3)).all())
+        purchase_log, _ = GameSimulator(scenario).run_simulation(solver.solve())
+        self.assertTrue(purchase_log)
+
+    def test_time_limit_falls_back_to_greedy(self):
+        # Out of time from the start: every turn is planned by the greedy rule.
+        scenario = parse_input("data/input_files/3-goodall.txt", compiled=True)
+        solver = HorizonSolver(scenario)
+        plan = solver.solve(time_limit=0)
+        self.assertEqual(solver.fallback_turns, scenario.num_turns)
+        greedy_plan = {turn: ids for turn, ids in solve_game(scenario).items() if ids}
+        self.assertEqual(plan, greedy_plan)
+        self.assertEqual(solver.solve(), solver.solve(time_limit=60))
+        self.assertEqual(solver.fallback_turns, 0)
+
 if __name__ == '__main__':
     unittest.main()